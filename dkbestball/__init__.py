@@ -1,4 +1,18 @@
 from .analyzer import Analyzer
+from .archive import SnapshotArchive
+from .cache import ResponseCache
+from .jsonio import JSONCodec
+from .manifest import FetchManifest, ParseManifest
+from .ownership import FieldOwnership
 from .parser import Parser
+from .planner import RefreshPlanner
+from .rawstore import RawStore
+from .registry import PlayerPoolRegistry
+from .scoring import LineupScorer
+from .simulator import AdvancementSimulator
+from .sqlstore import SQLiteStore
+from .store import ColumnarStore
+from .ratelimit import AdaptivePacer, TokenBucket
+from .fetcher import AsyncFetcher
 from .scraper import Scraper
 from .updater import Updater
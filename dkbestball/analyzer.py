@@ -1,9 +1,18 @@
-from functools import lru_cache
+from itertools import chain
 import logging
 import pickle
 
+import numpy as np
 import pandas as pd
 
+from dkbestball.memo import Memo, memoized
+from dkbestball.ownership import FieldOwnership
+from dkbestball.rawstore import RawFiles, RawStore
+from dkbestball.registry import PlayerPoolRegistry
+from dkbestball.scoring import LineupScorer
+from dkbestball.sqlstore import SQLiteStore
+from dkbestball.store import ColumnarStore
+
 
 class Analyzer:
     """Encapsulates analysis / summary of rosters and results"""
@@ -17,6 +26,18 @@ class Analyzer:
         't': 'Tournament'
     }
 
+    # categorical in compact mode
+    CATEGORY_COLUMNS = [
+        'contest_name', 'contest_type', 'displayName', 'position',
+        'teamAbbreviation', 'userName'
+    ]
+
+    # name substring -> type, first match wins, as in contest_type
+    CONTEST_TYPES = [('3-Player', '3-Man'), ('6-Player', '6-Man'),
+                     ('12-Player', '12-Man'), ('Play-Action', 'Tournament'),
+                     ('Millionaire', 'Tournament'),
+                     ('Tournament', 'Tournament')]
+
     DATA_COLUMNS = [
         'entry_keys', 'contest_key', 'contest_name', 'contest_size',
         'entry_fee', 'draftgroup_id', 'winnings', 'leader_points', 'my_place',
@@ -42,30 +63,109 @@ class Analyzer:
         'contest_size', 'my_place', 'winnings', 'my_points', 'leader_points'
     ]
 
-    def __init__(self, username, datadir):
+    def __init__(self,
+                 username,
+                 datadir,
+                 memo_size=32,
+                 compact=False,
+                 raw_compression=None,
+                 use_sqlite=False):
         logging.getLogger(__name__).addHandler(logging.NullHandler())
         self.username = username
         self.datadir = datadir
+        self.compact = compact
         self.mydata_path = self.datadir / 'mydata.pkl'
-        self.data = pd.DataFrame(self._load_data())
-        self.data['contest_type'] = self.data['contest_name'].apply(
-            self.contest_type)
+        self.store_path = self.datadir / 'store'
+        self.store = None
+        if ColumnarStore.available():
+            store = ColumnarStore(self.store_path)
+            if store.exists():
+                self.store = store
+        self.sqlite_path = self.datadir / 'mydata.sqlite'
+        self.sqlite = None
+        # only written by Updater(use_sqlite=True), may be stale otherwise
+        if use_sqlite:
+            if not self.sqlite_path.is_file():
+                raise FileNotFoundError(self.sqlite_path)
+            self.sqlite = SQLiteStore(self.sqlite_path)
+        if raw_compression:
+            self.rosters = RawStore(self.datadir / 'raw' / 'rosters',
+                                    compression=raw_compression)
+        else:
+            self.rosters = RawFiles(self.datadir / 'rosters')
+        self.data = None
+        self.data_version = 0
+        self._memo = Memo(maxsize=memo_size)
+        self.reload()
+
+    def _compact(self, df):
+        """Converts repeated strings to categoricals and downcasts integers
+           in compact mode
+        """
+        if not self.compact:
+            return df
+        for col in df.columns:
+            if col in self.CATEGORY_COLUMNS:
+                df[col] = df[col].astype('category')
+            elif pd.api.types.is_integer_dtype(df[col]):
+                # floats stay float64, sums of float32 dollars drift
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+        return df
+
+    def _entries(self):
+        """Gets contest_key, entry_key of every leaderboard entry"""
+        if self.sqlite:
+            return self.sqlite.entries()
+        if self.store:
+            return self.store.read('entries')
+        return (self.data.loc[:, ['contest_key', 'entry_keys']].explode(
+            'entry_keys').rename(columns={'entry_keys': 'entry_key'}))
 
     def _filter_rosters(self, df, contests):
         """Filters roster by contest(s)"""
         return df.loc[df.contestKey.isin(contests), :]
 
     def _load_data(self):
-        """Loads data file"""
-        with self.mydata_path.open('rb') as f:
-            return pickle.load(f)
+        """Loads contests from SQLite or columnar store, else data file"""
+        if self.sqlite:
+            data = self.sqlite.standings(self.sqlite.CONTEST_FIELDS)
+        elif self.store:
+            data = self.store.read('contests')
+        else:
+            with self.mydata_path.open('rb') as f:
+                data = pd.DataFrame(pickle.load(f))
+            data['contest_type'] = self.contest_types(data['contest_name'])
+        return self._compact(data)
+
+    def _flatten_rosters(self):
+        """Gets one row per roster player from the data file records"""
+        rows = chain.from_iterable(r for r in self.data['myroster'] if r)
+        return pd.DataFrame.from_records(rows, columns=self.ROSTER_COLUMNS)
+
+    def _read_rosters(self, columns=None, **filters):
+        """Reads roster columns from columnar store
 
-    @lru_cache(maxsize=128)
+        Args:
+            columns (list): default ROSTER_COLUMNS
+            filters: partition field -> value, e.g. contest_type,
+                     only read those partitions
+
+        Returns:
+            DataFrame
+
+        """
+        return self._compact(
+            self.store.read('rosters',
+                            columns=columns or self.ROSTER_COLUMNS,
+                            filters=filters or None))
+
+    @memoized
     def _tournament_keys(self, contest_type, keycol):
         """Gets key column for given contest type"""
         return self.data.loc[self.data['contest_type'] == contest_type, keycol]
 
-    def contest_type(self, s):
+    @staticmethod
+    def contest_type(s):
         """Gets contest type from contest name"""
         val = 'Unknown'
         if 'Tournament' in s:
@@ -82,19 +182,99 @@ class Analyzer:
             val = '3-Man'
         return val
 
+    @classmethod
+    def contest_types(cls, names):
+        """Gets contest types from contest names, see contest_type
+
+        Each distinct name is classified once.
+
+        Args:
+            names (Series): contest names
+
+        Returns:
+            Series
+
+        """
+        cat = pd.Categorical(names)
+        uniq = pd.Series(cat.categories, dtype=object)
+        conds = [
+            uniq.str.contains(pat, regex=False) for pat, _ in cls.CONTEST_TYPES
+        ]
+        types = np.select(conds, [typ for _, typ in cls.CONTEST_TYPES],
+                          default='Unknown')
+        vals = np.append(types, 'Unknown').astype(object)
+        # missing names have code -1, the appended Unknown
+        return pd.Series(vals[cat.codes], index=getattr(names, 'index', None))
+
+    def exposure_vs_field(self, by='contest_type'):
+        """Gets my ownership minus the other entrants', see field_ownership
+
+        Returns:
+            DataFrame with columns
+            by, displayName, position, teamAbbreviation,
+            my_pct, field_pct, diff
+        """
+        return self.field().versus(by)
+
+    @memoized
+    def field(self):
+        """Gets ownership engine over all saved rosters in my contests
+
+        Returns:
+            FieldOwnership
+
+        """
+        return FieldOwnership(self.data,
+                              self._entries(),
+                              self.rosters,
+                              registry=PlayerPoolRegistry(self.datadir))
+
+    def field_ownership(self, by='contest_type'):
+        """Gets ownership of all entrants in my contests
+
+        Args:
+            by (str): contest_type, draftgroup_id or entry_fee
+
+        Returns:
+            DataFrame with columns
+            by, displayName, position, teamAbbreviation,
+            n, tot, pct
+        """
+        return self.field().exposure(by)
+
+    @memoized
     def financial_summary(self):
         """Summarizes financial results"""
+        if self.sqlite:
+            return self.sqlite.financial_summary()
         std = self.standings()
-        gb = std.groupby(['contest_type', 'entry_fee'], as_index=False)
+        gb = std.groupby(['contest_type', 'entry_fee'],
+                         as_index=False,
+                         observed=True)
         aggs = (('contest_key', 'count'), ('entry_fee', 'sum'), ('winnings',
                                                                  'sum'))
         summ = gb.agg(Entries=aggs[0], Paid=aggs[1], Won=aggs[2])
         summ['ROI'] = ((summ.Won - summ.Paid) / summ.Paid).mul(100).round(1)
-        return summ
+        # observed categorical groups come back in order of appearance
+        return summ.sort_values(['contest_type', 'entry_fee'],
+                                ignore_index=True)
 
-    @lru_cache(maxsize=128)
-    def myrosters(self):
+    def lineup_scores(self, points, key='draftableId'):
+        """Scores optimal weekly lineups of my rosters
+
+        Args:
+            points (DataFrame): player x week points, indexed by key
+            key (str): roster column matching the points index
+
+        Returns:
+            DataFrame indexed by entryKey, a column per week and total
         """
+        return LineupScorer(points, key=key).score(self.myrosters())
+
+    @memoized
+    def myrosters(self):
+        """Gets my rosters, built once per data version
+
             draftGroupId             37605
             contestKey            89460375
             entryKey            2062649745
@@ -109,9 +289,13 @@ class Analyzer:
             draftableId           14885230
 
         """
-        return pd.concat(
-            [pd.DataFrame(row.myroster) for row in self.data.itertuples()])
+        if self.sqlite:
+            return self._compact(self.sqlite.rosters())
+        if self.store:
+            return self._read_rosters()
+        return self._compact(self._flatten_rosters())
 
+    @memoized
     def ownership(self, df=None):
         """Gets player ownership
 
@@ -123,24 +307,79 @@ class Analyzer:
             displayName, position, teamAbbreviation,
             n, tot, pct
         """
-        if df is None:
-            df = self.myrosters()
         grpcols = ['displayName', 'position', 'teamAbbreviation']
-        gb = df.groupby(grpcols, as_index=False)
+        if df is None and self.sqlite:
+            return self.sqlite.ownership()
+        if df is None and self.store:
+            df = self._read_rosters(columns=grpcols + ['userName', 'entryKey'])
+        elif df is None:
+            df = self.myrosters()
+        gb = df.groupby(grpcols, as_index=False, observed=True)
         summ = gb.agg(n=('userName', 'count'))
         summ['tot'] = len(df['entryKey'].unique())
         summ['pct'] = (summ['n'] / summ['tot']).mul(100).round(1)
         return summ.sort_values('pct', ascending=False)
 
+    def pairs(self,
+              positions=None,
+              team=None,
+              same_team=False,
+              field=False,
+              min_n=1):
+        """Gets pairs of players rostered together, see FieldOwnership.pairs
+
+        Args:
+            positions (tuple): position pair, e.g. ('QB', 'WR')
+            team (str): one of the players is on this team
+            same_team (bool): both players are on the same team
+            field (bool): pairs of the other entrants instead of mine
+            min_n (int): fewest rosters with the pair
+
+        Returns:
+            DataFrame
+        """
+        if field:
+            return self.field().pairs(mine=False,
+                                      positions=positions,
+                                      team=team,
+                                      same_team=same_team,
+                                      min_n=min_n)
+        return self.roster_matrix().pairs(positions=positions,
+                                          team=team,
+                                          same_team=same_team,
+                                          min_n=min_n)
+
     def positional_ownership(self, df=None, pos='QB', thresh=10):
         """Gets positional ownership"""
         if df is None:
             df = self.ownership()
-        q = f'position == "{pos}" and pct > {thresh}'
-        return df.query(q)
+        return df.loc[(df['position'] == pos) & (df['pct'] > thresh)]
+
+    def reload(self):
+        """Reloads contests, invalidating results derived from them"""
+        self.data = self._load_data()
+        self.data_version += 1
+        self._memo.invalidate()
+
+    @memoized
+    def roster_matrix(self):
+        """Gets ownership engine over my rosters
+
+        Returns:
+            FieldOwnership
+
+        """
+        return FieldOwnership.from_rosters(self.data, self.myrosters())
+
+    def stacks(self, positions=('QB', 'WR'), field=False):
+        """Gets same-team pairs, e.g. QB-WR stacks, see pairs"""
+        return self.pairs(positions=positions, same_team=True, field=field)
 
+    @memoized
     def standings(self):
         """Gets standings dataframe"""
+        if self.sqlite:
+            return self._compact(self.sqlite.standings(self.STANDINGS_COLUMNS))
         return self.data.loc[:, self.STANDINGS_COLUMNS]
 
     def standings_summary(self, contest_type):
@@ -165,9 +404,15 @@ class Analyzer:
 
     def tournament_ownership(self):
         """Shows tournament ownership"""
+        if self.sqlite:
+            return self.sqlite.ownership(contest_type='Tournament')
         return self.ownership(self.tournament_rosters())
 
     def tournament_rosters(self):
+        if self.sqlite:
+            return self.sqlite.rosters(contest_type='Tournament')
+        if self.store:
+            return self._read_rosters(contest_type='Tournament')
         df = self.myrosters()
         return self._filter_rosters(df, self.tournament_contests())
 
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import time
+
+
+class SnapshotArchive:
+    """Append-only, content-addressed archive of file snapshots
+
+    Each distinct file content is stored once, gzipped, under its sha256:
+
+        archive/objects/ab/ab12...ef.gz
+
+    Snapshots are appended to archive/snapshots.jsonl as the changes
+    since the previous snapshot ({name: hash}, None for removed files),
+    so a snapshot costs only its changed files. A stat index skips
+    hashing files whose size and mtime are unchanged.
+
+    Args:
+        root (Path): archive directory
+
+    """
+
+    def __init__(self, root):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.root = Path(root)
+        try:
+            self._index = json.loads(self.index_path.read_text())
+        except FileNotFoundError:
+            self._index = {}
+
+    @property
+    def index_path(self):
+        return self.root / 'index.json'
+
+    @property
+    def log_path(self):
+        return self.root / 'snapshots.jsonl'
+
+    def _object_path(self, digest):
+        """Gets path of stored object"""
+        return self.root / 'objects' / digest[:2] / f'{digest}.gz'
+
+    def _write_object(self, digest, content):
+        """Stores content under digest unless already stored"""
+        pth = self._object_path(digest)
+        if pth.is_file():
+            return
+        pth.parent.mkdir(parents=True, exist_ok=True)
+        tmp = pth.with_suffix('.tmp')
+        tmp.write_bytes(gzip.compress(content))
+        os.replace(tmp, pth)
+
+    def files(self, snapshot=None):
+        """Gets files of snapshot
+
+        Args:
+            snapshot (int): snapshot id, default latest
+
+        Returns:
+            dict of name -> hash
+
+        """
+        files = {}
+        for snap in self.snapshots():
+            if snapshot is not None and snap['id'] > snapshot:
+                break
+            files.update(snap['changes'])
+        return {k: v for k, v in files.items() if v is not None}
+
+    def read(self, name, snapshot=None):
+        """Reads file as of snapshot
+
+        Args:
+            name (str): file name, e.g. 89460375.json
+            snapshot (int): snapshot id, default latest
+
+        Returns:
+            bytes
+
+        """
+        digest = self.files(snapshot).get(name)
+        if digest is None:
+            raise KeyError(f'{name} is not in snapshot {snapshot}')
+        return gzip.decompress(self._object_path(digest).read_bytes())
+
+    def restore(self, dest, snapshot=None):
+        """Writes files of snapshot to dest directory
+
+        Returns:
+            list of Path
+
+        """
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, digest in self.files(snapshot).items():
+            pth = dest / name
+            pth.write_bytes(
+                gzip.decompress(self._object_path(digest).read_bytes()))
+            paths.append(pth)
+        return paths
+
+    def snapshot(self, paths):
+        """Archives current contents of paths
+
+        Files missing from paths that were in the previous snapshot are
+        recorded as removed.
+
+        Args:
+            paths (iterable): of Path
+
+        Returns:
+            int: snapshot id, or None if nothing changed
+
+        """
+        changes = {}
+        seen = set()
+        for pth in paths:
+            name = Path(pth).name
+            seen.add(name)
+            st = os.stat(pth)
+            rec = self._index.get(name)
+            if rec and rec[:2] == [st.st_size, st.st_mtime_ns]:
+                continue
+            content = Path(pth).read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            self._index[name] = [st.st_size, st.st_mtime_ns, digest]
+            if rec and rec[2] == digest:
+                continue
+            self._write_object(digest, content)
+            changes[name] = digest
+        for name in set(self._index) - seen:
+            del self._index[name]
+            changes[name] = None
+
+        snap_id = None
+        self.root.mkdir(parents=True, exist_ok=True)
+        if changes:
+            snapshots = self.snapshots()
+            snap_id = snapshots[-1]['id'] + 1 if snapshots else 0
+            line = {'id': snap_id, 'time': time.time(), 'changes': changes}
+            with self.log_path.open('a') as f:
+                f.write(json.dumps(line) + '\n')
+            logging.info(f'Snapshot {snap_id}: {len(changes)} changed files')
+
+        # index is saved last, so an interrupted snapshot is redone
+        tmp = self.index_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self._index))
+        os.replace(tmp, self.index_path)
+        return snap_id
+
+    def snapshots(self):
+        """Gets snapshot log
+
+        Returns:
+            list of dict with keys id, time, changes
+
+        """
+        if not self.log_path.is_file():
+            return []
+        with self.log_path.open() as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from urllib.parse import urlencode
+
+
+class ResponseCache:
+    """Persistent cache of JSON responses keyed by URL and params
+
+    Each response is stored as a single JSON file along with the time it
+    was stored, its time-to-live and any ETag / Last-Modified validators.
+    File modification time tracks last access, so when the cache grows
+    beyond max_bytes the least recently used entries are evicted. The
+    directory is only scanned for its size on the first put, so reading
+    from a large cache starts at once.
+
+    Args:
+        cachedir (Path): directory for cache files
+        max_bytes (int): size bound for the cache directory
+        ttls (dict): seconds to live by endpoint, None never expires,
+                     0 disables caching for that endpoint
+
+    """
+
+    DEFAULT_TTLS = {
+        'entered': 60 * 60,
+        'leaderboard': 5 * 60,
+        'megacontest': 5 * 60,
+        'roster': 60 * 60,
+    }
+
+    def __init__(self, cachedir, max_bytes=512 * 2**20, ttls=None):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.cachedir = Path(cachedir)
+        self.cachedir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        # bytes of cache files, None until the first put scans them
+        self._size = None
+
+    def _entries(self):
+        """Iterates over cache entry paths"""
+        return self.cachedir.glob('*/*.json')
+
+    def _path(self, url, params=None):
+        """Gets path for url and params"""
+        key = self.key(url, params)
+        return self.cachedir / key[:2] / f'{key}.json'
+
+    def evict(self, target_bytes=None):
+        """Removes least recently used entries until under target size
+
+        Args:
+            target_bytes (int): size to shrink to, default 90% of max_bytes
+
+        Returns:
+            int: number of entries removed
+
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * .9)
+        with self._lock:
+            stats = sorted(((pth.stat(), pth) for pth in self._entries()),
+                           key=lambda x: x[0].st_mtime)
+            self._size = sum(st.st_size for st, _ in stats)
+            n = 0
+            for st, pth in stats:
+                if self._size <= target_bytes:
+                    break
+                pth.unlink()
+                self._size -= st.st_size
+                n += 1
+        logging.info(f'evicted {n} cache entries')
+        return n
+
+    def get(self, url, params=None):
+        """Gets cached entry, fresh or stale
+
+        Args:
+            url (str): the resource URL
+            params (dict): query parameters
+
+        Returns:
+            dict with keys url, stored, ttl, etag, last_modified, content
+            or None if not cached
+
+        """
+        pth = self._path(url, params)
+        try:
+            entry = json.loads(pth.read_text())
+            os.utime(pth)
+        except (FileNotFoundError, ValueError):
+            return None
+        return entry
+
+    def is_fresh(self, entry, now=None):
+        """Tests if cached entry is within its time-to-live"""
+        if entry['ttl'] is None:
+            return True
+        now = now or time.time()
+        return now - entry['stored'] < entry['ttl']
+
+    def key(self, url, params=None):
+        """Gets cache key for url and params"""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha1(f'{url}?{query}'.encode()).hexdigest()
+
+    def put(self, url, params, content, ttl, etag=None, last_modified=None):
+        """Stores response content
+
+        Args:
+            url (str): the resource URL
+            params (dict): query parameters
+            content (dict): parsed JSON response
+            ttl (int): seconds to live, None never expires
+            etag (str): ETag response header
+            last_modified (str): Last-Modified response header
+
+        Returns:
+            None
+
+        """
+        entry = {
+            'url': url,
+            'stored': time.time(),
+            'ttl': ttl,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content': content
+        }
+        pth = self._path(url, params)
+        pth.parent.mkdir(exist_ok=True)
+        tmp = pth.with_suffix(f'.{threading.get_ident()}.tmp')
+        tmp.write_text(json.dumps(entry))
+        size = tmp.stat().st_size
+        with self._lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self._entries())
+            if pth.is_file():
+                self._size -= pth.stat().st_size
+            os.replace(tmp, pth)
+            self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def refresh(self, url, params, entry):
+        """Restarts time-to-live of entry after successful revalidation"""
+        self.put(url,
+                 params,
+                 entry['content'],
+                 ttl=entry['ttl'],
+                 etag=entry['etag'],
+                 last_modified=entry['last_modified'])
+
+    def ttl(self, endpoint):
+        """Gets time-to-live for endpoint"""
+        return self.ttls.get(endpoint, 0)
+
+    def validators(self, entry):
+        """Gets conditional request headers for cached entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,331 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import random
+import re
+import threading
+import time
+
+
+class PayloadFactory:
+    """Generates synthetic DK-shaped payloads
+
+    Payloads are deterministic for a given seed and id, so the same
+    leaderboard always lists the same entry keys and the roster for an
+    entry key always has the same players.
+
+    Entry keys encode their contest: entry_key = contest_id * 10000 + i
+
+    Args:
+        n_entries (int): entries per contest leaderboard
+        n_megaentries (int): entries per megacontest leaderboard
+        n_players (int): size of each draft group's player pool
+        roster_size (int): players per roster
+        seed (int): random seed
+        finalized (set): ContestIds that are finalized, the first
+                         contest of every other megacontest is live
+
+    """
+
+    POSITIONS = ('QB', 'RB', 'WR', 'TE')
+    TEAMS = ('ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL',
+             'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC', 'LAC', 'LAR', 'LV',
+             'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF',
+             'TB', 'TEN', 'WAS')
+
+    def __init__(self,
+                 n_entries=12,
+                 n_megaentries=1000,
+                 n_players=400,
+                 roster_size=18,
+                 seed=0,
+                 finalized=None):
+        self.n_entries = n_entries
+        self.n_megaentries = n_megaentries
+        self.n_players = n_players
+        self.roster_size = roster_size
+        self.seed = seed
+        self.finalized = set(finalized or ())
+
+    def _rng(self, *ids):
+        """Gets random generator seeded by ids"""
+        return random.Random(hash((self.seed, ) + ids))
+
+    def _entry(self, contest_id, idx, n):
+        """Gets single leaderboard entry"""
+        rng = self._rng(contest_id, idx)
+        return {
+            'MegaDraftGroupId': 1,
+            'MegaContestKey': str(contest_id),
+            'MegaEntryKey': str(contest_id * 10000 + idx),
+            'UserName': f'user{idx}',
+            'UserKey': str(1000000 + idx),
+            'Rank': idx + 1,
+            'FantasyPoints': round(2000 - idx * 1000 / n - rng.random(), 2),
+            'WinningValue': 0
+        }
+
+    def _leaderboard(self, contest_id, n):
+        entries = [self._entry(contest_id, i, n) for i in range(n)]
+        return {
+            'Leader': entries[0],
+            'Leaderboard': entries,
+            'UpdateStatus': {
+                'lastUpdateTime': '2020-10-15T14:12:45.1628151+00:00'
+            }
+        }
+
+    def contest_entered(self, userkey, megacontest_id, n_contests=3):
+        """Gets contest/entered payload for megacontest"""
+        contests, live, finalized = [], [], []
+        for i in range(n_contests):
+            contest_id = megacontest_id + i
+            entry = {
+                'ContestKey': str(contest_id),
+                'EntryKey': str(contest_id * 10000)
+            }
+            if i or contest_id in self.finalized:
+                finalized.append(entry)
+            else:
+                live.append(entry)
+            contests.append({
+                'DraftGroupId': 37605,
+                'DraftGroupState': 'Historical' if i else 'InProgress',
+                'ContestName': 'NFL Best Ball $1 12-Player (Sit + Go)',
+                'ContestId': contest_id,
+                'ContestTypeId': 145,
+                'StartDate': '2020-09-11T00:20:00.0000000Z',
+                'EndDate': '2021-01-04T02:20:00.0000000Z',
+                'EntryCount': self.n_entries,
+                'UserEntryCount': 1,
+                'EntryFee': 1
+            })
+        return {
+            'LiveContestsEntries': live,
+            'FinalizedContestsEntries': finalized,
+            'Contests': contests
+        }
+
+    def contest_leaderboard(self, contest_id):
+        """Gets scores/v1/leaderboards payload"""
+        return self._leaderboard(contest_id, self.n_entries)
+
+    def contest_roster(self, draftgroup_id, entry_key):
+        """Gets scores/v2/entries payload"""
+        contest_id, idx = divmod(entry_key, 10000)
+        rng = self._rng(draftgroup_id, entry_key)
+        players = rng.sample(range(self.n_players), self.roster_size)
+        scorecards = []
+        for p in players:
+            player = self.player(draftgroup_id, p)
+            scorecards.append({
+                'displayName': player['displayName'],
+                'draftableId': player['draftableId'],
+                'rosterPosition': player['position'],
+                'score': round(rng.uniform(0, 30), 2)
+            })
+        return {
+            'entries': [{
+                'draftGroupId': draftgroup_id,
+                'contestKey': str(contest_id),
+                'entryKey': str(entry_key),
+                'lineupId': -1,
+                'userName': f'user{idx}',
+                'userKey': str(1000000 + idx),
+                'roster': {
+                    'scorecards': scorecards,
+                    'scoringDivider': 1
+                }
+            }]
+        }
+
+    def draftables(self, draftgroup_id):
+        """Gets draftables payload for draft group"""
+        return {
+            'draftables':
+            [self.player(draftgroup_id, i) for i in range(self.n_players)]
+        }
+
+    def megacontest_leaderboard(self, megacontest_id):
+        """Gets scores/v1/megacontests leaderboard payload"""
+        return self._leaderboard(megacontest_id, self.n_megaentries)
+
+    def mycontests(self, n_contests, draftgroup_id=37605, start_id=89460375):
+        """Gets list of contest dict shaped like Parser.mycontests"""
+        vals = []
+        for i in range(n_contests):
+            contest_id = start_id + i
+            vals.append({
+                'ContestId': contest_id,
+                'MegaContestId': contest_id,
+                'ContestName': 'NFL Best Ball $1 12-Player (Sit + Go)',
+                'BuyInAmount': 1.0,
+                'MaxNumberPlayers': self.n_entries,
+                'NumberOfEntrants': self.n_entries,
+                'DraftGroupId': draftgroup_id,
+                'GameTypeId': 145,
+                'ContestStartDate': '2020-09-11T00:20:00Z',
+                'ContestEndDate': '2021-01-04T02:20:00Z',
+                'ResultsRank': 1,
+                'TotalPointsOpp': 0.0,
+                'PlayerPoints': 0.0,
+                'TokensWon': 0.0
+            })
+        return vals
+
+    def player(self, draftgroup_id, idx):
+        """Gets player dict with draftables fields"""
+        return {
+            'draftableId': draftgroup_id * 100000 + idx,
+            'playerId': 800000 + idx,
+            'playerDkId': 20000 + idx,
+            'displayName': f'Player {idx}',
+            'position': self.POSITIONS[idx % len(self.POSITIONS)],
+            'teamAbbreviation': self.TEAMS[idx % len(self.TEAMS)]
+        }
+
+
+class FakeDKServer:
+    """Local stand-in for the DK API routes used by Scraper
+
+    Serves synthetic payloads from a PayloadFactory and can inject
+    latency, HTTP 429 throttling and HTTP 500 errors.
+
+    Args:
+        factory (PayloadFactory): payload generator
+        host (str): interface to bind
+        port (int): port to bind, 0 picks a free port
+        latency (float): seconds added to every response
+        jitter (float): max random seconds added on top of latency
+        throttle_rate (float): fraction of requests answered with 429
+        error_rate (float): fraction of requests answered with 500
+        retry_after (int): Retry-After seconds sent with 429
+        seed (int): random seed for injected faults
+
+    Example:
+
+        with FakeDKServer(latency=.05, throttle_rate=.01) as srv:
+            s = Scraper(browser_name=None, api_url=srv.url)
+
+    """
+
+    ROUTES = (
+        ('contest_leaderboard',
+         re.compile(r'^/scores/v1/leaderboards/(\d+)$')),
+        ('contest_roster', re.compile(r'^/scores/v2/entries/(\d+)/(\d+)$')),
+        ('megacontest_leaderboard',
+         re.compile(r'^/scores/v1/megacontests/(\d+)/leaderboard$')),
+        ('contest_entered',
+         re.compile(r'^/scores/v1/contest/entered/([\w-]+)/megacontest/(\d+)$')
+         ),
+    )
+
+    def __init__(self,
+                 factory=None,
+                 host='127.0.0.1',
+                 port=0,
+                 latency=0,
+                 jitter=0,
+                 throttle_rate=0,
+                 error_rate=0,
+                 retry_after=0,
+                 seed=0):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.factory = factory or PayloadFactory()
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.counts = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _fault(self):
+        """Gets injected status code, if any"""
+        with self._lock:
+            x = self._rng.random()
+            delay = self.latency + self._rng.random() * self.jitter
+        if delay:
+            time.sleep(delay)
+        if x < self.throttle_rate:
+            return 429
+        if x < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                for name, patt in server.ROUTES:
+                    match = patt.match(path)
+                    if match:
+                        break
+                else:
+                    server._count(404)
+                    return self._send(404, {'error': 'not found'})
+                status = server._fault()
+                server._count(status or name)
+                if status == 429:
+                    return self._send(429, {'error': 'throttled'},
+                                      {'Retry-After': server.retry_after})
+                if status:
+                    return self._send(status, {'error': 'server error'})
+                args = [int(g) if g.isdigit() else g for g in match.groups()]
+                self._send(200, getattr(server.factory, name)(*args))
+
+            def _send(self, status, obj, headers=None):
+                body = json.dumps(obj).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, str(v))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(format % args)
+
+        return Handler
+
+    def start(self):
+        """Starts serving on a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        logging.info(f'fake DK server listening on {self.url}')
+        return self
+
+    def stop(self):
+        """Stops serving"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import logging
+
+
+class AsyncFetcher:
+    """Runs blocking Scraper calls concurrently from asyncio
+
+    The Scraper session is synchronous, so each call is run on a thread
+    pool. A semaphore bounds the number of requests in flight and an
+    optional token bucket limits the overall request rate.
+
+    Args:
+        concurrency (int): maximum number of requests in flight
+        bucket (TokenBucket): optional rate limiter
+
+    Example:
+
+        async with AsyncFetcher(concurrency=8) as f:
+            lb = await f.fetch(scraper.contest_leaderboard, contest_id)
+
+    """
+
+    def __init__(self, concurrency=8, bucket=None):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.concurrency = concurrency
+        self.bucket = bucket
+        self._executor = None
+        self._sem = None
+
+    async def __aenter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._sem = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._sem = None
+
+    async def fetch(self, func, *args, **kwargs):
+        """Calls func(*args, **kwargs) on the thread pool
+
+        Args:
+            func (callable): blocking function, e.g. Scraper.contest_leaderboard
+
+        Returns:
+            the return value of func
+
+        """
+        if self._executor is None:
+            raise RuntimeError(
+                'AsyncFetcher must be used as a context manager')
+        async with self._sem:
+            if self.bucket:
+                await self.bucket.acquire()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor,
+                                              partial(func, *args, **kwargs))
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+
+
+class FetchJournal:
+    """Write-ahead journal of completed fetch units of a raw update run
+
+    Line-delimited JSON. The first line records the scheduled contests,
+    then one line is appended and fsynced as each leaderboard or roster
+    is saved, and a last line marks the run finished:
+
+        {"run": 1602720000.0, "scheduled": [[89460375, "live"]], ...}
+        {"unit": "leaderboard", "key": "89460375", "state": "live", ...}
+        {"unit": "roster", "key": "894603750003"}
+        {"finished": 1602720100.0}
+
+    A journal without the last line belongs to an interrupted run, which
+    can be resumed by skipping the units already recorded.
+
+    Args:
+        path (Path): journal file
+
+    """
+
+    UNITS = ('leaderboard', 'roster')
+
+    def __init__(self, path):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.path = Path(path)
+        self.header = None
+        self.finished = False
+        self._done = {unit: {} for unit in self.UNITS}
+        self._fh = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Reads journal of the last run, truncating a torn last line"""
+        if not self.path.is_file():
+            return
+        good = 0
+        with self.path.open('rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('incomplete line')
+                    rec = json.loads(line)
+                except ValueError:
+                    # torn last line of a killed run
+                    break
+                good += len(line)
+                if 'run' in rec:
+                    self.header = rec
+                elif 'finished' in rec:
+                    self.finished = True
+                else:
+                    self._done[rec['unit']][rec['key']] = rec
+        # records of a resumed run are appended after the last good line
+        if good < self.path.stat().st_size:
+            logging.info(f'Truncating torn journal line at {good}')
+            with self.path.open('r+b') as f:
+                f.truncate(good)
+
+    def _write(self, rec):
+        """Appends record and forces it to disk"""
+        with self._lock:
+            if self._fh is None:
+                self._fh = self.path.open('a')
+            self._fh.write(json.dumps(rec) + '\n')
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self):
+        """Closes journal file"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+            self._fh = None
+
+    def completed(self, unit):
+        """Gets records of completed units
+
+        Returns:
+            dict of key -> record
+
+        """
+        return self._done[unit]
+
+    def finish(self):
+        """Marks run as finished"""
+        self._write({'finished': time.time()})
+        self.finished = True
+        self.close()
+
+    def is_done(self, unit, key):
+        """Tests if unit was completed in this run"""
+        return str(key) in self._done[unit]
+
+    def pending(self):
+        """Tests if the last run was interrupted"""
+        return self.header is not None and not self.finished
+
+    def record(self, unit, key, **kwargs):
+        """Records completed unit
+
+        Args:
+            unit (str): leaderboard or roster
+            key (int): contest id or entry key
+            kwargs: saved with the record, e.g. state
+
+        Returns:
+            None
+
+        """
+        rec = {'unit': unit, 'key': str(key), **kwargs}
+        self._write(rec)
+        self._done[unit][rec['key']] = rec
+
+    def start(self, scheduled, update_rosters):
+        """Starts journal of a new run, replacing the last one
+
+        Args:
+            scheduled (list): of tuple (contest dict, state)
+            update_rosters (bool): rosters are fetched
+
+        Returns:
+            None
+
+        """
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.header = {
+            'run': time.time(),
+            'scheduled': [[c['ContestId'], state] for c, state in scheduled],
+            'update_rosters': update_rosters
+        }
+        self.finished = False
+        self._done = {unit: {} for unit in self.UNITS}
+        self._write(self.header)
+
+
+if __name__ == '__main__':
+    pass
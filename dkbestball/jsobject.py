@@ -0,0 +1,90 @@
+import json
+import re
+
+DECODER = json.JSONDecoder()
+
+# everything up to and including the next bracket outside a JSON string,
+# so the regex engine, not python, walks over the strings
+BRACKET = re.compile(
+    r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*([\[\]{}])')
+
+# object key, bare identifier or quoted, followed by colon
+KEY = re.compile(r'(?:"((?:[^"\\]|\\.)*)"|([A-Za-z_$][\w$]*))\s*:\s*')
+
+# whitespace, comments and commas between members
+SKIP = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/|,)*', re.DOTALL)
+
+
+def skip_value(text, pos):
+    """Gets end of JS value starting at pos without decoding it
+
+    Args:
+        text (str): source text
+        pos (int): index of first character of value
+
+    Returns:
+        int: index just past the value
+
+    """
+    if text[pos] not in '[{':
+        _, end = DECODER.raw_decode(text, pos)
+        return end
+    depth = 0
+    while True:
+        match = BRACKET.match(text, pos)
+        if not match:
+            raise ValueError('Unterminated JS object literal')
+        pos = match.end()
+        if match.group(1) in '[{':
+            depth += 1
+        else:
+            depth -= 1
+            if not depth:
+                return pos
+
+
+def object_spans(text, pos):
+    """Locates members of JS object literal in one pass
+
+    Keys may be bare identifiers or quoted strings. Values must be valid
+    JSON, which is how DK embeds the contests arrays.
+
+    Args:
+        text (str): source text
+        pos (int): index of opening brace
+
+    Returns:
+        dict: key -> tuple(start, end) of the value in text
+
+    """
+    if text[pos] != '{':
+        raise ValueError(f'Expected {{ at {pos}')
+    spans = {}
+    pos += 1
+    while True:
+        pos = SKIP.match(text, pos).end()
+        if text[pos] == '}':
+            return spans
+        match = KEY.match(text, pos)
+        if not match:
+            raise ValueError(f'Expected object key at {pos}')
+        key = match.group(1) if match.group(1) is not None else match.group(2)
+        start = match.end()
+        pos = skip_value(text, start)
+        spans[key] = (start, pos)
+
+
+def find_var(text, name):
+    """Gets index of the value assigned to JS var name, or None"""
+    patt = re.compile(r'var\s+%s\s*=\s*' % re.escape(name))
+    pos = text.find('var ')
+    while pos != -1:
+        match = patt.match(text, pos)
+        if match:
+            return match.end()
+        pos = text.find('var ', pos + 4)
+    return None
+
+
+if __name__ == '__main__':
+    pass
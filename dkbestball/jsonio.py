@@ -0,0 +1,93 @@
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+class JSONCodec:
+    """Reads and writes JSON with the fastest available backend
+
+    Files are read as bytes and handed straight to the decoder, skipping
+    the str decode of read_text. Files of at least mmap_threshold bytes
+    are memory-mapped rather than read into a buffer.
+
+    Args:
+        backend (str): 'orjson', 'simdjson' or 'json', default fastest
+                       installed
+        mmap_threshold (int): minimum file size to memory-map,
+                              None never maps
+
+    """
+
+    BACKENDS = ('orjson', 'simdjson', 'json')
+
+    def __init__(self, backend=None, mmap_threshold=8 * 2**20):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        available = self.available_backends()
+        if backend is None:
+            backend = available[0]
+        elif backend not in available:
+            raise ValueError(f'JSON backend {backend} is not installed')
+        self.backend = backend
+        self.mmap_threshold = mmap_threshold
+        self._loads = {
+            'orjson': lambda b: orjson.loads(b),
+            'simdjson': lambda b: simdjson.loads(bytes(b)),
+            'json': lambda b: json.loads(bytes(b))
+        }[backend]
+
+    @classmethod
+    def available_backends(cls):
+        """Gets installed backends, fastest first"""
+        installed = {'orjson': orjson, 'simdjson': simdjson, 'json': json}
+        return [b for b in cls.BACKENDS if installed[b] is not None]
+
+    def dump(self, obj, pth):
+        """Writes obj to pth as JSON"""
+        Path(pth).write_bytes(self.dumps(obj))
+
+    def dumps(self, obj):
+        """Serializes obj to JSON bytes"""
+        if self.backend == 'orjson':
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj).encode()
+
+    def load(self, pth):
+        """Reads JSON file
+
+        Args:
+            pth (Path or str): file path
+
+        Returns:
+            decoded object
+
+        """
+        with open(pth, 'rb') as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if self.mmap_threshold is None or size < max(
+                    self.mmap_threshold, 1):
+                return self.loads(fh.read())
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return self.loads(view)
+
+    def loads(self, data):
+        """Decodes JSON bytes, memoryview or str"""
+        if isinstance(data, str):
+            data = data.encode()
+        return self._loads(data)
+
+
+if __name__ == '__main__':
+    pass
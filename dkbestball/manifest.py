@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+
+
+class _Manifest:
+    """JSON file of records keyed by contest, saved atomically
+
+    Args:
+        path (Path): manifest file
+
+    """
+
+    def __init__(self, path):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            self._data = {}
+
+    def __contains__(self, contest_id):
+        return str(contest_id) in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, contest_id):
+        """Gets record for contest
+
+        Returns:
+            dict or None
+
+        """
+        return self._data.get(str(contest_id))
+
+    def save(self):
+        """Writes manifest to disk"""
+        with self._lock:
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self._data))
+            os.replace(tmp, self.path)
+
+
+class FetchManifest(_Manifest):
+    """Records when each contest leaderboard was last fetched
+
+    Stored as JSON next to the leaderboards, keyed by ContestId, with the
+    fetch time (epoch seconds) and the contest state at that time.
+
+    Args:
+        path (Path): manifest file
+
+    """
+
+    def mark(self, contest_id, state, fetched=None):
+        """Records contest as fetched
+
+        Args:
+            contest_id (int): the ContestId
+            state (str): live, upcoming or finalized
+            fetched (float): epoch seconds, default now
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._data[str(contest_id)] = {
+                'fetched': fetched or time.time(),
+                'state': state
+            }
+
+
+class ParseManifest(_Manifest):
+    """Records the inputs behind each parsed contest record
+
+    Keyed by contest key, with a digest of the contest dict, the size,
+    mtime and sha1 of each source file and the location of each source
+    payload in a RawStore. A contest whose inputs are all unchanged does
+    not need to be parsed again.
+
+    Args:
+        path (Path): manifest file
+
+    """
+
+    @staticmethod
+    def digest(obj):
+        """Gets sha1 of JSON-serializable obj"""
+        s = json.dumps(obj, sort_keys=True, default=str)
+        return hashlib.sha1(s.encode()).hexdigest()
+
+    @staticmethod
+    def file_hash(pth, chunk_size=2**20):
+        """Gets sha1 of file contents"""
+        h = hashlib.sha1()
+        with open(pth, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def signature(self, pth):
+        """Gets size, mtime and hash of file"""
+        st = os.stat(pth)
+        return {
+            'size': st.st_size,
+            'mtime': st.st_mtime_ns,
+            'hash': self.file_hash(pth)
+        }
+
+    def is_current(self, contest_key, contest, locate=None):
+        """Tests if contest record was parsed from the current inputs
+
+        Files are only hashed when size is the same but mtime is not,
+        e.g. a leaderboard fetched again without changes.
+
+        Args:
+            contest_key (str): the contest key
+            contest (dict): contest from mycontests
+            locate (callable): gets current location of raw payload name
+
+        Returns:
+            bool
+
+        """
+        rec = self.get(contest_key)
+        if not rec or rec['contest'] != self.digest(contest):
+            return False
+        for pth, sig in rec['files'].items():
+            try:
+                st = os.stat(pth)
+            except FileNotFoundError:
+                return False
+            if st.st_size != sig['size']:
+                return False
+            if st.st_mtime_ns != sig['mtime']:
+                if self.file_hash(pth) != sig['hash']:
+                    return False
+                with self._lock:
+                    sig['mtime'] = st.st_mtime_ns
+        for name, loc in rec.get('raw', {}).items():
+            if locate is None or locate(name) != loc:
+                return False
+        return True
+
+    def mark(self, contest_key, contest, paths, raw=None):
+        """Records inputs of parsed contest
+
+        Args:
+            contest_key (str): the contest key
+            contest (dict): contest from mycontests
+            paths (iterable): of Path, the source files
+            raw (dict): raw payload name -> location, the sources
+                        in a RawStore
+
+        Returns:
+            None
+
+        """
+        rec = {
+            'contest': self.digest(contest),
+            'files': {
+                str(pth): self.signature(pth)
+                for pth in paths
+            },
+            'raw': raw or {}
+        }
+        with self._lock:
+            self._data[str(contest_key)] = rec
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+import functools
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+def _freeze(obj):
+    """Makes arrays of DataFrame or Series read-only, returns shallow copy
+
+    The copy shares the frozen arrays, so values cannot be changed in
+    place, while adding columns or reindexing only alters the copy.
+    Object arrays are copied instead, as pandas cannot compare them when
+    read-only.
+    """
+    if not isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj
+    for arr in obj._mgr.arrays:
+        # numpy, categorical codes, or data and mask of nullable arrays
+        for a in (arr, getattr(arr, '_ndarray', None),
+                  getattr(arr, '_data', None), getattr(arr, '_mask', None)):
+            if isinstance(a, np.ndarray) and a.dtype != object:
+                a.flags.writeable = False
+    if isinstance(obj, pd.Series):
+        return obj.copy() if obj.dtype == object else obj.copy(deep=False)
+    copy = obj.copy(deep=False)
+    for i in np.flatnonzero((obj.dtypes == object).to_numpy()):
+        copy.isetitem(i, copy.iloc[:, i].copy())
+    return copy
+
+
+class Memo:
+    """Memo of results derived from one version of the data
+
+    Results are keyed on (name, args) and dropped together when the data
+    version changes. Least recently used results are evicted beyond
+    maxsize. DataFrame and Series results are returned read-only, or as
+    copies for object columns.
+
+    Args:
+        maxsize (int): number of results kept
+
+    """
+
+    def __init__(self, maxsize=32):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, version, key, func):
+        """Gets result of key, calling func if not memoized
+
+        Args:
+            version (hashable): data version the result derives from
+            key (hashable): name and arguments of the result
+            func (callable): computes the result
+
+        Returns:
+            result, DataFrame or Series cannot change the memoized one
+
+        """
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+        else:
+            self.misses += 1
+            self._results[key] = _freeze(func())
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return _freeze(self._results[key])
+
+    def invalidate(self, name=None):
+        """Drops memoized results
+
+        Args:
+            name (str): only drop results of this name, default all
+
+        Returns:
+            None
+
+        """
+        if name is None:
+            self._results.clear()
+            return
+        for key in [k for k in self._results if k[0] == name]:
+            del self._results[key]
+
+
+def memoized(method):
+    """Memoizes method on the instance's memo and data_version
+
+    Calls with unhashable arguments, e.g. a DataFrame, are not memoized.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        return self._memo.get(self.data_version, key,
+                              lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+if __name__ == '__main__':
+    pass
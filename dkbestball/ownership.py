@@ -0,0 +1,397 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
+from dkbestball.parser import Parser
+
+
+class FieldOwnership:
+    """Ownership across every entrant's roster, not only mine
+
+    Rosters saved by update_raw_files(update_rosters=True) are loaded into
+    a sparse entry x player matrix in CSR form: row i holds the players of
+    entry i in indices[indptr[i]:indptr[i + 1]]. Players are keyed by
+    playerId, so exposure can be summed across draft groups, or by draft
+    group and draftableId where the player pool is not saved; names are
+    not unique. Counts by group are a single pass over the nonzeros, with
+    scipy.sparse if installed, else NumPy.
+
+    Args:
+        contests (DataFrame): contest_key, my_entry_key and the columns
+                              to group by, e.g. Analyzer.data
+        entries (DataFrame): contest_key, entry_key of every entrant
+        rosters (RawFiles): rosters by entry key, or RawStore
+        parser (Parser): parses roster payloads
+        registry (PlayerPoolRegistry): adds position and team of players
+                                       where draftables are saved
+
+    """
+
+    PLAYER_COLUMNS = ['displayName', 'position', 'teamAbbreviation']
+
+    def __init__(self, contests, entries, rosters, parser=None, registry=None):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.contests = contests.reset_index(drop=True)
+        self._p = parser if parser else Parser()
+        self.registry = registry
+        self._build(entries, rosters)
+
+    def __len__(self):
+        return len(self.entry_keys)
+
+    def _build(self, entries, rosters):
+        """Loads rosters of entries into CSR arrays"""
+        contest_pos = pd.Index(self.contests['contest_key'].astype(str))
+        players = {}
+        info = []
+        counts, indices, entry_keys, entry_contest = [], [], [], []
+        for key, grp in entries.groupby('contest_key', sort=False):
+            ci = contest_pos.get_indexer([str(key)])[0]
+            keys = [str(k) for k in grp['entry_key'] if k in rosters]
+            if ci < 0 or not keys:
+                continue
+            contents = [self._p.codec.loads(rosters.read(k)) for k in keys]
+            playerd = self._player_pool(self.contests.at[ci, 'draftgroup_id'])
+            cols = self._p.contest_rosters(contents,
+                                           playerd=playerd,
+                                           as_frame=False)
+
+            # players of each entry are contiguous, in keys order
+            counts.append(
+                np.array([
+                    len(c['entries'][0]['roster']['scorecards'])
+                    for c in contents
+                ]))
+            indices.append(self._player_codes(cols, players, info))
+            entry_keys += keys
+            entry_contest.append(np.full(len(keys), ci, dtype=np.int32))
+
+        if not counts:
+            counts = indices = entry_contest = [np.zeros(0, np.int32)]
+        self._set_arrays(np.concatenate(counts), np.concatenate(indices),
+                         np.array(entry_keys, dtype=object),
+                         np.concatenate(entry_contest),
+                         pd.DataFrame(info, columns=self.PLAYER_COLUMNS))
+
+    def _frame(self, labels, group, player):
+        """Gets DataFrame of group labels and player columns"""
+        parts = [
+            labels.iloc[group].reset_index(drop=True),
+            self.players.iloc[player].reset_index(drop=True)
+        ]
+        return pd.concat(parts, axis=1)
+
+    def _group_codes(self, by):
+        """Gets group of each entry and the group labels"""
+        by = [by] if isinstance(by, str) else list(by)
+        gb = self.contests.groupby(by, sort=True, observed=True)
+        labels = gb.size().index.to_frame(index=False)
+        return gb.ngroup().to_numpy()[self.entry_contest], labels
+
+    def _group_counts(self, group, n_groups):
+        """Counts entries of each (group, player), skipping group -1
+
+        Returns:
+            tuple of ndarray: group, player, count
+
+        """
+        n = len(self)
+        if sparse is not None:
+            keep = group >= 0
+            g = sparse.csr_matrix((np.ones(keep.sum(), dtype=np.int64),
+                                   (group[keep], np.flatnonzero(keep))),
+                                  shape=(n_groups, n))
+            c = (g @ self.matrix()).tocoo()
+            return c.row, c.col, c.data
+        rowgroup = np.repeat(group, np.diff(self.indptr))
+        keep = rowgroup >= 0
+        n_players = len(self.players)
+        key = rowgroup[keep].astype(np.int64) * n_players + self.indices[keep]
+        uniq, cnt = np.unique(key, return_counts=True)
+        return uniq // n_players, uniq % n_players, cnt
+
+    def _pair_counts(self, rows):
+        """Counts entries rostering each pair of players, as X^T X
+
+        Args:
+            rows (ndarray): bool mask of entries
+
+        Returns:
+            tuple of ndarray: player a, player b > a, count
+
+        """
+        if sparse is not None:
+            x = self.matrix()[rows]
+            c = sparse.triu(x.T @ x, k=1).tocoo()
+            return c.row, c.col, c.data
+
+        # pairs of rosters of the same size in one gather each
+        sizes = np.diff(self.indptr)
+        sel = np.flatnonzero(rows)
+        keys = []
+        n_players = len(self.players)
+        for size in np.unique(sizes[sel]):
+            if size < 2:
+                continue
+            r = sel[sizes[sel] == size]
+            mat = self.indices[self.indptr[r][:, None] + np.arange(size)]
+            iu, ju = np.triu_indices(size, k=1)
+            a, b = mat[:, iu].ravel(), mat[:, ju].ravel()
+            keys.append(
+                np.minimum(a, b).astype(np.int64) * n_players +
+                np.maximum(a, b))
+        key = np.concatenate(keys) if keys else np.zeros(0, np.int64)
+        uniq, cnt = np.unique(key, return_counts=True)
+        return uniq // n_players, uniq % n_players, cnt
+
+    def _player_pool(self, draftgroup_id):
+        """Gets player pool of draft group, None if not saved"""
+        if self.registry is None:
+            return None
+        try:
+            return self.registry.get(draftgroup_id)
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def _player_codes(cls, cols, players, info):
+        """Gets global player column of each roster slot
+
+        Players are keyed by playerId, else by (draftGroupId, draftableId).
+
+        Args:
+            cols (dict): roster columns, as from Parser.contest_rosters
+            players (dict): player key -> column, new players are added
+            info (list): PLAYER_COLUMNS of each column, new players added
+
+        Returns:
+            ndarray
+
+        """
+        n = len(cols['draftableId'])
+        codes, uniq = pd.factorize(cols.get('playerId', np.full(n, None)))
+        has_pid = codes >= 0
+        keys = [(-1, k) for k in uniq]
+        if not has_pid.all():
+            # draftableIds are only unique within a draft group
+            dg, dgs = pd.factorize(np.asarray(cols['draftGroupId'])[~has_pid])
+            ids = np.asarray(cols['draftableId'], dtype=np.int64)[~has_pid]
+            size = ids.max() + 1
+            other, uniq = pd.factorize(dg * size + ids)
+            codes[~has_pid] = other + len(keys)
+            keys += [(dgs[k // size], k % size) for k in uniq]
+        # first slot of each code, the last write of a repeated index wins
+        first = np.empty(len(keys), dtype=np.int64)
+        first[codes[::-1]] = np.arange(n)[::-1]
+        glob = np.empty(len(keys), dtype=np.int32)
+        for i, key in enumerate(keys):
+            if key not in players:
+                players[key] = len(players)
+                info.append([
+                    cols[k][first[i]] if k in cols else None
+                    for k in cls.PLAYER_COLUMNS
+                ])
+            glob[i] = players[key]
+        return glob[codes]
+
+    def _set_arrays(self, counts, indices, entry_keys, entry_contest, players):
+        """Sets CSR arrays from players per entry"""
+        my_keys = set(self.contests['my_entry_key'].dropna().astype(str))
+        self.indptr = np.concatenate([[0], np.cumsum(counts)])
+        self.indices = indices
+        self.entry_keys = entry_keys
+        self.entry_contest = entry_contest
+        self.mine = pd.Index(self.entry_keys).isin(my_keys)
+        self.players = players.reset_index(drop=True)
+        logging.info(f'Ownership matrix: {len(self)} entries, '
+                     f'{len(self.indices)} roster slots')
+
+    def _sort(self, df, labels, col):
+        """Sorts by group, then col descending"""
+        by = list(labels.columns)
+        return df.sort_values(by + [col, 'displayName'],
+                              ascending=[True] * len(by) + [False, True],
+                              ignore_index=True)
+
+    @classmethod
+    def from_rosters(cls, contests, df):
+        """Creates engine from a flat roster table, e.g. Analyzer.myrosters
+
+        Args:
+            contests (DataFrame): see FieldOwnership
+            df (DataFrame): contestKey, entryKey, draftGroupId,
+                            draftableId, playerId if known and
+                            PLAYER_COLUMNS, one row per roster player
+
+        Returns:
+            FieldOwnership
+
+        """
+        obj = cls.__new__(cls)
+        obj.contests = contests.reset_index(drop=True)
+        obj._p = Parser()
+        obj.registry = None
+        contest_pos = pd.Index(obj.contests['contest_key'].astype(str))
+        df = df.loc[df['contestKey'].astype(str).isin(contest_pos)
+                    & df['entryKey'].notna()]
+
+        # rows ordered by entry, so each entry's players are contiguous
+        codes, keys = pd.factorize(df['entryKey'].astype(str))
+        order = np.argsort(codes, kind='stable')
+        cols = {k: df[k].astype(object).to_numpy() for k in df.columns}
+        info = []
+        player = cls._player_codes(cols, {}, info)
+        _, entry_first = np.unique(codes, return_index=True)
+        entry_contest = contest_pos.get_indexer(
+            df['contestKey'].astype(str).to_numpy()[entry_first])
+        obj._set_arrays(np.bincount(codes, minlength=len(keys)),
+                        player[order],
+                        np.asarray(keys, dtype=object),
+                        entry_contest.astype(np.int32),
+                        pd.DataFrame(info, columns=cls.PLAYER_COLUMNS))
+        return obj
+
+    def exposure(self, by='contest_type', mine=None):
+        """Gets share of entries rostering each player, by group
+
+        Args:
+            by (str): contests column(s), e.g. contest_type, draftgroup_id
+                      or entry_fee
+            mine (bool): True only my entries, False only the field's,
+                         default all
+
+        Returns:
+            DataFrame with columns
+            by, displayName, position, teamAbbreviation, n, tot, pct
+
+        """
+        group, labels = self._group_codes(by)
+        if mine is not None:
+            group = np.where(self.mine == mine, group, -1)
+        g, p, n = self._group_counts(group, len(labels))
+        tot = np.bincount(group[group >= 0], minlength=len(labels))
+        df = self._frame(labels, g, p)
+        df['n'] = n
+        df['tot'] = tot[g]
+        df['pct'] = (df['n'] / df['tot']).mul(100).round(1)
+        return self._sort(df, labels, 'pct')
+
+    def matrix(self):
+        """Gets entry x player matrix
+
+        Returns:
+            scipy.sparse.csr_matrix
+
+        Raises:
+            ImportError if scipy is not installed
+
+        """
+        if sparse is None:
+            raise ImportError('matrix requires scipy')
+        ones = np.ones(len(self.indices), dtype=np.int64)
+        return sparse.csr_matrix((ones, self.indices, self.indptr),
+                                 shape=(len(self), len(self.players)))
+
+    def pairs(self,
+              mine=None,
+              positions=None,
+              team=None,
+              same_team=False,
+              min_n=1):
+        """Gets how often pairs of players are rostered together
+
+        lift is the pair rate over the rate expected if the two players
+        were picked independently, n * tot / (n_a * n_b).
+
+        Args:
+            mine (bool): True only my entries, False only the field's,
+                         default all
+            positions (tuple): position pair, e.g. ('QB', 'WR')
+            team (str): one of the players is on this team
+            same_team (bool): both players are on the same team
+            min_n (int): fewest entries rostering the pair
+
+        Returns:
+            DataFrame with columns displayName_a, position_a,
+            teamAbbreviation_a, the same for b, n, tot, pct, lift
+
+        """
+        rows = np.ones(len(self), dtype=bool)
+        if mine is not None:
+            rows = self.mine == mine
+        a, b, n = self._pair_counts(rows)
+        tot = rows.sum()
+        slots = np.repeat(rows, np.diff(self.indptr))
+        n_player = np.bincount(self.indices[slots],
+                               minlength=len(self.players))
+
+        pos = self.players['position'].astype(object).to_numpy()
+        teams = self.players['teamAbbreviation'].astype(object).to_numpy()
+        keep = n >= min_n
+        if positions:
+            first, second = positions
+            # player a takes the first position of the pair
+            swap = pos[a] != first
+            a, b = np.where(swap, b, a), np.where(swap, a, b)
+            keep &= (pos[a] == first) & (pos[b] == second)
+        if same_team:
+            keep &= (teams[a] == teams[b]) & pd.notna(teams[a])
+        if team:
+            keep &= (teams[a] == team) | (teams[b] == team)
+        a, b, n = a[keep], b[keep], n[keep]
+
+        parts = [
+            self.players.iloc[a].add_suffix('_a').reset_index(drop=True),
+            self.players.iloc[b].add_suffix('_b').reset_index(drop=True)
+        ]
+        df = pd.concat(parts, axis=1)
+        df['n'] = n
+        df['tot'] = tot
+        df['pct'] = (df['n'] / tot).mul(100).round(1)
+        df['lift'] = (n * tot / (n_player[a] * n_player[b])).round(2)
+        return df.sort_values(['n', 'lift', 'displayName_a', 'displayName_b'],
+                              ascending=[False, False, True, True],
+                              ignore_index=True)
+
+    def versus(self, by='contest_type'):
+        """Gets my exposure versus the field's, by group
+
+        Groups without my entries are left out.
+
+        Args:
+            by (str): contests column(s)
+
+        Returns:
+            DataFrame with columns by, displayName, position,
+            teamAbbreviation, my_pct, field_pct, diff
+
+        """
+        group, labels = self._group_codes(by)
+        side = np.where(group >= 0, group * 2 + self.mine, -1)
+        g, p, n = self._group_counts(side, len(labels) * 2)
+        tot = np.bincount(side[side >= 0], minlength=len(labels) * 2)
+        pct = n / tot[g] * 100
+
+        # my and field pct of each (group, player) side by side
+        n_players = len(self.players)
+        key, inv = np.unique((g // 2) * n_players + p, return_inverse=True)
+        is_mine = (g % 2).astype(bool)
+        my_pct = np.bincount(inv, weights=np.where(is_mine, pct, 0))
+        field_pct = np.bincount(inv, weights=np.where(is_mine, 0, pct))
+        grp, player = key // n_players, key % n_players
+        has_mine = tot[grp * 2 + 1] > 0
+        df = self._frame(labels, grp[has_mine], player[has_mine])
+        df['my_pct'] = my_pct[has_mine].round(1)
+        df['field_pct'] = field_pct[has_mine].round(1)
+        df['diff'] = (df['my_pct'] - df['field_pct']).round(1)
+        return self._sort(df, labels, 'diff')
+
+
+if __name__ == '__main__':
+    pass
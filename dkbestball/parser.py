@@ -1,13 +1,16 @@
 from collections import ChainMap
 from dateutil import tz
-import json
 import logging
 from pathlib import Path
-import re
 
-import dateparser
+import numpy as np
 import pandas as pd
 
+from dkbestball.jsobject import find_var, object_spans
+from dkbestball.jsonio import JSONCodec
+from dkbestball.streaming import iter_array
+from dkbestball.timestamps import parse_timestamp_fields
+
 
 class Parser:
     """Parses DK bestball contest files"""
@@ -17,9 +20,24 @@ class Parser:
         'teamAbbreviation'
     ]
 
-    def __init__(self, bestball_gametype_id=145):
+    ROSTER_METADATA_FIELDS = [
+        'draftGroupId', 'contestKey', 'entryKey', 'lineupId', 'userName',
+        'userKey'
+    ]
+
+    ROSTER_ID_FIELDS = [
+        'draftGroupId', 'contestKey', 'entryKey', 'lineupId', 'userKey',
+        'playerId', 'playerDkId', 'draftableId'
+    ]
+
+    ROSTER_CATEGORY_FIELDS = [
+        'userName', 'displayName', 'position', 'teamAbbreviation'
+    ]
+
+    def __init__(self, bestball_gametype_id=145, codec=None):
         logging.getLogger(__name__).addHandler(logging.NullHandler())
         self.bestball_gametype_id = bestball_gametype_id
+        self.codec = codec or JSONCodec()
 
     def _lckeys(self, x):
         if isinstance(x, list):
@@ -29,18 +47,44 @@ class Parser:
         else:
             return x
 
+    def _leaderboard_entries(self, items):
+        """Parses leaderboard entries, yields dict
+           Keys differ based on the contest type, so the contest and entry
+           keys are detected from the first entry
+        """
+        wanted = ['UserName', 'UserKey', 'Rank', 'FantasyPoints']
+        ckey = ekey = None
+        for item in items:
+            if ckey is None:
+                ckey = ('MegaContestKey'
+                        if 'MegaContestKey' in item else 'contestKey')
+                ekey = 'MegaEntryKey' if 'MegaEntryKey' in item else 'entryKey'
+            d = {k: item.get(k) for k in wanted}
+            d[ckey] = item[ckey]
+            d[ekey] = item[ekey]
+            yield d
+
     def _pctcol(self, val):
         return f'{round(val * 100, 2)}%'
 
+    def _roster_column(self, field, values, typed):
+        """Converts roster field values to array
+           Ids become nullable integers and strings categorical if typed
+        """
+        if not typed:
+            return np.array(values, dtype=object)
+        if field in self.ROSTER_ID_FIELDS:
+            return pd.to_numeric(pd.Series(values, dtype=object),
+                                 errors='coerce').astype('Int64').array
+        return pd.Categorical(values)
+
     def _to_dataframe(self, container):
         """Converts container to dataframe"""
         return pd.DataFrame(container)
 
     def _to_obj(self, pth):
-        """Reads json text in pth and creates python object"""
-        if isinstance(pth, str):
-            pth = Path(pth)
-        return json.loads(pth.read_text())
+        """Reads json in pth and creates python object"""
+        return self.codec.load(pth)
 
     def contest_details(self, contest):
         """Parses contest dict for relevant details
@@ -74,36 +118,26 @@ class Parser:
             list: of dict
 
         """
-        vals = []
-
-        # keys differ based on the contest type
-        # this is a preliminary approach to getting the right key
-        wanted = ['UserName', 'UserKey', 'Rank', 'FantasyPoints']
         lbkey = 'Leaderboard' if 'Leaderboard' in content else 'leaderBoard'
-        ckey = 'MegaContestKey' if 'MegaContestKey' in content else 'contestKey'
-        ekey = 'MegaEntryKey' if 'MegaEntryKey' in content[lbkey][
-            0] else 'entryKey'
-
-        for item in content[lbkey]:
-            d = {k: item.get(k) for k in wanted}
-            d[ckey] = item[ckey]
-            d[ekey] = item[ekey]
-            vals.append(d)
-        return vals
+        return list(self._leaderboard_entries(content[lbkey]))
 
-    def contest_roster(self, content, playerd=None):
+    def contest_roster(self, content, playerd=None, registry=None):
         """Parses roster from single contest.
            DK doesn't seem to have saved draft order.
 
         Args:
             content (dict): parsed draft resource
             playerd (dict): additional player data
+            registry (PlayerPoolRegistry): looks up playerd by draftGroupId
+                                           if playerd is not given
 
         Returns:
             list: of dict
 
         """
         entry = content['entries'][0]
+        if playerd is None and registry is not None:
+            playerd = registry.get(entry['draftGroupId'])
         wanted_metadata = [
             'draftGroupId', 'contestKey', 'entryKey', 'lineupId', 'userName',
             'userKey'
@@ -118,6 +152,75 @@ class Parser:
             vals.append(dict(**draft_metadata, **d))
         return vals
 
+    def contest_rosters(self,
+                        contents,
+                        playerd=None,
+                        registry=None,
+                        as_frame=True):
+        """Parses many rosters into columns
+           Same fields as contest_roster, but built as one array per field
+           instead of one dict per player
+
+        Args:
+            contents (iterable): of parsed draft resource
+            playerd (dict): additional player data, used for all rosters
+            registry (PlayerPoolRegistry): looks up playerd by draftGroupId
+                                           if playerd is not given
+            as_frame (bool): return DataFrame with integer ids and
+                             categorical strings
+
+        Returns:
+            DataFrame, or dict of numpy array if as_frame is False
+
+        """
+        meta = {k: [] for k in self.ROSTER_METADATA_FIELDS}
+        counts, ids, names = [], [], []
+        for content in contents:
+            entry = content['entries'][0]
+            cards = entry['roster']['scorecards']
+            for k, v in meta.items():
+                v.append(entry.get(k))
+            counts.append(len(cards))
+            ids += [card['draftableId'] for card in cards]
+            names += [card['displayName'] for card in cards]
+
+        # metadata is converted once per entry, then repeated per player
+        rowentry = np.repeat(np.arange(len(counts)), counts)
+        cols = {
+            k: self._roster_column(k, v, as_frame)[rowentry]
+            for k, v in meta.items()
+        }
+        cols['displayName'] = np.array(names, dtype=object)
+        cols['draftableId'] = np.array(ids, dtype=np.int64)
+
+        # player fields are gathered from each draft group's pool
+        if playerd is not None or registry is not None:
+            wanted = [
+                k for k in self.PLAYERPOOL_FIELDS
+                if k not in ('draftableId', 'displayName')
+            ]
+            for k in wanted:
+                cols[k] = np.full(len(ids), None, dtype=object)
+            dgs = np.array(meta['draftGroupId'], dtype=object)[rowentry]
+            for dg in pd.unique(dgs):
+                pool = playerd if playerd is not None else registry.get(dg)
+                mask = dgs == dg
+                poolids = np.fromiter(pool.keys(), dtype=np.int64)
+                pos = pd.Index(poolids).get_indexer(cols['draftableId'][mask])
+                found = pos >= 0
+                rows = np.flatnonzero(mask)[found]
+                players = list(pool.values())
+                for k in wanted:
+                    vals = np.array([p[k] for p in players], dtype=object)
+                    cols[k][rows] = vals[pos[found]]
+
+        if not as_frame:
+            return cols
+        for k, v in cols.items():
+            if k not in meta and k != 'draftableId':
+                cols[k] = self._roster_column(k, v, as_frame)
+        return pd.DataFrame(cols)
+
     def get_entry_key(self, leaderboard, username):
         """Gets entry key from leaderboard"""
         return [
@@ -137,6 +240,23 @@ class Parser:
         """
         return content.get('GameTypeId') == self.bestball_gametype_id
 
+    def iter_contest_leaderboard(self, source, chunk_size=2**16):
+        """Parses contest leaderboard incrementally
+           Memory use does not depend on leaderboard size, so this is
+           preferred for megacontest and Millionaire leaderboards
+
+        Args:
+            source: path, file object, response or iterable of chunks
+            chunk_size (int): bytes per read
+
+        Returns:
+            generator of dict, same as contest_leaderboard
+
+        """
+        items = iter_array(source, ('Leaderboard', 'leaderBoard'),
+                           chunk_size=chunk_size)
+        return self._leaderboard_entries(items)
+
     def megacontest_entered(self, content):
         """Parses megacontest data (including associated weekly contests)
 
@@ -144,7 +264,7 @@ class Parser:
             content (dict): leaderboard dict
 
         Returns:
-            list: of dict
+            list: of dict, Finalized if listed in FinalizedContestsEntries
 
         Example:
     
@@ -172,27 +292,38 @@ class Parser:
                 "Attributes": {}
             }
         """
-        vals = []
-        wanted = {'DraftGroupId', 'ContestId', 'StartDate'}
-        from_zone = tz.tzutc()
-        to_zone = tz.tzlocal()
-        for item in content['Contests']:
-            d = {k: item.get(k) for k in wanted}
-            utc = dateparser.parse(item['StartDate'])
-            utc = utc.replace(tzinfo=from_zone)
-            d['StartDate'] = utc.astimezone(to_zone)
-            vals.append(d)
-        return vals
+        wanted = {
+            'DraftGroupId', 'DraftGroupState', 'ContestId', 'StartDate',
+            'EndDate'
+        }
+        # DraftGroupState is the state of the draft, Historical once it is
+        # done, so only FinalizedContestsEntries shows a contest is over
+        finalized = {
+            int(e.get('ContestId') or e.get('ContestKey'))
+            for e in content.get('FinalizedContestsEntries') or []
+        }
+        vals = [
+            dict({k: item.get(k)
+                  for k in wanted},
+                 Finalized=item.get('ContestId') in finalized)
+            for item in content['Contests']
+        ]
+        return parse_timestamp_fields(vals, ('StartDate', 'EndDate'),
+                                      to_zone=tz.tzlocal())
 
-    def mycontests(self, htmlfn=None, html=None):
+    def mycontests(self, htmlfn=None, html=None, section=None):
         """Parses mycontests.html page / contests javascript variable
+           The object literal is scanned once to locate its members and
+           only the requested section is decoded
 
         Args:
             htmlfn (Path or str): path of html file
             html (str): html from contests page
+            section (str): live, upcoming or history, default all
 
         Returns:
             dict: keys maxentrantsperpage, live, upcoming, history
+            list: of contest dict if section is given
 
         """
         # read text of file into content variable
@@ -202,25 +333,20 @@ class Parser:
             except AttributeError:
                 html = Path(htmlfn).read_text()
 
-        # now extract the contests variable and return parsed JSON
-        # RIGHT NOW IS LIVE ONLY
-        patt = re.compile(r'var contests = (\{.*?\})\;',
-                          re.MULTILINE | re.DOTALL)
-        match = re.search(patt, html)
-        if match:
-            jsvar = match.group(1)
-            mapping = {
-                'maxentrantsperpage :': '"maxentrantsperpage": ',
-                'live:': '"live":',
-                'upcoming:': '"upcoming":',
-                'history:': '"history":'
-            }
-
-            for original, replacement in mapping.items():
-                jsvar = jsvar.replace(original, replacement)
-            jsvar = jsvar.replace('// no pre-load', '')
-            return json.loads(jsvar)
-        return None
+        # now locate the contests variable and its members
+        pos = find_var(html, 'contests')
+        if pos is None:
+            return None
+        spans = object_spans(html, pos)
+        if section:
+            if section not in spans:
+                raise ValueError(f'No {section} section in contests')
+            start, end = spans[section]
+            return self.codec.loads(html[start:end])
+        return {
+            k: self.codec.loads(html[start:end])
+            for k, (start, end) in spans.items()
+        }
 
     def player_pool(self, draftables_fn=None, draftables=None):
         """Takes parsed draftables (from file or request) and creates player pool
@@ -0,0 +1,127 @@
+import datetime
+import logging
+
+from dkbestball.timestamps import parse_timestamp_fields, parse_timestamps
+
+
+class RefreshPlanner:
+    """Decides which contest leaderboards need to be fetched
+
+    Contests are classified as live, upcoming or finalized from the
+    megacontest_entered finalized entries, mycontests section or
+    ContestStatus, then compared against the FetchManifest. End dates are
+    not used: in season-long best ball contests ContestEndDate is the end of
+    the first week, and DraftGroupState is Historical once the draft is done.
+
+        finalized: fetched unless last fetched after it was final
+        live: fetched if last fetch is older than live_ttl
+        upcoming: fetched only if never fetched
+
+    Args:
+        manifest (FetchManifest): record of previous fetches
+        live_ttl (int): seconds before a live leaderboard is stale
+
+    """
+
+    LIVE = 'live'
+    UPCOMING = 'upcoming'
+    FINALIZED = 'finalized'
+
+    DATE_FIELDS = ('ContestStartDate', 'StartDate')
+
+    SECTIONS = {'live': LIVE, 'upcoming': UPCOMING, 'history': FINALIZED}
+
+    # ContestStatus of the mycontests live and upcoming sections
+    STATUSES = {1: UPCOMING, 7: LIVE}
+
+    def __init__(self, manifest, live_ttl=15 * 60):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.manifest = manifest
+        self.live_ttl = live_ttl
+
+    def _to_datetime(self, val):
+        """Converts str or datetime to timezone-aware datetime"""
+        if not val:
+            return None
+        if isinstance(val, str):
+            val = parse_timestamps([val])[0]
+        if val.tzinfo is None:
+            val = val.replace(tzinfo=datetime.timezone.utc)
+        return val
+
+    def classify(self, contest, now=None):
+        """Classifies contest as live, upcoming or finalized
+
+        Args:
+            contest (dict): contest from mycontests or megacontest_entered,
+                            section is the mycontests section if known
+            now (datetime): timezone-aware time, default now
+
+        Returns:
+            str
+
+        """
+        if contest.get('Finalized'):
+            return self.FINALIZED
+        if contest.get('section') in self.SECTIONS:
+            return self.SECTIONS[contest['section']]
+        if contest.get('ContestStatus') in self.STATUSES:
+            return self.STATUSES[contest['ContestStatus']]
+        # unknown status, not finalized without evidence
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        start = self._to_datetime(
+            contest.get('ContestStartDate') or contest.get('StartDate'))
+        if start and start > now:
+            return self.UPCOMING
+        return self.LIVE
+
+    def is_stale(self, contest_id, state, now=None):
+        """Tests if contest leaderboard needs to be fetched
+
+        Args:
+            contest_id (int): the ContestId
+            state (str): live, upcoming or finalized
+            now (datetime): timezone-aware time, default now
+
+        Returns:
+            bool
+
+        """
+        rec = self.manifest.get(contest_id)
+        if rec is None:
+            return True
+        if state == self.FINALIZED:
+            return rec['state'] != self.FINALIZED
+        if state == self.UPCOMING:
+            return False
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        return now.timestamp() - rec['fetched'] >= self.live_ttl
+
+    def plan(self, contests, entered=None, now=None):
+        """Gets contests that need to be fetched
+
+        Args:
+            contests (list): of contest dict from mycontests
+            entered (list): of dict from Parser.megacontest_entered,
+                            adds Finalized and start by ContestId
+            now (datetime): timezone-aware time, default now
+
+        Returns:
+            list: of tuple (contest, state)
+
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        extra = {item['ContestId']: item for item in entered or []}
+        merged = [dict(extra.get(c['ContestId'], {}), **c) for c in contests]
+        parse_timestamp_fields(merged, self.DATE_FIELDS)
+        scheduled = []
+        for contest, item in zip(contests, merged):
+            state = self.classify(item, now=now)
+            if self.is_stale(contest['ContestId'], state, now=now):
+                scheduled.append((contest, state))
+        logging.info(f'{len(scheduled)} of {len(contests)} contests are stale')
+        return scheduled
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import threading
+import time
+
+
+class TokenBucket:
+    """Token-bucket rate limiter usable from threads and coroutines
+
+    Each call reserves one token. When the bucket is empty the caller
+    goes into debt and waits until its token has been refilled, so
+    concurrent callers are spaced out evenly at `rate` per second.
+
+    Args:
+        rate (float): tokens added per second
+        capacity (int): maximum number of tokens (burst size)
+
+    """
+
+    def __init__(self, rate, capacity=1):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Takes one token and returns seconds to wait until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity,
+                               self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self):
+        """Waits for a token without blocking the event loop"""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def wait(self):
+        """Blocks until a token is available"""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class AdaptivePacer(TokenBucket):
+    """Token bucket whose rate adapts to how the server is responding
+
+    Uses additive-increase / multiplicative-decrease (AIMD): every fast,
+    successful response nudges the rate up by `increase` requests/sec,
+    while a 429, a 5xx or a smoothed latency above `target_latency` cuts
+    it by `decrease`. Cuts happen at most once per `cooldown` seconds so
+    a burst of in-flight failures does not collapse the rate to the floor.
+
+    Args:
+        rate (float): initial requests per second
+        min_rate (float): rate floor
+        max_rate (float): rate ceiling
+        increase (float): requests/sec added per fast success
+        decrease (float): multiplier applied when throttled
+        target_latency (float): seconds, slower responses signal congestion
+        cooldown (float): minimum seconds between rate cuts
+
+    """
+
+    def __init__(self,
+                 rate=10,
+                 min_rate=.5,
+                 max_rate=50,
+                 increase=.1,
+                 decrease=.5,
+                 target_latency=2.0,
+                 cooldown=1.0):
+        super().__init__(rate=rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self._started = None
+        self._last_cut = 0.0
+        self._ewma_latency = None
+        self._latency_total = 0.0
+        self._requests = 0
+        self._errors = 0
+        self._throttles = 0
+
+    def _cut(self, now):
+        """Applies multiplicative decrease, returns True if rate changed"""
+        if now - self._last_cut < self.cooldown:
+            return False
+        self._last_cut = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._throttles += 1
+        return True
+
+    def record(self, status_code, latency, retry_after=None):
+        """Records a response and adjusts the rate
+
+        Args:
+            status_code (int): HTTP status code
+            latency (float): seconds the request took
+            retry_after (float): Retry-After header in seconds, if any
+
+        Returns:
+            bool: True if the response was throttled or failed
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._started is None:
+                self._started = now - latency
+            self._requests += 1
+            self._latency_total += latency
+            if self._ewma_latency is None:
+                self._ewma_latency = latency
+            else:
+                self._ewma_latency = .8 * self._ewma_latency + .2 * latency
+
+            failed = status_code == 429 or status_code >= 500
+            if failed:
+                self._errors += 1
+                if self._cut(now):
+                    logging.info(f'throttled ({status_code}), '
+                                 f'rate now {self.rate:.2f}/s')
+                # hold off all callers until the server says to retry
+                if retry_after:
+                    self._tokens = min(self._tokens,
+                                       0) - retry_after * self.rate
+            elif self._ewma_latency > self.target_latency:
+                if self._cut(now):
+                    logging.info(f'latency {self._ewma_latency:.2f}s, '
+                                 f'rate now {self.rate:.2f}/s')
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+            return failed
+
+    def stats(self):
+        """Gets pacing statistics
+
+        Returns:
+            dict with keys rate, requests, errors, throttle_events,
+            mean_latency, ewma_latency, throughput
+
+        """
+        with self._lock:
+            elapsed = time.monotonic() - (self._started or time.monotonic())
+            n = self._requests
+            return {
+                'rate': round(self.rate, 3),
+                'requests': n,
+                'errors': self._errors,
+                'throttle_events': self._throttles,
+                'mean_latency': self._latency_total / n if n else None,
+                'ewma_latency': self._ewma_latency,
+                'throughput': n / elapsed if elapsed else None
+            }
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,267 @@
+import gzip
+import io
+import logging
+import os
+from pathlib import Path
+import threading
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class RawFiles:
+    """Raw payloads as one JSON file per key, e.g. rosters/{entry_key}.json
+
+    The default raw layout. RawStore has the same interface.
+
+    Args:
+        root (Path): directory of files
+
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def __contains__(self, key):
+        return self.path(key).is_file()
+
+    def keys(self):
+        """Gets stored keys"""
+        return [int(pth.stem) for pth in self.root.glob('*.json')]
+
+    def locate(self, key):
+        """Gets [size, mtime_ns] of file of key, or None"""
+        try:
+            st = self.path(key).stat()
+        except FileNotFoundError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def open(self, key):
+        """Opens payload as binary file object"""
+        return self.path(key).open('rb')
+
+    def path(self, key):
+        """Gets file of key"""
+        return self.root / f'{key}.json'
+
+    def put(self, key, data):
+        """Writes payload bytes of key
+           Written to a temp file and renamed, so an interrupted write
+           never leaves a truncated file
+        """
+        pth = self.path(key)
+        tmp = pth.with_suffix('.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, pth)
+
+    def read(self, key):
+        """Reads payload bytes of key"""
+        return self.path(key).read_bytes()
+
+
+class RawStore:
+    """Raw payloads appended to compressed newline-delimited shards
+
+    Each payload is compressed as its own gzip member or zstd frame and
+    appended to the current shard, so a shard decompresses as a whole to
+    newline-delimited JSON, and any payload can be read alone by seeking
+    to its offset. The index is a flat binary file of
+    (key, shard, offset, length) records; the last record of a key wins,
+    but earlier payloads stay in the shards and are read with versions.
+    So unlike RawFiles, a store needs no SnapshotArchive.
+
+        raw/rosters/shard-00000.ndjson.gz
+        raw/rosters/index.bin
+
+    Args:
+        root (Path): store directory
+        compression (str): 'gzip' or 'zstd' (requires zstandard)
+        shard_size (int): bytes after which a new shard is started
+
+    """
+
+    EXTENSIONS = {'gzip': 'gz', 'zstd': 'zst'}
+
+    INDEX_DTYPE = np.dtype([('key', '<i8'), ('shard', '<i4'),
+                            ('offset', '<i8'), ('length', '<i4')])
+
+    def __init__(self, root, compression='gzip', shard_size=256 * 2**20):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f'Unknown compression {compression}')
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError('zstd compression requires zstandard')
+        self.root = Path(root)
+        self.compression = compression
+        self.shard_size = shard_size
+        self._index = None
+        self._fh = None
+        self._shard = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return int(key) in self._get_index()
+
+    def __getstate__(self):
+        # open file and index are not sent to worker processes
+        state = self.__dict__.copy()
+        state.update(_index=None, _fh=None, _shard=None, _lock=None)
+        return state
+
+    def __len__(self):
+        return len(self._get_index())
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self):
+        return self.root / 'index.bin'
+
+    def _compress(self, data):
+        """Compresses payload as standalone member / frame"""
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor().compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def _decompress(self, blob):
+        """Decompresses one member / frame"""
+        if self.compression == 'zstd':
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    def _get_index(self):
+        """Gets index of key -> (shard, offset, length), loaded once"""
+        if self._index is None:
+            recs = self._records()
+            cols = [
+                recs[k].tolist() for k in ('key', 'shard', 'offset', 'length')
+            ]
+            self._index = {k: (s, o, ln) for k, s, o, ln in zip(*cols)}
+        return self._index
+
+    def _read_blob(self, shard, offset, length):
+        """Reads and decompresses payload at location"""
+        with self._shard_path(shard).open('rb') as f:
+            f.seek(offset)
+            return self._decompress(f.read(length))
+
+    def _records(self):
+        """Gets every index record, oldest first"""
+        if not self.index_path.is_file():
+            return np.zeros(0, dtype=self.INDEX_DTYPE)
+        buf = self.index_path.read_bytes()
+        # drop a record torn by an interrupted write
+        n = len(buf) // self.INDEX_DTYPE.itemsize
+        return np.frombuffer(buf[:n * self.INDEX_DTYPE.itemsize],
+                             dtype=self.INDEX_DTYPE)
+
+    def _repair_index(self):
+        """Truncates a record torn by an interrupted write, so appended
+           records stay aligned
+        """
+        if not self.index_path.is_file():
+            return
+        size = self.index_path.stat().st_size
+        good = size - size % self.INDEX_DTYPE.itemsize
+        if good < size:
+            logging.info(f'Truncating torn index record at {good}')
+            with self.index_path.open('r+b') as f:
+                f.truncate(good)
+
+    def _shard_path(self, shard):
+        """Gets path of shard"""
+        ext = self.EXTENSIONS[self.compression]
+        return self.root / f'shard-{shard:05d}.ndjson.{ext}'
+
+    def close(self):
+        """Closes the open shard"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+            self._fh = None
+
+    def keys(self):
+        """Gets stored keys"""
+        return list(self._get_index())
+
+    def locate(self, key):
+        """Gets [shard, offset, length] of key, or None"""
+        loc = self._get_index().get(int(key))
+        return list(loc) if loc else None
+
+    def open(self, key):
+        """Opens payload as binary file object"""
+        return io.BytesIO(self.read(key))
+
+    def put(self, key, data):
+        """Appends payload bytes of key
+
+        Args:
+            key (int): entry key or contest id
+            data (bytes): JSON payload
+
+        Returns:
+            None
+
+        """
+        blob = self._compress(data.rstrip(b'\n') + b'\n')
+        with self._lock:
+            index = self._get_index()
+            if self._fh is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._repair_index()
+                self._shard = max((loc[0] for loc in index.values()),
+                                  default=0)
+                self._fh = self._shard_path(self._shard).open('ab')
+            offset = self._fh.tell()
+            if offset and offset + len(blob) > self.shard_size:
+                self._fh.close()
+                self._shard += 1
+                self._fh = self._shard_path(self._shard).open('ab')
+                offset = self._fh.tell()
+            self._fh.write(blob)
+            self._fh.flush()
+
+            # payload is on disk before the index points to it
+            rec = np.array([(int(key), self._shard, offset, len(blob))],
+                           dtype=self.INDEX_DTYPE)
+            with self.index_path.open('ab') as f:
+                f.write(rec.tobytes())
+            index[int(key)] = (self._shard, offset, len(blob))
+
+    def read(self, key):
+        """Reads payload bytes of key
+
+        Raises:
+            KeyError if key is not stored
+
+        """
+        return self._read_blob(*self._get_index()[int(key)])
+
+    def versions(self, key):
+        """Reads every stored payload of key, oldest first
+
+        Args:
+            key (int): entry key or contest id
+
+        Returns:
+            list: of bytes, the last is the current payload
+
+        """
+        recs = self._records()
+        recs = recs[recs['key'] == int(key)]
+        return [
+            self._read_blob(int(r['shard']), int(r['offset']),
+                            int(r['length'])) for r in recs
+        ]
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import logging
+from pathlib import Path
+import pickle
+import threading
+
+from dkbestball.parser import Parser
+
+
+class PlayerPoolRegistry:
+    """Shares player pools across contests, keyed by draft group id
+
+    Each draftables file is parsed once with Parser.player_pool_dict and
+    the result kept in a bounded LRU cache. With persist=True the pool is
+    also pickled next to the JSON (draftables_37605.idx.pkl) and reused
+    while it is newer than the JSON.
+
+    Draftables are looked up as datadir/draftables_{id}.json (Updater
+    layout) or datadir/draftables/{id}.json.
+
+    Args:
+        datadir (Path): data directory
+        parser (Parser): parser used to build the pool
+        maxsize (int): number of pools kept in memory
+        persist (bool): write and reuse the pickled pool
+
+    """
+
+    def __init__(self, datadir, parser=None, maxsize=16, persist=False):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.datadir = Path(datadir)
+        self.maxsize = maxsize
+        self.persist = persist
+        self.hits = 0
+        self.misses = 0
+        self._p = parser or Parser()
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, draftgroup_id):
+        return int(draftgroup_id) in self._pools
+
+    def __len__(self):
+        return len(self._pools)
+
+    def _index_path(self, pth):
+        """Gets path of pickled pool for draftables path"""
+        return pth.with_suffix('.idx.pkl')
+
+    def clear(self):
+        """Drops all cached pools"""
+        with self._lock:
+            self._pools.clear()
+
+    def draftables_path(self, draftgroup_id):
+        """Gets draftables path for draft group
+
+        Returns:
+            Path
+
+        Raises:
+            FileNotFoundError: if no draftables file exists
+
+        """
+        candidates = (self.datadir / f'draftables_{draftgroup_id}.json',
+                      self.datadir / 'draftables' / f'{draftgroup_id}.json')
+        for pth in candidates:
+            if pth.is_file():
+                return pth
+        raise FileNotFoundError(
+            f'No draftables for draft group {draftgroup_id}')
+
+    def get(self, draftgroup_id):
+        """Gets player pool dict for draft group
+
+        Args:
+            draftgroup_id (int): the DraftGroupId
+
+        Returns:
+            dict of dict: same as Parser.player_pool_dict
+
+        """
+        key = int(draftgroup_id)
+        with self._lock:
+            if key in self._pools:
+                self._pools.move_to_end(key)
+                self.hits += 1
+                return self._pools[key]
+            self.misses += 1
+        pool = self.load(key)
+        with self._lock:
+            self._pools[key] = pool
+            while len(self._pools) > self.maxsize:
+                self._pools.popitem(last=False)
+        return pool
+
+    def load(self, draftgroup_id):
+        """Loads player pool from disk, bypassing the memory cache"""
+        pth = self.draftables_path(draftgroup_id)
+        idx = self._index_path(pth)
+        fresh = idx.is_file() and idx.stat().st_mtime >= pth.stat().st_mtime
+        if self.persist and fresh:
+            with idx.open('rb') as f:
+                return pickle.load(f)
+        pool = self._p.player_pool_dict(draftables_fn=pth)
+        if self.persist:
+            tmp = idx.with_suffix('.tmp')
+            with tmp.open('wb') as f:
+                pickle.dump(pool, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(idx)
+        return pool
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,141 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+class LineupScorer:
+    """Scores best ball rosters from weekly player points
+
+    Each week a roster scores its optimal lineup, the best players at each
+    position plus the best remaining flex players. Rosters are scored
+    together: players are gathered into an entry x slot x week array per
+    position, sorted along the slot axis, and the top slots summed.
+    Players without points that week (bye, not in points) score 0, as
+    does a lineup slot without an eligible player.
+
+    Args:
+        points (DataFrame): player x week points, indexed by key
+        key (str): roster column matching the points index
+        lineup (dict): starters by position
+        flex (tuple): positions eligible for flex
+        n_flex (int): flex starters
+
+    """
+
+    LINEUP = {'QB': 1, 'RB': 2, 'WR': 3, 'TE': 1}
+
+    FLEX_POSITIONS = ('RB', 'WR', 'TE')
+
+    def __init__(self,
+                 points,
+                 key='draftableId',
+                 lineup=None,
+                 flex=None,
+                 n_flex=1):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.points = points
+        self.key = key
+        self.lineup = lineup if lineup else self.LINEUP
+        self.flex = flex if flex else self.FLEX_POSITIONS
+        self.n_flex = n_flex
+
+        # last row is for players without points
+        vals = np.nan_to_num(points.to_numpy(dtype=np.float64), nan=0.0)
+        self._points = np.vstack([vals, np.zeros((1, vals.shape[1]))])
+
+    @staticmethod
+    def _sum(pts):
+        """Sums slots, empty slots score 0"""
+        return np.where(np.isneginf(pts), 0, pts).sum(axis=1)
+
+    @staticmethod
+    def _top(pts, k):
+        """Sorts slots best first along the slot axis"""
+        return -np.sort(-pts, axis=1)
+
+    def lineup_points(self, slots, points, top=None):
+        """Gets optimal lineup points of each entry and points column
+
+        Args:
+            slots (dict): position -> entry x slot rows, see slot_index
+            points (ndarray): player x column points, rows as in slots,
+                              each column is scored alone, e.g. a week
+            top (callable): top(pts, k) gets pts with the k best slots
+                            first, best first, default sorts all slots
+
+        Returns:
+            ndarray of entry x column
+
+        """
+        top = top if top else self._top
+        first = next(iter(slots.values()))
+        total = np.zeros((len(first), points.shape[1]), dtype=points.dtype)
+        bench = []
+        for position, n_start in self.lineup.items():
+            idx = slots[position]
+            pts = points[idx]
+            pts[idx < 0] = -np.inf
+            is_flex = position in self.flex
+            k = n_start + self.n_flex if is_flex else n_start
+            pts = top(pts, k)
+            total += self._sum(pts[:, :n_start])
+            if is_flex:
+                bench.append(pts[:, n_start:k])
+        if bench and self.n_flex:
+            pts = top(np.concatenate(bench, axis=1), self.n_flex)
+            total += self._sum(pts[:, :self.n_flex])
+        return total
+
+    def score(self, rosters):
+        """Scores optimal weekly lineups of rosters
+
+        Args:
+            rosters (DataFrame): entryKey, position and key, one row per
+                                 roster player, e.g. Parser.contest_rosters
+                                 or Analyzer.myrosters; or list of dict as
+                                 from Parser.contest_roster
+
+        Returns:
+            DataFrame indexed by entryKey, a column per week and total
+
+        """
+        entries, slots = self.slot_index(rosters)
+        total = self.lineup_points(slots, self._points)
+        scores = pd.DataFrame(total,
+                              index=pd.Index(entries, name='entryKey'),
+                              columns=self.points.columns)
+        scores['total'] = total.sum(axis=1)
+        return scores
+
+    def slot_index(self, rosters):
+        """Gets points rows of each entry's players by position
+
+        Args:
+            rosters (DataFrame): see score
+
+        Returns:
+            tuple: entry keys, dict of position -> entry x slot ndarray
+            of rows of points, -1 pads empty slots and the last row is
+            for players without points
+
+        """
+        df = pd.DataFrame(rosters) if isinstance(rosters, list) else rosters
+        entry, entries = pd.factorize(df['entryKey'])
+        rows = pd.Index(self.points.index).get_indexer(df[self.key])
+        rows = np.where(rows < 0, len(self.points), rows)
+        pos = df['position'].astype(object).to_numpy()
+        slots = {}
+        for position in self.lineup:
+            mask = pos == position
+            e = entry[mask]
+            rank = pd.Series(e).groupby(e).cumcount().to_numpy()
+            width = rank.max() + 1 if len(rank) else 0
+            idx = np.full((len(entries), width), -1)
+            idx[e, rank] = rows[mask]
+            slots[position] = idx
+        return entries, slots
+
+
+if __name__ == '__main__':
+    pass
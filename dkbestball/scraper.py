@@ -8,8 +8,28 @@ from requests_html import HTMLSession
 class Scraper:
     """Scrape DK site for data"""
 
-    def __init__(self, browser_name='firefox'):
+    def __init__(self,
+                 browser_name='firefox',
+                 cache=None,
+                 pacer=None,
+                 max_retries=3,
+                 api_url=None):
+        """Creates Scraper
+
+        Args:
+            browser_name (str): browser to load cookies from,
+                                None sends no cookies (e.g. local test server)
+            cache (ResponseCache): optional on-disk response cache
+            pacer (AdaptivePacer): optional request pacing controller
+            max_retries (int): retries after 429/5xx when pacer is set
+            api_url (str): base URL of the API, default api.draftkings.com
+
+        """
         logging.getLogger(__file__).addHandler(logging.NullHandler())
+        self._api_url = api_url or 'https://api.draftkings.com/'
+        self.cache = cache
+        self.pacer = pacer
+        self.max_retries = max_retries
         self.s = HTMLSession()
         self.s.headers.update({
             'Connection': 'keep-alive',
@@ -26,12 +46,12 @@ class Scraper:
 
         if browser_name == 'firefox':
             self.s.cookies.update(browser_cookie3.firefox())
-        else:
+        elif browser_name is not None:
             raise ValueError('Only firefox cookies are supported at this time')
 
     @property
     def api_url(self):
-        return 'https://api.draftkings.com/'
+        return self._api_url
 
     @property
     def base_params(self):
@@ -40,12 +60,33 @@ class Scraper:
     def _embed_params(self, embed_type):
         return dict(**self.base_params, **{'embed': embed_type})
 
-    def contest_leaderboard(self, contest_id):
+    def _get(self, url, **kwargs):
+        """Gets url, paced and retried if there is a pacer
+           Returns the last response once retries are used up
+        """
+        if not self.pacer:
+            return self.s.get(url, **kwargs)
+        for attempt in range(self.max_retries + 1):
+            self.pacer.wait()
+            start = time.monotonic()
+            r = self.s.get(url, **kwargs)
+            latency = time.monotonic() - start
+            try:
+                retry_after = float(r.headers.get('Retry-After', 0))
+            except ValueError:
+                retry_after = None
+            if not self.pacer.record(r.status_code, latency, retry_after):
+                break
+            logging.info(f'{r.status_code} from {url}, attempt {attempt + 1}')
+        return r
+
+    def contest_leaderboard(self, contest_id, final=False):
         """Gets contest leaderboard
            For week 1, MegaContestId = ContestId. Week 2+ have unique ContestId.
         
         Args:
             contest_id (int): the ContestId
+            final (bool): contest is finalized, cached copy never expires
 
         Returns:
             dict
@@ -53,14 +94,18 @@ class Scraper:
         """
         url = self.api_url + f'scores/v1/leaderboards/{contest_id}'
         params = self._embed_params('leaderboard')
-        return self.get_json(url, params=params)
+        return self.get_json(url,
+                             params=params,
+                             endpoint='leaderboard',
+                             final=final)
 
-    def contest_roster(self, draftgroup_id, entry_key):
+    def contest_roster(self, draftgroup_id, entry_key, final=False):
         """Gets contest roster
         
         Args:
             draftgroup_id (int): the DraftGroupId, e.g. 37605
             entry_key (int): the ID of the user's entry into the contest
+            final (bool): draft group is historical, cached copy never expires
 
         Returns:
             dict
@@ -68,25 +113,70 @@ class Scraper:
         """
         url = self.api_url + f'scores/v2/entries/{draftgroup_id}/{entry_key}'
         params = self._embed_params('roster')
-        return self.get_json(url, params=params)
-
-    def get_json(self, url, params=None, headers=None, cookies=None):
+        return self.get_json(url,
+                             params=params,
+                             endpoint='roster',
+                             final=final)
+
+    def get_json(self,
+                 url,
+                 params=None,
+                 headers=None,
+                 cookies=None,
+                 endpoint=None,
+                 final=False):
         """Gets json resource
+           Uses the response cache, if any, when endpoint is given
         
         Args:
             url (str): the resource URL
             headers (dict): one-time headers for the request
             cookies (CookieJar): one-time cookie jar
+            endpoint (str): endpoint name for cache time-to-live
+            final (bool): resource will not change, cached copy never expires
 
-        """
-        r = self.s.get(url, params=params, headers=headers, cookies=cookies)
-        return r.json()
+        Returns:
+            dict
 
-    def megacontest_leaderboard(self, megacontest_id):
+        Raises:
+            requests.HTTPError: error status after the last retry
+
+        """
+        if not self.cache or not endpoint:
+            r = self._get(url, params=params, headers=headers, cookies=cookies)
+            r.raise_for_status()
+            return r.json()
+
+        entry = self.cache.get(url, params)
+        if entry and self.cache.is_fresh(entry):
+            return entry['content']
+
+        # revalidate stale entry if server supplied validators
+        if entry:
+            headers = dict(headers or {}, **self.cache.validators(entry))
+        r = self._get(url, params=params, headers=headers, cookies=cookies)
+        if entry and r.status_code == 304:
+            self.cache.refresh(url, params, entry)
+            return entry['content']
+
+        r.raise_for_status()
+        content = r.json()
+        ttl = None if final else self.cache.ttl(endpoint)
+        if ttl != 0:
+            self.cache.put(url,
+                           params,
+                           content,
+                           ttl=ttl,
+                           etag=r.headers.get('ETag'),
+                           last_modified=r.headers.get('Last-Modified'))
+        return content
+
+    def megacontest_leaderboard(self, megacontest_id, final=False):
         """Gets megacontest leaderboard (overall leaderboard)
         
         Args:
             megacontest_id (int): the MegaContestId
+            final (bool): megacontest is finalized, cached copy never expires
 
         Returns:
             dict
@@ -94,7 +184,10 @@ class Scraper:
         """
         url = self.api_url + f'scores/v1/megacontests/{megacontest_id}/leaderboard'
         params = self._embed_params('leaderboard')
-        return self.get_json(url, params=params)
+        return self.get_json(url,
+                             params=params,
+                             endpoint='megacontest',
+                             final=final)
 
     def megacontest_entered(self, megacontest_id, userkey):
         """Gets megacontest data (including associated weekly contests)
@@ -109,7 +202,7 @@ class Scraper:
         """
         url = self.api_url + f'scores/v1/contest/entered/{userkey}/megacontest/{megacontest_id}'
         params = self.base_params
-        return self.get_json(url, params=params)
+        return self.get_json(url, params=params, endpoint='entered')
 
     def mycontests(self):
         """Gets mycontest resource
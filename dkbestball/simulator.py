@@ -0,0 +1,212 @@
+from concurrent.futures import ProcessPoolExecutor
+import logging
+
+import numpy as np
+import pandas as pd
+
+from dkbestball.scoring import LineupScorer
+
+# simulator of each worker process
+_WORKER = {}
+
+
+def _init_sim_worker(sim):
+    """Keeps the simulator of a worker process"""
+    _WORKER['sim'] = sim
+
+
+def _sim_batch_worker(args):
+    """Simulates one batch in a worker process"""
+    return _WORKER['sim'].simulate_batch(*args)
+
+
+def _top_slots(pts, k):
+    """Moves the k best slots first, best first, in place
+
+    A partial bubble sort along the slot axis: a batch has many
+    (simulation, week) columns but few players per position, so k passes
+    of elementwise max / min over whole slot columns beat a full np.sort
+    along a short, strided axis.
+    """
+    width = pts.shape[1]
+    for j in range(min(k, width - 1)):
+        for i in range(width - 1, j, -1):
+            hi = np.maximum(pts[:, i - 1], pts[:, i])
+            pts[:, i] = np.minimum(pts[:, i - 1], pts[:, i])
+            pts[:, i - 1] = hi
+    return pts
+
+
+class AdvancementSimulator:
+    """Monte Carlo estimate of advancing from tournament round pods
+
+    Each simulation draws points of every player for each week of the
+    round, scores the optimal best ball lineups of every roster with
+    LineupScorer, and ranks the entries of each pod (contest). Weekly
+    points are drawn from a normal distribution (mean, std), floored at 0,
+    or resampled from the player's historical weeks.
+
+    Simulations run in batches of NumPy arrays, so a batch is one
+    player x (simulation, week) draw and one lineup pass; batches can be
+    spread over a process pool.
+
+    Args:
+        rosters (DataFrame): contestKey, entryKey, userName, position and
+                             key of every roster in the pods, e.g. from
+                             Parser.contest_roster
+        mean (Series): mean weekly points by key
+        std (Series): std of weekly points by key
+        history (DataFrame): player x past week points by key, NaN for
+                             weeks not played
+        n_weeks (int): weeks in the round
+        advance (int): top places of each pod that advance
+        payouts (list): payout by place, first place first
+        key (str): roster column matching the points index
+
+    """
+
+    def __init__(self,
+                 rosters,
+                 mean=None,
+                 std=None,
+                 history=None,
+                 n_weeks=1,
+                 advance=1,
+                 payouts=None,
+                 key='draftableId'):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        if (mean is None) == (history is None):
+            raise ValueError('Pass either mean and std, or history')
+        if mean is not None and std is None:
+            raise ValueError('Pass std with mean')
+        df = pd.DataFrame(rosters) if isinstance(rosters, list) else rosters
+        self.n_weeks = n_weeks
+        self.advance = advance
+        self.payouts = np.asarray(payouts if payouts else [], dtype=float)
+
+        # player rows and lineup slots are built once
+        self.players = pd.Index(pd.unique(df[key]))
+        self._scorer = LineupScorer(pd.DataFrame(index=self.players), key=key)
+        entries, self._slots = self._scorer.slot_index(df)
+        first = df.drop_duplicates('entryKey').set_index('entryKey')
+        self.entries = first.loc[entries, ['contestKey', 'userName']]
+        self.entries = self.entries.rename_axis('entryKey').reset_index()
+
+        # pod x place entry rows, -1 pads smaller pods
+        pod, self.pods = pd.factorize(self.entries['contestKey'])
+        rank = pd.Series(pod).groupby(pod).cumcount().to_numpy()
+        self._pod_index = np.full((len(self.pods), rank.max() + 1), -1)
+        self._pod_index[pod, rank] = np.arange(len(pod))
+
+        if history is not None:
+            hist = history.reindex(self.players).to_numpy(dtype=np.float32)
+            # played weeks first in each row
+            self._history = np.sort(hist, axis=1)
+            self._n_played = np.isfinite(hist).sum(axis=1)
+        else:
+            self._history = None
+            self._mean = mean.reindex(
+                self.players).fillna(0).to_numpy(dtype=np.float32)
+            self._std = std.reindex(
+                self.players).fillna(0).to_numpy(dtype=np.float32)
+
+    def _draw(self, rng, n_sims):
+        """Draws player x (simulation, week) points
+
+        Returns:
+            ndarray with a last row of zeros for players without points
+
+        """
+        shape = (len(self.players), n_sims * self.n_weeks)
+        if self._history is None:
+            pts = rng.standard_normal(shape, dtype=np.float32)
+            pts = np.maximum(pts * self._std[:, None] + self._mean[:, None], 0)
+        else:
+            # uniform pick among each player's played weeks
+            u = rng.random(shape, dtype=np.float32)
+            col = (u * self._n_played[:, None]).astype(np.int64)
+            col = np.minimum(col, np.maximum(self._n_played - 1, 0)[:, None])
+            pts = np.take_along_axis(self._history, col, axis=1)
+            pts[self._n_played == 0] = 0
+        return np.vstack([pts, np.zeros((1, shape[1]), dtype=pts.dtype)])
+
+    def _places(self, totals, rng):
+        """Gets place in pod of entry x simulation totals, 0 is first
+
+        Ties are broken at random, so no entry advances on its index.
+        """
+        pts = totals[self._pod_index]
+        pts[self._pod_index < 0] = -np.inf
+        order = np.lexsort((rng.random(pts.shape), -pts), axis=1)
+        ranks = np.argsort(order, axis=1, kind='stable')
+        places = np.empty_like(totals, dtype=np.int64)
+        valid = self._pod_index >= 0
+        places[self._pod_index[valid]] = ranks[valid]
+        return places
+
+    def run(self, n_sims=100000, batch_size=200, workers=1, seed=None):
+        """Runs simulations
+
+        Args:
+            n_sims (int): number of simulations
+            batch_size (int): simulations per batch
+            workers (int): processes, 1 runs in this process
+            seed (int): seed for reproducible results
+
+        Returns:
+            DataFrame with columns contestKey, entryKey, userName,
+            mean_points, p_advance, exp_payout
+
+        """
+        sizes = [batch_size] * (n_sims // batch_size)
+        if n_sims % batch_size:
+            sizes.append(n_sims % batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        batches = list(zip(sizes, seeds))
+        logging.info(f'Simulating {n_sims} rounds in {len(sizes)} batches')
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_sim_worker,
+                                     initargs=(self, )) as pool:
+                results = list(pool.map(_sim_batch_worker, batches))
+        else:
+            results = [self.simulate_batch(*batch) for batch in batches]
+
+        sums = np.sum(results, axis=0)
+        df = self.entries.copy()
+        df['mean_points'] = (sums[0] / n_sims).round(2)
+        df['p_advance'] = (sums[1] / n_sims).round(4)
+        df['exp_payout'] = (sums[2] / n_sims).round(2)
+        return df.sort_values(['contestKey', 'p_advance'],
+                              ascending=[True, False],
+                              ignore_index=True)
+
+    def simulate_batch(self, n_sims, seed):
+        """Simulates a batch of rounds
+
+        Args:
+            n_sims (int): simulations in batch
+            seed (SeedSequence): seed of the batch
+
+        Returns:
+            ndarray of 3 x entry sums of points, advances and payouts
+
+        """
+        rng = np.random.default_rng(seed)
+        pts = self._draw(rng, n_sims)
+        weekly = self._scorer.lineup_points(self._slots, pts, top=_top_slots)
+        totals = weekly.reshape(len(self.entries), n_sims,
+                                self.n_weeks).sum(axis=2)
+        places = self._places(totals, rng)
+        payout = np.zeros_like(totals, dtype=np.float64)
+        paid = places < len(self.payouts)
+        payout[paid] = self.payouts[places[paid]]
+        return np.stack([
+            totals.sum(axis=1, dtype=np.float64), (places
+                                                   < self.advance).sum(axis=1),
+            payout.sum(axis=1)
+        ])
+
+
+if __name__ == '__main__':
+    pass
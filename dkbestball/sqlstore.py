@@ -0,0 +1,243 @@
+import logging
+from pathlib import Path
+import sqlite3
+
+import pandas as pd
+
+
+class SQLiteStore:
+    """SQLite store of parsed contests, entries, rosters and players
+
+    Reports are computed in SQL against indexed tables, so they do not
+    load the rosters into memory:
+
+        contests   one row per contest, indexed by contest_type, season
+        entries    (contest_key, entry_key) of every leaderboard entry
+        rosters    (contest_key, entry_key, draftable_id) of my rosters
+        players    one row per draftable_id
+
+    Args:
+        path (Path): database file
+
+    """
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS contests (
+            contest_key TEXT PRIMARY KEY,
+            contest_name TEXT,
+            contest_type TEXT,
+            season INTEGER,
+            contest_size INTEGER,
+            entry_fee REAL,
+            draftgroup_id INTEGER,
+            winnings REAL,
+            leader_points REAL,
+            my_place INTEGER,
+            my_points REAL,
+            my_entry_key TEXT
+        );
+        CREATE INDEX IF NOT EXISTS contests_type
+            ON contests (contest_type, season);
+        CREATE TABLE IF NOT EXISTS entries (
+            contest_key TEXT,
+            entry_key TEXT,
+            PRIMARY KEY (contest_key, entry_key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS rosters (
+            contest_key TEXT,
+            entry_key TEXT,
+            draftgroup_id INTEGER,
+            lineup_id INTEGER,
+            user_name TEXT,
+            user_key TEXT,
+            draftable_id INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS rosters_contest ON rosters (contest_key);
+        CREATE INDEX IF NOT EXISTS rosters_player ON rosters (draftable_id);
+        CREATE TABLE IF NOT EXISTS players (
+            draftable_id INTEGER PRIMARY KEY,
+            draftgroup_id INTEGER,
+            player_id INTEGER,
+            player_dk_id INTEGER,
+            display_name TEXT,
+            position TEXT,
+            team TEXT
+        );
+    '''
+
+    CONTEST_FIELDS = [
+        'contest_key', 'contest_name', 'contest_type', 'season',
+        'contest_size', 'entry_fee', 'draftgroup_id', 'winnings',
+        'leader_points', 'my_place', 'my_points', 'my_entry_key'
+    ]
+
+    # roster columns as in Analyzer.myrosters
+    ROSTER_SELECT = '''
+        SELECT r.draftgroup_id AS draftGroupId, r.contest_key AS contestKey,
+               r.entry_key AS entryKey, r.lineup_id AS lineupId,
+               r.user_name AS userName, r.user_key AS userKey,
+               p.player_id AS playerId, p.player_dk_id AS playerDkId,
+               p.display_name AS displayName, p.position AS position,
+               p.team AS teamAbbreviation, r.draftable_id AS draftableId
+        FROM rosters r
+        JOIN players p USING (draftable_id)
+    '''
+
+    def __init__(self, path):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.path = Path(path)
+        self._con = None
+
+    @property
+    def con(self):
+        """Gets connection, creating tables on first use"""
+        if self._con is None:
+            self._con = sqlite3.connect(self.path)
+            self._con.executescript(self.SCHEMA)
+        return self._con
+
+    def _type_filter(self, contest_type):
+        """Gets WHERE clause and params restricting rosters to type"""
+        if not contest_type:
+            return '', []
+        sql = '''WHERE r.contest_key IN
+                 (SELECT contest_key FROM contests WHERE contest_type = ?)'''
+        return sql, [contest_type]
+
+    def close(self):
+        """Closes connection"""
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    def contest_keys(self):
+        """Gets stored contest keys
+
+        Returns:
+            set of str
+
+        """
+        rows = self.con.execute('SELECT contest_key FROM contests')
+        return {row[0] for row in rows}
+
+    def entries(self):
+        """Gets (contest_key, entry_key) of every leaderboard entry"""
+        sql = 'SELECT contest_key, entry_key FROM entries'
+        return pd.read_sql_query(sql, self.con)
+
+    def exists(self):
+        """Tests if store has been written"""
+        return self.path.is_file()
+
+    def financial_summary(self):
+        """Summarizes financial results, see Analyzer.financial_summary"""
+        sql = '''
+            SELECT contest_type, entry_fee, COUNT(contest_key) AS Entries,
+                   SUM(entry_fee) AS Paid, SUM(winnings) AS Won,
+                   ROUND((SUM(winnings) - SUM(entry_fee)) * 100.0
+                         / SUM(entry_fee), 1) AS ROI
+            FROM contests
+            GROUP BY contest_type, entry_fee
+            ORDER BY contest_type, entry_fee
+        '''
+        return pd.read_sql_query(sql, self.con)
+
+    def ownership(self, contest_type=None):
+        """Gets player ownership, see Analyzer.ownership
+
+        Args:
+            contest_type (str): only count rosters of this type
+
+        Returns:
+            DataFrame
+
+        """
+        where, params = self._type_filter(contest_type)
+        sql = f'''
+            WITH r AS (SELECT * FROM rosters r {where}),
+                 t AS (SELECT COUNT(DISTINCT entry_key) AS tot FROM r)
+            SELECT p.display_name AS displayName, p.position AS position,
+                   p.team AS teamAbbreviation, COUNT(r.user_name) AS n,
+                   t.tot AS tot,
+                   ROUND(COUNT(r.user_name) * 100.0 / t.tot, 1) AS pct
+            FROM r
+            JOIN players p USING (draftable_id)
+            CROSS JOIN t
+            GROUP BY p.display_name, p.position, p.team
+            ORDER BY pct DESC
+        '''
+        return pd.read_sql_query(sql, self.con, params=params)
+
+    def rosters(self, contest_type=None):
+        """Gets my rosters, see Analyzer.myrosters
+
+        Args:
+            contest_type (str): only rosters of this type
+
+        Returns:
+            DataFrame
+
+        """
+        where, params = self._type_filter(contest_type)
+        return pd.read_sql_query(f'{self.ROSTER_SELECT} {where}',
+                                 self.con,
+                                 params=params)
+
+    def standings(self, columns):
+        """Gets contests columns ordered by season, then contest_key
+
+        Args:
+            columns (list): contest fields
+
+        Returns:
+            DataFrame
+
+        """
+        cols = ', '.join(c for c in columns if c in self.CONTEST_FIELDS)
+        sql = f'SELECT {cols} FROM contests ORDER BY season, contest_key'
+        return pd.read_sql_query(sql, self.con)
+
+    def write(self, records, keep=None):
+        """Writes contest records to store in one transaction
+
+        Args:
+            records (list): of dict, parsed contest records with season
+                            and contest_type
+            keep (iterable): contest keys to keep, others are dropped,
+                             default keeps all
+
+        Returns:
+            None
+
+        """
+        con = self.con
+        with con:
+            gone = {d['contest_key'] for d in records}
+            if keep is not None:
+                gone |= self.contest_keys() - set(keep)
+            for table in ('contests', 'entries', 'rosters'):
+                con.executemany(f'DELETE FROM {table} WHERE contest_key = ?',
+                                [(k, ) for k in gone])
+            marks = ', '.join('?' * len(self.CONTEST_FIELDS))
+            con.executemany(f'INSERT INTO contests VALUES ({marks})',
+                            [[d.get(k) for k in self.CONTEST_FIELDS]
+                             for d in records])
+            con.executemany('INSERT INTO entries VALUES (?, ?)',
+                            [(d['contest_key'], k) for d in records
+                             for k in dict.fromkeys(d['entry_keys'])])
+            players = [(d['contest_key'], p) for d in records
+                       for p in d.get('myroster', [])]
+            con.executemany(
+                'INSERT INTO rosters VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(k, p['entryKey'], p['draftGroupId'], p['lineupId'],
+                  p['userName'], p['userKey'], p['draftableId'])
+                 for k, p in players])
+            con.executemany(
+                'INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(p['draftableId'], p['draftGroupId'], p.get('playerId'),
+                  p.get('playerDkId'), p['displayName'], p.get('position'),
+                  p.get('teamAbbreviation')) for _, p in players])
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,233 @@
+import logging
+import os
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+class ColumnarStore:
+    """Parquet store of parsed contests, entries and rosters
+
+    Replaces the pickled list of contest records with three tables, each
+    partitioned hive-style by season and contest type:
+
+        store/contests/season=2020/contest_type=Tournament/part-0.parquet
+        store/entries/...
+        store/rosters/...
+
+    contests has one row per contest, entries one row per leaderboard
+    entry and rosters one row per player on my roster. Reads only touch
+    the columns and partitions asked for. Requires pyarrow.
+
+    Args:
+        root (Path): store directory
+
+    """
+
+    PARTITION_FIELDS = {'season': 'int64', 'contest_type': 'string'}
+
+    TABLES = {
+        'contests': {
+            'contest_key': 'string',
+            'contest_name': 'string',
+            'contest_size': 'int64',
+            'entry_fee': 'double',
+            'draftgroup_id': 'int64',
+            'winnings': 'double',
+            'leader_points': 'double',
+            'my_place': 'int64',
+            'my_points': 'double',
+            'my_entry_key': 'string',
+            'n_entries': 'int64'
+        },
+        'entries': {
+            'contest_key': 'string',
+            'entry_key': 'string'
+        },
+        'rosters': {
+            'draftGroupId': 'int64',
+            'contestKey': 'string',
+            'entryKey': 'string',
+            'lineupId': 'int64',
+            'userName': 'string',
+            'userKey': 'string',
+            'playerId': 'int64',
+            'playerDkId': 'int64',
+            'displayName': 'string',
+            'position': 'string',
+            'teamAbbreviation': 'string',
+            'draftableId': 'int64'
+        }
+    }
+
+    # column holding the contest key in each table
+    KEY_FIELDS = {
+        'contests': 'contest_key',
+        'entries': 'contest_key',
+        'rosters': 'contestKey'
+    }
+
+    def __init__(self, root):
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        if pa is None:
+            raise ImportError('ColumnarStore requires pyarrow')
+        self.root = Path(root)
+
+    @staticmethod
+    def available():
+        """Tests if pyarrow is installed"""
+        return pa is not None
+
+    def _keys(self, keys):
+        """Gets arrow array of contest keys"""
+        return pa.array(list(keys), pa.string())
+
+    def _partition_path(self, table, season, contest_type):
+        """Gets parquet file of partition"""
+        season = '__HIVE_DEFAULT_PARTITION__' if season is None else season
+        return (self.root / table / f'season={season}' /
+                f'contest_type={contest_type}' / 'part-0.parquet')
+
+    def _rows(self, table, d):
+        """Gets rows of table for contest record"""
+        if table == 'contests':
+            return [{**d, 'n_entries': len(d['entry_keys'])}]
+        if table == 'entries':
+            return [{
+                'contest_key': d['contest_key'],
+                'entry_key': k
+            } for k in d['entry_keys']]
+        return d.get('myroster', [])
+
+    def _schema(self, table):
+        """Gets arrow schema of table, without partition fields"""
+        return pa.schema([(k, pa.type_for_alias(v))
+                          for k, v in self.TABLES[table].items()])
+
+    def _write_partition(self, pth, tbl):
+        """Replaces partition file, removing it if tbl is empty"""
+        if tbl.num_rows == 0:
+            if pth.is_file():
+                pth.unlink()
+            return
+        pth.parent.mkdir(parents=True, exist_ok=True)
+        tmp = pth.with_suffix('.tmp')
+        pq.write_table(tbl, tmp)
+        os.replace(tmp, pth)
+
+    def contest_keys(self):
+        """Gets stored contest keys
+
+        Returns:
+            set of str
+
+        """
+        if not self.exists():
+            return set()
+        tbl = self.read_arrow('contests', columns=['contest_key'])
+        return set(tbl['contest_key'].to_pylist())
+
+    def exists(self):
+        """Tests if store has been written"""
+        return (self.root / 'contests').is_dir()
+
+    def read(self, table, columns=None, filters=None):
+        """Reads table from store
+
+        Args:
+            table (str): contests, entries or rosters
+            columns (list): columns to read, default all
+            filters (dict): column -> value or list of values,
+                            partition fields prune whole files
+
+        Returns:
+            DataFrame
+
+        """
+        return self.read_arrow(table, columns, filters).to_pandas()
+
+    def read_arrow(self, table, columns=None, filters=None):
+        """Reads table from store as arrow Table, see read"""
+        fields = {**self.TABLES[table], **self.PARTITION_FIELDS}
+        schema = pa.schema([(k, pa.type_for_alias(v))
+                            for k, v in fields.items()])
+        if not (self.root / table).is_dir():
+            tbl = schema.empty_table()
+            return tbl.select(columns) if columns else tbl
+        parts = [schema.field(k) for k in self.PARTITION_FIELDS]
+        partitioning = ds.partitioning(pa.schema(parts), flavor='hive')
+        dataset = ds.dataset(self.root / table,
+                             schema=schema,
+                             format='parquet',
+                             partitioning=partitioning)
+        expr = None
+        for k, v in (filters or {}).items():
+            vals = v if isinstance(v, (list, tuple, set)) else [v]
+            cond = ds.field(k).isin(list(vals))
+            expr = cond if expr is None else expr & cond
+        return dataset.to_table(columns=columns, filter=expr)
+
+    def write(self, records, keep=None):
+        """Writes contest records to store
+
+        Only partitions holding a written, replaced or dropped contest
+        are rewritten.
+
+        Args:
+            records (list): of dict, parsed contest records with season
+                            and contest_type
+            keep (iterable): contest keys to keep, others are dropped,
+                             default keeps all
+
+        Returns:
+            None
+
+        """
+        replaced = {d['contest_key'] for d in records}
+        keep = None if keep is None else set(keep) | replaced
+
+        # partitions of new records and of stored contests going away
+        new = {}
+        for d in records:
+            new.setdefault((d['season'], d['contest_type']), []).append(d)
+        touched = set(new)
+        if self.exists():
+            stored = self.read_arrow(
+                'contests', columns=['contest_key', 'season', 'contest_type'])
+            gone = pc.is_in(stored['contest_key'], self._keys(replaced))
+            if keep is not None:
+                gone = pc.or_(
+                    gone,
+                    pc.invert(pc.is_in(stored['contest_key'],
+                                       self._keys(keep))))
+            for row in stored.filter(gone).to_pylist():
+                touched.add((row['season'], row['contest_type']))
+
+        for table, key in self.KEY_FIELDS.items():
+            schema = self._schema(table)
+            for season, contest_type in touched:
+                pth = self._partition_path(table, season, contest_type)
+                parts = []
+                if pth.is_file():
+                    old = pq.read_table(pth, schema=schema)
+                    mask = pc.invert(pc.is_in(old[key], self._keys(replaced)))
+                    if keep is not None:
+                        mask = pc.and_(mask,
+                                       pc.is_in(old[key], self._keys(keep)))
+                    parts.append(old.filter(mask))
+                rows = [
+                    row for d in new.get((season, contest_type), [])
+                    for row in self._rows(table, d)
+                ]
+                parts.append(pa.Table.from_pylist(rows, schema=schema))
+                self._write_partition(pth, pa.concat_tables(parts))
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,94 @@
+import codecs
+import json
+from pathlib import Path
+import re
+
+DECODER = json.JSONDecoder()
+SEPARATOR = re.compile(r'[\s,]*')
+
+
+def iter_chunks(source, chunk_size=2**16):
+    """Yields text chunks from a path, file object, response or iterable
+
+    Args:
+        source: Path or str path, binary or text file object, object with
+                iter_content (e.g. requests Response), or iterable of
+                bytes / str chunks
+        chunk_size (int): bytes per read
+
+    Yields:
+        str
+
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as fh:
+            yield from iter_chunks(fh, chunk_size)
+        return
+    if hasattr(source, 'iter_content'):
+        chunks = source.iter_content(chunk_size)
+    elif hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_array(source, keys, chunk_size=2**16):
+    """Yields items of the JSON array stored under the first of keys found
+       Only the current item and one chunk are held in memory.
+
+    Args:
+        source: anything accepted by iter_chunks
+        keys (iterable): candidate object keys, e.g. Leaderboard, leaderBoard
+        chunk_size (int): bytes per read
+
+    Yields:
+        decoded array items
+
+    """
+    keys = list(keys)
+    patt = re.compile(r'"(?:%s)"\s*:\s*\[' % '|'.join(map(re.escape, keys)))
+    overlap = max(len(k) for k in keys) + 64
+    chunks = iter_chunks(source, chunk_size)
+
+    # find start of array, keeping enough tail to match across chunks
+    buf = ''
+    for chunk in chunks:
+        buf += chunk
+        match = patt.search(buf)
+        if match:
+            buf = buf[match.end():]
+            break
+        buf = buf[-overlap:]
+    else:
+        raise ValueError(f'Could not find array for keys {keys}')
+
+    pos = 0
+    while True:
+        pos = SEPARATOR.match(buf, pos).end()
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        try:
+            if pos == len(buf):
+                raise ValueError('need more data')
+            item, pos = DECODER.raw_decode(buf, pos)
+        except ValueError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ValueError('JSON array is truncated or malformed')
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        yield item
+        if pos > chunk_size:
+            buf = buf[pos:]
+            pos = 0
+
+
+if __name__ == '__main__':
+    pass
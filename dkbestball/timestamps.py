@@ -0,0 +1,90 @@
+import datetime
+import re
+
+import dateparser
+import numpy as np
+import pandas as pd
+
+# DK timestamps are ISO-8601 UTC, usually with 7 fractional digits
+ISO_UTC = re.compile(
+    r'(\d{4}-\d\d-\d\dT\d\d:\d\d(?::\d\d(?:\.\d{1,9})?)?)(?:Z|[+-]00:?00)?$')
+
+
+def _fallback(val):
+    """Parses odd timestamp formats with dateparser, as UTC"""
+    dt = dateparser.parse(val)
+    if dt is None:
+        raise ValueError(f'Could not parse timestamp {val}')
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc)
+
+
+def parse_timestamps(values, to_zone=None):
+    """Parses a batch of UTC timestamp strings
+
+    ISO-8601 strings are parsed together as a numpy datetime64 array and
+    converted to to_zone in one vectorized step. Anything else falls back
+    to dateparser one value at a time.
+
+    Args:
+        values (iterable): of str, None or empty values pass through as None,
+                           datetime values are only converted
+        to_zone (tzinfo): target timezone, default UTC
+
+    Returns:
+        list: of timezone-aware datetime
+
+    """
+    values = list(values)
+    vals = [None] * len(values)
+    iso_idx, iso_vals = [], []
+    for i, val in enumerate(values):
+        if not val:
+            continue
+        if isinstance(val, datetime.datetime):
+            dt = val if val.tzinfo else val.replace(
+                tzinfo=datetime.timezone.utc)
+            vals[i] = dt.astimezone(to_zone) if to_zone else dt
+            continue
+        match = ISO_UTC.match(val)
+        if match:
+            iso_idx.append(i)
+            iso_vals.append(match.group(1))
+        else:
+            dt = _fallback(val)
+            vals[i] = dt.astimezone(to_zone) if to_zone else dt
+
+    if iso_vals:
+        idx = pd.DatetimeIndex(np.array(iso_vals, dtype='datetime64[ns]'))
+        idx = idx.tz_localize('UTC')
+        if to_zone is not None:
+            idx = idx.tz_convert(to_zone)
+        for i, dt in zip(iso_idx, idx.to_pydatetime()):
+            vals[i] = dt
+    return vals
+
+
+def parse_timestamp_fields(items, fields, to_zone=None):
+    """Parses timestamp fields of a list of dict in place, one batch per field
+
+    Args:
+        items (list): of dict
+        fields (iterable): keys holding timestamp strings, e.g. StartDate
+        to_zone (tzinfo): target timezone, default UTC
+
+    Returns:
+        list: the same items
+
+    """
+    for field in fields:
+        parsed = parse_timestamps([item.get(field) for item in items],
+                                  to_zone=to_zone)
+        for item, dt in zip(items, parsed):
+            if field in item:
+                item[field] = dt
+    return items
+
+
+if __name__ == '__main__':
+    pass
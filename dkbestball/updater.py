@@ -1,22 +1,181 @@
-import json
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import pickle
 import time
-import zipfile
 
-from dkbestball import Parser, Scraper
+import pandas as pd
+
+from dkbestball import Analyzer, Parser, Scraper
+from dkbestball.archive import SnapshotArchive
+from dkbestball.cache import ResponseCache
+from dkbestball.fetcher import AsyncFetcher
+from dkbestball.journal import FetchJournal
+from dkbestball.jsonio import JSONCodec
+from dkbestball.manifest import FetchManifest, ParseManifest
+from dkbestball.planner import RefreshPlanner
+from dkbestball.rawstore import RawFiles, RawStore
+from dkbestball.ratelimit import AdaptivePacer
+from dkbestball.registry import PlayerPoolRegistry
+from dkbestball.sqlstore import SQLiteStore
+from dkbestball.store import ColumnarStore
+
+
+# parser and registry of each parse worker process
+_WORKER = {}
+
+
+def _init_parse_worker(datadir, backend, leaderboards, rosters):
+    """Creates the parser, registry and raw stores of a parse worker"""
+    parser = Parser(codec=JSONCodec(backend))
+    _WORKER['parser'] = parser
+    _WORKER['registry'] = PlayerPoolRegistry(datadir, parser=parser)
+    _WORKER['leaderboards'] = leaderboards
+    _WORKER['rosters'] = rosters
+
+
+def _parse_contest_worker(args):
+    """Parses one contest in a parse worker"""
+    return _parse_contest(*args, **_WORKER)
+
+
+def _season(start):
+    """Gets NFL season of contest start, e.g. 2020 for January 2021"""
+    if not start:
+        return None
+    ts = pd.Timestamp(start)
+    return ts.year if ts.month >= 3 else ts.year - 1
+
+
+def _parse_contest(c, username, leaderboards, rosters, parser, registry):
+    """Parses saved leaderboard and roster of contest
+
+    Args:
+        c (dict): contest from mycontests
+        username (str): DK username
+        leaderboards (RawFiles): leaderboards by contest id, or RawStore
+        rosters (RawFiles): rosters by entry key, or RawStore
+        parser (Parser): the parser
+        registry (PlayerPoolRegistry): player pools by draft group
+
+    Returns:
+        dict
+
+    """
+    d = {'entry_keys': []}
+    d['contest_key'] = str(c['MegaContestId'])
+    d['contest_name'] = c['ContestName']
+    d['contest_size'] = c['MaxNumberPlayers']
+    d['entry_fee'] = c['BuyInAmount']
+    d['draftgroup_id'] = c['DraftGroupId']
+    d['winnings'] = c['TokensWon']
+    d['leader_points'] = c['TotalPointsOpp']
+    d['my_place'] = c['ResultsRank']
+    d['my_points'] = c['PlayerPoints']
+    d['contest_type'] = Analyzer.contest_type(d['contest_name'])
+    d['season'] = _season(c.get('ContestStartDate'))
+
+    if d['contest_key'] not in leaderboards:
+        logging.error(f"Could not find leaderboard {d['contest_key']}")
+
+    # get my entry key
+    with leaderboards.open(d['contest_key']) as f:
+        for item in parser.iter_contest_leaderboard(f):
+            entry_key = str(item['MegaEntryKey'])
+            d['entry_keys'].append(entry_key)
+            if item['UserName'] == username:
+                d['my_entry_key'] = entry_key
+
+    # get my roster
+    roster_obj = parser.codec.loads(rosters.read(d['my_entry_key']))
+    playerd = registry.get(d['draftgroup_id'])
+
+    try:
+        d['myroster'] = parser.contest_roster(roster_obj, playerd)
+    except KeyError:
+        print(
+            f"No roster for contest {d['contest_key']}, entry {d['my_entry_key']}"
+        )
+    return d
 
 
 class Updater:
     """Encapsulates scraping/parsing activity for weekly updates"""
 
-    def __init__(self, username, datadir, sleep_time=.1):
+    def __init__(self,
+                 username,
+                 datadir,
+                 sleep_time=.1,
+                 use_cache=True,
+                 scraper=None,
+                 raw_compression=None,
+                 use_sqlite=False,
+                 userkey=None):
+        """Creates Updater
+
+        Args:
+            username (str): DK username
+            datadir (Path): data directory
+            sleep_time (float): initial seconds between requests,
+                                adjusted by the pacer as responses come in
+            use_cache (bool): cache responses under datadir
+            scraper (Scraper): use this scraper instead of creating one,
+                               e.g. pointed at a FakeDKServer
+            raw_compression (str): 'gzip' or 'zstd' stores leaderboards
+                                   and rosters in compressed shards,
+                                   default one JSON file each
+            use_sqlite (bool): also write parsed contests to SQLite
+            userkey (str): DK user key (GUID) to fetch megacontest_entered,
+                           which shows finalized contests, None skips it
+
+        """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
         self.username = username
+        self.userkey = userkey
         self.datadir = datadir
-        self._s = Scraper()
-        self._p = Parser()
         self.sleep_time = sleep_time
+        if scraper:
+            self._s = scraper
+        else:
+            cache = ResponseCache(self.cachedir_path) if use_cache else None
+            pacer = AdaptivePacer(rate=1 / sleep_time) if sleep_time else None
+            self._s = Scraper(cache=cache, pacer=pacer)
+        self.pacer = self._s.pacer
+        self._p = Parser()
+        self.registry = PlayerPoolRegistry(self.datadir, parser=self._p)
+        self.store = None
+        if ColumnarStore.available():
+            self.store = ColumnarStore(self.store_path)
+        self.sqlite = SQLiteStore(self.sqlite_path) if use_sqlite else None
+        self.archive = SnapshotArchive(self.archive_path)
+        if raw_compression:
+            self.leaderboards = RawStore(self.rawdir_path / 'leaderboards',
+                                         compression=raw_compression)
+            self.rosters = RawStore(self.rawdir_path / 'rosters',
+                                    compression=raw_compression)
+        else:
+            self.leaderboards = RawFiles(self.myleaderboarddir_path)
+            self.rosters = RawFiles(self.myrosterdir_path)
+
+    @property
+    def archive_path(self):
+        return self.datadir / 'archive'
+
+    @property
+    def cachedir_path(self):
+        return self.datadir / 'cache'
+
+    @property
+    def entereddir_path(self):
+        return self.datadir / 'entered'
+
+    @property
+    def fetch_manifest_path(self):
+        return self.datadir / 'fetch_manifest.json'
+
+    @property
+    def journal_path(self):
+        return self.datadir / 'fetch_journal.jsonl'
 
     @property
     def mycontests_path(self):
@@ -34,97 +193,431 @@ class Updater:
     def myrosterdir_path(self):
         return self.datadir / 'rosters'
 
-    def mycontests(self):
-        """Gets contests"""
-        if self.mycontests_path.is_file():
-            with self.mycontests_path.open('rb') as f:
-                return pickle.load(f)
-        mycontestsfile = self.datadir / 'mycontests.html'
-        return self._p.mycontests(mycontestsfile)
-
-    def update_parsed_files(self):
-        """Updates pickled files of leaderboards and rosters"""
-        data = []
-        for c in self.mycontests():
-            d = {'entry_keys': []}
-            d['contest_key'] = str(c['MegaContestId'])
-            d['contest_name'] = c['ContestName']
-            d['contest_size'] = c['MaxNumberPlayers']
-            d['entry_fee'] = c['BuyInAmount']
-            d['draftgroup_id'] = c['DraftGroupId']
-            d['winnings'] = c['TokensWon']
-            d['leader_points'] = c['TotalPointsOpp']
-            d['my_place'] = c['ResultsRank']
-            d['my_points'] = c['PlayerPoints']
-
-            lbfile = self.myleaderboarddir_path / f"{d['contest_key']}.json"
-            if not lbfile.is_file():
-                logging.error(f'Could not find {lbfile}')
-
-            # get my entry key
-            for item in self._p.contest_leaderboard(self._p._to_obj(lbfile)):
-                entry_key = str(item['MegaEntryKey'])
-                d['entry_keys'].append(entry_key)
-                if item['UserName'] == self.username:
-                    d['my_entry_key'] = entry_key
-
-            # get my roster
-            roster_path = self.myrosterdir_path / f"{d['my_entry_key']}.json"
-            roster_obj = self._p._to_obj(roster_path)
-            draftable_path = self.datadir / f"draftables_{d['draftgroup_id']}.json"
-            draftables = self._p._to_obj(draftable_path)
-            playerd = self._p.player_pool_dict(draftables=draftables)
-
-            try:
-                d['myroster'] = self._p.contest_roster(roster_obj, playerd)
-            except KeyError:
-                print(
-                    f"No roster for contest {d['contest_key']}, entry {d['my)entry_key']}"
-                )
-
-            data.append(d)
-
-        with self.mydata_path.open('wb') as f:
-            pickle.dump(data, f)
-
-    def update_raw_files(self, update_rosters=False):
-        """Updates leaderboards and rosters"""
-        # create new zip and overwrite old file if succeeds
-        zipfn = self.myleaderboarddir_path / 'leaderboards_new.zip'
-        old_zipfn = self.myleaderboarddir_path / 'leaderboards.zip'
-        with zipfile.ZipFile(zipfn, 'w') as myzip:
-            for pth in self.myleaderboarddir_path.glob('*.json'):
-                myzip.write(pth, pth.name)
-        zipfn.rename(old_zipfn)
+    @property
+    def parse_manifest_path(self):
+        return self.datadir / 'parse_manifest.json'
+
+    @property
+    def rawdir_path(self):
+        return self.datadir / 'raw'
+
+    @property
+    def sqlite_path(self):
+        return self.datadir / 'mydata.sqlite'
+
+    @property
+    def store_path(self):
+        return self.datadir / 'store'
+
+    def _log_pacing(self):
+        """Logs request pacing statistics"""
+        if self.pacer:
+            logging.info(f'pacing: {self.pacer.stats()}')
+
+    async def _update_raw_files_async(self, scheduled, manifest, journal,
+                                      update_rosters, concurrency):
+        """Fetches leaderboards and rosters concurrently
+
+        Args:
+            scheduled (list): of tuple (contest dict, state)
+            manifest (FetchManifest): record of fetched contests
+            journal (FetchJournal): record of completed fetches this run
+            update_rosters (bool): also fetch missing rosters
+            concurrency (int): maximum number of requests in flight
+
+        Returns:
+            None
+
+        """
+        errors = []
+        loop = asyncio.get_running_loop()
+        write_lock = asyncio.Lock()
 
+        # requests are paced by the scraper's pacer
+        async with AsyncFetcher(concurrency=concurrency) as f:
+
+            # on the first failed request no new requests start, but those
+            # in flight are saved and journaled so a resumed run skips them
+            async def fetch(func, *args, **kwargs):
+                if errors:
+                    return None
+                try:
+                    return await f.fetch(func, *args, **kwargs)
+                except asyncio.CancelledError:
+                    raise
+                except BaseException as e:
+                    errors.append(e)
+                    return None
+
+            # saves and journal fsyncs run one at a time in a thread, so
+            # the event loop keeps requests in flight meanwhile
+            async def save(func, *args):
+                async with write_lock:
+                    await loop.run_in_executor(None, func, *args)
+
+            async def update_roster(draftgroup_id, entry_key, final):
+                if entry_key in self.rosters:
+                    return
+                roster = await fetch(self._s.contest_roster,
+                                     draftgroup_id,
+                                     entry_key,
+                                     final=final)
+                if roster is not None:
+                    await save(self._save_roster, entry_key, roster, journal)
+
+            async def update_contest(item, state):
+                contest_id = item['ContestId']
+                draftgroup_id = item['DraftGroupId']
+                final = state == RefreshPlanner.FINALIZED
+                logging.info(
+                    f'starting contest {contest_id}, dg {draftgroup_id}')
+                if journal.is_done('leaderboard', contest_id):
+                    lb = self._read_raw(self.leaderboards, contest_id)
+                else:
+                    lb = await fetch(self._s.contest_leaderboard,
+                                     contest_id=contest_id,
+                                     final=final)
+                    if lb is None:
+                        return
+                    await save(self._save_leaderboard, contest_id, lb, state,
+                               manifest, journal)
+                if update_rosters:
+                    await asyncio.gather(*[
+                        update_roster(draftgroup_id, int(lbd['MegaEntryKey']),
+                                      final)
+                        for lbd in self._p.contest_leaderboard(lb)
+                    ])
+
+            await asyncio.gather(
+                *[update_contest(c, state) for c, state in scheduled])
+        if errors:
+            raise errors[0]
+
+    def _update_raw_files_sync(self, scheduled, manifest, journal,
+                               update_rosters):
+        """Fetches leaderboards and rosters one at a time
+
+        Args:
+            scheduled (list): of tuple (contest dict, state)
+            manifest (FetchManifest): record of fetched contests
+            journal (FetchJournal): record of completed fetches this run
+            update_rosters (bool): also fetch missing rosters
+
+        Returns:
+            None
+
+        """
         # loop through contests
-        for item in self.mycontests():
+        for item, state in scheduled:
 
             # get contest and draftgroup ids
             contest_id = item['ContestId']
             draftgroup_id = item['DraftGroupId']
+            final = state == RefreshPlanner.FINALIZED
             msg = f'starting contest {contest_id}, dg {draftgroup_id}'
             logging.info(msg)
 
-            # save leaderboard to disk
-            pth = self.datadir / 'leaderboards' / f'{contest_id}.json'
-            lb = self._s.contest_leaderboard(contest_id=contest_id)
-            with pth.open('w') as fh:
-                json.dump(lb, fh)
-            time.sleep(self.sleep_time)
+            # save leaderboard to disk, unless saved before interruption
+            if journal.is_done('leaderboard', contest_id):
+                lb = self._read_raw(self.leaderboards, contest_id)
+            else:
+                lb = self._s.contest_leaderboard(contest_id=contest_id,
+                                                 final=final)
+                self._save_leaderboard(contest_id, lb, state, manifest,
+                                       journal)
 
             if update_rosters:
                 # now get rosters
                 # get entry_keys from leaderboard
                 for lb in self._p.contest_leaderboard(lb):
                     entry_key = int(lb['MegaEntryKey'])
-                    pth = self.datadir / 'rosters' / f'{entry_key}.json'
-                    if not pth.is_file():
+                    if entry_key not in self.rosters:
                         roster = self._s.contest_roster(draftgroup_id,
-                                                        entry_key)
-                        with pth.open('w') as fh:
-                            json.dump(roster, fh)
-                        time.sleep(self.sleep_time)
+                                                        entry_key,
+                                                        final=final)
+                        self._save_roster(entry_key, roster, journal)
+
+    def _is_parsed(self, manifest, contest_key, contest):
+        """Tests if contest was parsed from current raw files"""
+
+        def locate(name):
+            # raw payload name, e.g. rosters/2062649745
+            kind, key = name.split('/')
+            return getattr(self, kind).locate(key)
+
+        return manifest.is_current(contest_key, contest, locate)
+
+    def _read_raw(self, raw, key):
+        """Reads JSON of key from raw files or store"""
+        return self._p.codec.loads(raw.read(key))
+
+    def _resume_schedule(self, journal):
+        """Gets scheduled contests of interrupted run"""
+        contests = {str(c['ContestId']): c for c in self.mycontests()}
+        return [(contests[str(contest_id)], state)
+                for contest_id, state in journal.header['scheduled']
+                if str(contest_id) in contests]
+
+    def _save_leaderboard(self, contest_id, lb, state, manifest, journal):
+        """Saves fetched leaderboard and records it as fetched"""
+        self._write_raw(self.leaderboards, contest_id, lb)
+        fetched = time.time()
+        manifest.mark(contest_id, state, fetched=fetched)
+        journal.record('leaderboard', contest_id, state=state, fetched=fetched)
+
+    def _save_roster(self, entry_key, roster, journal):
+        """Saves fetched roster and records it as fetched"""
+        self._write_raw(self.rosters, entry_key, roster)
+        journal.record('roster', entry_key)
+
+    def _write_raw(self, raw, key, obj):
+        """Writes obj as JSON to raw files or store under key"""
+        raw.put(key, self._p.codec.dumps(obj))
+
+    def entered(self):
+        """Gets saved megacontest_entered contests, if any"""
+        vals = []
+        for pth in sorted(self.entereddir_path.glob('*.json')):
+            vals += self._p.megacontest_entered(self._p._to_obj(pth))
+        return vals
+
+    def update_entered(self):
+        """Saves megacontest_entered of my megacontests to entered/
+           Megacontests whose contests are all finalized are not refetched
+
+        Returns:
+            list: of MegaContestId that were fetched
+
+        """
+        raw = RawFiles(self.entereddir_path)
+        fetched = []
+        for mid in sorted({
+                c['MegaContestId']
+                for c in self.mycontests() if c.get('MegaContestId')
+        }):
+            if mid in raw:
+                saved = self._p.megacontest_entered(
+                    self._p._to_obj(raw.path(mid)))
+                if all(d['Finalized'] for d in saved):
+                    continue
+            raw.root.mkdir(parents=True, exist_ok=True)
+            self._write_raw(raw, mid,
+                            self._s.megacontest_entered(mid, self.userkey))
+            fetched.append(mid)
+        logging.info(f'Updated {len(fetched)} megacontest_entered')
+        return fetched
+
+    def mycontests(self):
+        """Gets contests, from html tagged with their section"""
+        if self.mycontests_path.is_file():
+            with self.mycontests_path.open('rb') as f:
+                return pickle.load(f)
+        mycontestsfile = self.datadir / 'mycontests.html'
+        sections = self._p.mycontests(mycontestsfile)
+        return [
+            dict(c, section=section)
+            for section in RefreshPlanner.SECTIONS
+            for c in sections.get(section) or []
+        ]
+
+    def plan_raw_files(self, force=False):
+        """Gets contests whose leaderboards need to be fetched
+
+        Args:
+            force (bool): schedule every contest regardless of manifest
+
+        Returns:
+            list: of tuple (contest dict, state)
+
+        """
+        planner = RefreshPlanner(FetchManifest(self.fetch_manifest_path))
+        contests = self.mycontests()
+        if force:
+            return [(c, planner.classify(c)) for c in contests]
+        return planner.plan(contests, entered=self.entered())
+
+    def request_count(self, scheduled, update_rosters=False):
+        """Estimates number of requests needed for scheduled contests
+           Rosters are counted from saved leaderboards where possible,
+           otherwise from the number of entrants
+
+        Args:
+            scheduled (list): of tuple (contest dict, state)
+            update_rosters (bool): include roster requests
+
+        Returns:
+            int
+
+        """
+        n = len(scheduled)
+        if not update_rosters:
+            return n
+        for item, _ in scheduled:
+            if item['ContestId'] not in self.leaderboards:
+                n += item.get('NumberOfEntrants') or item.get(
+                    'MaxNumberPlayers') or 0
+                continue
+            with self.leaderboards.open(item['ContestId']) as f:
+                for lbd in self._p.iter_contest_leaderboard(f):
+                    n += lbd['MegaEntryKey'] not in self.rosters
+        return n
+
+    def update_parsed_files(self, workers=1, force=False):
+        """Updates pickled files of leaderboards and rosters
+
+        Only contests whose contest record, leaderboard, roster or
+        draftables changed since the last run are parsed, and merged
+        into the existing records. Records go to the columnar store if
+        pyarrow is installed, else to mydata.pkl.
+
+        Args:
+            workers (int): number of processes parsing contests,
+                           1 parses in this process
+            force (bool): parse every contest
+
+        """
+        manifest = ParseManifest(self.parse_manifest_path)
+        existing = {}
+        if self.store and not force:
+            existing = dict.fromkeys(self.store.contest_keys())
+        elif self.mydata_path.is_file() and not force:
+            with self.mydata_path.open('rb') as f:
+                existing = {d['contest_key']: d for d in pickle.load(f)}
+        if self.sqlite and not force:
+            sqlite_keys = self.sqlite.contest_keys()
+            existing = {k: v for k, v in existing.items() if k in sqlite_keys}
+
+        contests = self.mycontests()
+        keys = [str(c['MegaContestId']) for c in contests]
+        todo = [
+            i for i, (k, c) in enumerate(zip(keys, contests))
+            if k not in existing or not self._is_parsed(manifest, k, c)
+        ]
+        logging.info(f'Parsing {len(todo)} of {len(contests)} contests')
+        args = [(contests[i], self.username) for i in todo]
+        if workers > 1 and len(args) > 1:
+            # contests sharing a draft group go to the same worker,
+            # so each process loads as few player pools as possible
+            order = sorted(range(len(args)),
+                           key=lambda i: str(args[i][0]['DraftGroupId']))
+            chunksize = max(1, len(args) // (workers * 4))
+            with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_parse_worker,
+                    initargs=(self.datadir, self._p.codec.backend,
+                              self.leaderboards, self.rosters)) as ex:
+                results = ex.map(_parse_contest_worker,
+                                 [args[i] for i in order],
+                                 chunksize=chunksize)
+                parsed = [None] * len(args)
+                for i, d in zip(order, results):
+                    parsed[i] = d
+        else:
+            parsed = [
+                _parse_contest(*a,
+                               leaderboards=self.leaderboards,
+                               rosters=self.rosters,
+                               parser=self._p,
+                               registry=self.registry) for a in args
+            ]
+
+        for i, d in zip(todo, parsed):
+            paths = [self.registry.draftables_path(d['draftgroup_id'])]
+            raw = {}
+            for kind, key in (('leaderboards', d['contest_key']),
+                              ('rosters', d['my_entry_key'])):
+                store = getattr(self, kind)
+                if isinstance(store, RawStore):
+                    raw[f'{kind}/{key}'] = store.locate(key)
+                else:
+                    paths.append(store.path(key))
+            paths = [pth for pth in paths if pth.is_file()]
+            manifest.mark(keys[i], contests[i], paths, raw=raw)
+
+        # contests no longer in mycontests are dropped
+        if self.sqlite:
+            self.sqlite.write(parsed, keep=keys)
+        if self.store:
+            self.store.write(parsed, keep=keys)
+        else:
+            existing.update(zip([keys[i] for i in todo], parsed))
+            with self.mydata_path.open('wb') as f:
+                pickle.dump([existing[k] for k in keys], f)
+        manifest.save()
+
+    def update_raw_files(self,
+                         update_rosters=False,
+                         concurrency=1,
+                         dry_run=False,
+                         force=False,
+                         resume=False):
+        """Updates leaderboards and rosters of stale contests
+
+        Each saved leaderboard and roster is journaled, so an interrupted
+        run can be resumed without repeating any request.
+
+        Args:
+            update_rosters (bool): also fetch missing rosters
+            concurrency (int): number of concurrent requests,
+                               1 fetches sequentially
+            dry_run (bool): print request count and return without fetching
+            force (bool): fetch every contest, not only stale ones
+            resume (bool): continue the interrupted last run, if any,
+                           with its contests and update_rosters
+
+        Returns:
+            list: of tuple (contest dict, state) that were scheduled
+
+        """
+        journal = FetchJournal(self.journal_path)
+        resuming = resume and journal.pending()
+        if resuming:
+            scheduled = self._resume_schedule(journal)
+            update_rosters = journal.header['update_rosters']
+            n = len(journal.completed('leaderboard'))
+            logging.info(f'Resuming run, {n} of {len(scheduled)} done')
+        else:
+            if resume:
+                logging.info('No interrupted run to resume')
+            if self.userkey and not dry_run:
+                self.update_entered()
+            scheduled = self.plan_raw_files(force=force)
+        if dry_run:
+            n = self.request_count(scheduled, update_rosters=update_rosters)
+            print(f'{len(scheduled)} contests to update, ~{n} requests')
+            return scheduled
+
+        # snapshot leaderboards before they are overwritten,
+        # shards keep every version so need no snapshot
+        if isinstance(self.leaderboards, RawFiles):
+            self.archive.snapshot(self.myleaderboarddir_path.glob('*.json'))
+
+        manifest = FetchManifest(self.fetch_manifest_path)
+        if resuming:
+            # manifest may not have been saved if the run was killed
+            for contest_id, rec in journal.completed('leaderboard').items():
+                manifest.mark(contest_id, rec['state'], fetched=rec['fetched'])
+        else:
+            journal.start(scheduled, update_rosters)
+        try:
+            if concurrency > 1:
+                asyncio.run(
+                    self._update_raw_files_async(scheduled,
+                                                 manifest,
+                                                 journal,
+                                                 update_rosters=update_rosters,
+                                                 concurrency=concurrency))
+            else:
+                self._update_raw_files_sync(scheduled,
+                                            manifest,
+                                            journal,
+                                            update_rosters=update_rosters)
+            journal.finish()
+        finally:
+            journal.close()
+            manifest.save()
+            self._log_pacing()
+        return scheduled
 
 
 if __name__ == '__main__':
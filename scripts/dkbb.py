@@ -19,12 +19,28 @@ def _dump(df, fmt='presto', idx='never'):
 @click.group()
 @click.pass_context
 @click.option('--quiet', is_flag=True, default=False, help="Silence logger.")
-def main(ctx, quiet):
-    username = os.getenv('DK_BESTBALL_USERNAME')
-    datadir = Path(os.getenv('DKBESTBALL_DATA_DIR'))
+@click.option('--raw-compression',
+              type=click.Choice(['gzip', 'zstd']),
+              default=None,
+              help="Store leaderboards and rosters in compressed shards.")
+@click.option('--sqlite',
+              is_flag=True,
+              default=False,
+              help="Also write parsed contests to SQLite, analyze from it.")
+@click.option('--compact',
+              is_flag=True,
+              default=False,
+              help="Analyze with categorical, downcast columns.")
+def main(ctx, quiet, raw_compression, sqlite, compact):
+    # Updater and Analyzer are created by their group, so an update can
+    # create stores the Analyzer would otherwise require
     ctx.obj = {
-        'u': Updater(username, datadir),
-        'a': Analyzer(username, datadir)
+        'username': os.getenv('DK_BESTBALL_USERNAME'),
+        'userkey': os.getenv('DK_BESTBALL_USERKEY'),
+        'datadir': Path(os.getenv('DKBESTBALL_DATA_DIR')),
+        'raw_compression': raw_compression,
+        'sqlite': sqlite,
+        'compact': compact
     }
     level = logging.ERROR if quiet else logging.INFO
     logging.basicConfig(level=level)
@@ -34,32 +50,67 @@ def main(ctx, quiet):
 @main.group()
 @click.pass_context
 def update(ctx):
-    pass
+    o = ctx.obj
+    o['u'] = Updater(o['username'],
+                     o['datadir'],
+                     raw_compression=o['raw_compression'],
+                     use_sqlite=o['sqlite'],
+                     userkey=o['userkey'])
 
 
 @update.command()
 @click.pass_context
 @click.option('--update_rosters', '-r', is_flag=True, help="Update rosters.")
-def raw(ctx, update_rosters):
+@click.option('--concurrency',
+              '-n',
+              type=int,
+              default=1,
+              help="Number of concurrent requests.")
+@click.option('--dry-run',
+              is_flag=True,
+              help="Print request count without fetching.")
+@click.option('--force',
+              '-f',
+              is_flag=True,
+              help="Fetch all contests, not only stale ones.")
+@click.option('--resume',
+              is_flag=True,
+              help="Continue the interrupted last run.")
+def raw(ctx, update_rosters, concurrency, dry_run, force, resume):
     logging.info('Updating raw files')
-    ctx.obj['u'].update_raw_files(update_rosters=update_rosters)
+    ctx.obj['u'].update_raw_files(update_rosters=update_rosters,
+                                  concurrency=concurrency,
+                                  dry_run=dry_run,
+                                  force=force,
+                                  resume=resume)
 
 
 @update.command()
 @click.pass_context
-@click.option('--update_contests', '-c', is_flag=True, help="Update contests.")
-@click.option('--update_rosters', '-r', is_flag=True, help="Update rosters.")
-def parsed(ctx, update_contests, update_rosters):
+@click.option('--workers',
+              '-w',
+              type=int,
+              default=1,
+              help="Number of parsing processes.")
+@click.option('--force',
+              '-f',
+              is_flag=True,
+              help="Parse all contests, not only changed ones.")
+def parsed(ctx, workers, force):
     logging.info('Updating parsed files')
-    ctx.obj['u'].update_parsed_files(update_contests=update_contests,
-                                     update_rosters=update_rosters)
+    ctx.obj['u'].update_parsed_files(workers=workers, force=force)
 
 
 # Analyze Group
 @main.group()
 @click.pass_context
 def analyze(ctx):
-    pass
+    o = ctx.obj
+    o['a'] = Analyzer(o['username'],
+                      o['datadir'],
+                      compact=o['compact'],
+                      raw_compression=o['raw_compression'],
+                      use_sqlite=o['sqlite'])
 
 
 @analyze.command()
@@ -82,6 +133,46 @@ def ownership(ctx, pos):
         _dump(a.positional_ownership(df, pos.upper()))
 
 
+@analyze.command()
+@click.pass_context
+@click.option('-b',
+              '--by',
+              type=click.Choice(['contest_type', 'draftgroup_id',
+                                 'entry_fee']),
+              default='contest_type',
+              help='Group contests by.')
+@click.option('--versus', is_flag=True, help='Compare my ownership.')
+def field(ctx, by, versus):
+    a = ctx.obj['a']
+    if versus:
+        _dump(a.exposure_vs_field(by))
+    else:
+        _dump(a.field_ownership(by))
+
+
+@analyze.command()
+@click.pass_context
+@click.option('-p',
+              '--positions',
+              type=str,
+              nargs=2,
+              default=None,
+              help='Position pair, e.g. QB WR.')
+@click.option('-t', '--team', type=str, default=None, help='Team')
+@click.option('--same-team', is_flag=True, help='Only same-team pairs.')
+@click.option('--field', is_flag=True, help="Other entrants' pairs.")
+@click.option('--min-n', type=int, default=1, help='Fewest rosters.')
+def pairs(ctx, positions, team, same_team, field, min_n):
+    a = ctx.obj['a']
+    positions = tuple(p.upper() for p in positions) if positions else None
+    _dump(
+        a.pairs(positions=positions,
+                team=team,
+                same_team=same_team,
+                field=field,
+                min_n=min_n))
+
+
 @analyze.command()
 @click.pass_context
 @click.option('-t', '--contest_type', type=str, help='Contest type')
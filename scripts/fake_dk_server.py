@@ -0,0 +1,70 @@
+import logging
+from pathlib import Path
+import pickle
+import tempfile
+import time
+
+import click
+
+from dkbestball import Scraper, Updater
+from dkbestball.fakeserver import FakeDKServer, PayloadFactory
+from dkbestball.ratelimit import AdaptivePacer
+
+
+def _bench(srv, factory, n_contests, concurrency, rate):
+    """Runs Updater.update_raw_files against the fake server"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        datadir = Path(tmpdir)
+        (datadir / 'leaderboards').mkdir()
+        (datadir / 'rosters').mkdir()
+        with (datadir / 'mycontests.pkl').open('wb') as f:
+            pickle.dump(factory.mycontests(n_contests), f)
+        s = Scraper(browser_name=None,
+                    api_url=srv.url,
+                    pacer=AdaptivePacer(rate=rate, max_rate=rate * 100))
+        u = Updater('user0', datadir, scraper=s)
+        start = time.monotonic()
+        u.update_raw_files(update_rosters=True, concurrency=concurrency)
+        elapsed = time.monotonic() - start
+    n = sum(srv.counts.values())
+    print(f'{n} requests in {elapsed:.1f}s ({n / elapsed:.1f}/s)')
+    print(f'server: {srv.counts}')
+    print(f'pacer: {u.pacer.stats()}')
+
+
+@click.command()
+@click.option('--port', type=int, default=8000, help='Port to listen on.')
+@click.option('--entries', type=int, default=12, help='Entries per contest.')
+@click.option('--latency', type=float, default=0, help='Seconds per response.')
+@click.option('--jitter', type=float, default=0, help='Max extra seconds.')
+@click.option('--throttle-rate', type=float, default=0, help='Share of 429s.')
+@click.option('--error-rate', type=float, default=0, help='Share of 500s.')
+@click.option('--bench',
+              type=int,
+              default=0,
+              help='Run update against N contests and exit.')
+@click.option('--concurrency', type=int, default=8, help='Bench concurrency.')
+@click.option('--rate', type=float, default=10, help='Bench initial rate.')
+def main(port, entries, latency, jitter, throttle_rate, error_rate, bench,
+         concurrency, rate):
+    logging.basicConfig(level=logging.INFO)
+    factory = PayloadFactory(n_entries=entries)
+    srv = FakeDKServer(factory=factory,
+                       port=0 if bench else port,
+                       latency=latency,
+                       jitter=jitter,
+                       throttle_rate=throttle_rate,
+                       error_rate=error_rate)
+    with srv:
+        if bench:
+            _bench(srv, factory, bench, concurrency, rate)
+            return
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -3,42 +3,63 @@ import os
 from pathlib import Path
 
 import pandas as pd
-from dkbestball import Parser, Scraper
+from dkbestball import (AdvancementSimulator, Parser, PlayerPoolRegistry,
+                        Scraper)
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
 
-s = Scraper()
-p = Parser()
+def main():
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)
 
-# draftgroupid
-draft_group_id = 42308
-basedir = Path(os.getenv('DKBESTBALL_DATA_DIR'))
-fn = basedir / 'draftables' / f'{draft_group_id}.json'
-ppd = p.player_pool_dict(draftables_fn=fn)
+    s = Scraper()
+    p = Parser()
 
-# get mycontests
-logging.info('Getting my contests')
-myc = p.mycontests(html=s.mycontests())
+    # player pools are looked up by draftgroupid as rosters are parsed
+    basedir = Path(os.getenv('DKBESTBALL_DATA_DIR'))
+    registry = PlayerPoolRegistry(basedir, parser=p, persist=True)
 
-# get rosters
-rosters = []
+    # get mycontests
+    logging.info('Getting my contests')
+    myc = p.mycontests(html=s.mycontests())
 
-for item in [c for c in myc['live'] if 'Tournament Round' in c['ContestName']]:
-    contest_id = item['ContestId']
-    draftgroup_id = item['DraftGroupId']
-    msg = f'starting contest {contest_id}, dg {draftgroup_id}'
-    logging.info(msg)
-    lb = s.contest_leaderboard(contest_id=contest_id)
+    # get rosters
+    rosters = []
 
-    # get entry keys from leaderboard
-    for lb in p.contest_leaderboard(lb):
-        entry_key = int(lb['entryKey'])
-        roster = s.contest_roster(draftgroup_id, entry_key)
-        rosters += p.contest_roster(roster, ppd)
+    for item in [
+            c for c in myc['live'] if 'Tournament Round' in c['ContestName']
+    ]:
+        contest_id = item['ContestId']
+        draftgroup_id = item['DraftGroupId']
+        msg = f'starting contest {contest_id}, dg {draftgroup_id}'
+        logging.info(msg)
+        lb = s.contest_leaderboard(contest_id=contest_id)
 
-rdf = pd.DataFrame(rosters)
+        # get entry keys from leaderboard
+        for lb in p.contest_leaderboard(lb):
+            entry_key = int(lb['entryKey'])
+            roster = s.contest_roster(draftgroup_id, entry_key)
+            rosters += p.contest_roster(roster, registry=registry)
 
-(rdf.loc[rdf.userName == 'sansbacon', :].groupby(
-    ['displayName', 'teamAbbreviation', 'position'],
-    as_index=False).agg(n=('entryKey', 'count')))
+    rdf = pd.DataFrame(rosters)
+
+    (rdf.loc[rdf.userName == 'sansbacon', :].groupby(
+        ['displayName', 'teamAbbreviation', 'position'],
+        as_index=False).agg(n=('entryKey', 'count')))
+
+    # simulate advancement, resampling weeks of player points by displayName
+    # saved as weekly_points.csv with one column per past week
+    points_path = basedir / 'weekly_points.csv'
+    if points_path.is_file():
+        history = pd.read_csv(points_path, index_col='displayName')
+        sim = AdvancementSimulator(rdf,
+                                   history=history,
+                                   n_weeks=2,
+                                   advance=1,
+                                   key='displayName')
+        results = sim.run(n_sims=100000, workers=os.cpu_count())
+        print(results.loc[results.userName == 'sansbacon', :])
+
+
+# worker processes import this module, so only run as a script
+if __name__ == '__main__':
+    main()
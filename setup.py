@@ -18,6 +18,12 @@ def run():
           author_email="eric@erictruett.com",
           license="MIT",
           packages=find_packages(),
+          extras_require={
+              'fast': ['orjson'],
+              'parquet': ['pyarrow'],
+              'sparse': ['scipy'],
+              'zstd': ['zstandard']
+          },
           entry_points={'console_scripts': ['dkbb=scripts.dkbb:main']},
           zip_safe=False)
 
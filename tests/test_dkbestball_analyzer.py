@@ -33,6 +33,29 @@ def test_contest_type(a):
     assert a.contest_type('zzzaAZ') == 'Unknown'
 
 
+def test_contest_types(a):
+    """Tests vectorized contest_type"""
+    names = a.data['contest_name']
+    types = a.contest_types(names)
+    assert types.tolist() == names.apply(a.contest_type).tolist()
+    names = pd.Series(['3-Player Tournament', None])
+    assert a.contest_types(names).tolist() == ['3-Man', 'Unknown']
+
+
+def test_compact(a, test_directory):
+    """Tests compact mode gives the same reports in less memory"""
+    c = Analyzer(username=a.username, datadir=test_directory, compact=True)
+    assert c.data['contest_type'].dtype == 'category'
+    assert c.myrosters()['position'].dtype == 'category'
+    for df, cdf in ((a.data, c.data), (a.myrosters(), c.myrosters())):
+        assert (cdf.memory_usage(deep=True).sum()
+                < df.memory_usage(deep=True).sum())
+    fin = c.financial_summary().astype({'contest_type': object})
+    assert fin.equals(a.financial_summary())
+    assert len(c.ownership()) == len(a.ownership())
+    assert len(c.positional_ownership()) == len(a.positional_ownership())
+
+
 def test_financial_summary(a, tprint):
     """Tests financial summary"""
     df = a.financial_summary()
@@ -42,6 +65,16 @@ def test_financial_summary(a, tprint):
 def test_my_rosters(a):
     df = a.myrosters()
     assert set(df.columns) == set(a.ROSTER_COLUMNS)
+    assert len(df) == sum(len(r) for r in a.data['myroster'])
+
+    # built once per data version and read-only
+    hits = a._memo.hits
+    a.myrosters()
+    assert a._memo.hits == hits + 1
+    with pytest.raises(ValueError):
+        df.iloc[0, 0] = 0
+    a.reload()
+    assert len(a._memo) == 0
 
 
 def test_ownership(a, tprint):
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_archive.py
+
+import pytest
+
+from dkbestball.archive import SnapshotArchive
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return SnapshotArchive(tmp_path / 'archive')
+
+
+@pytest.fixture
+def lbdir(tmp_path):
+    pth = tmp_path / 'leaderboards'
+    pth.mkdir()
+    for i in range(3):
+        (pth / f'{i}.json').write_text(f'{{"Leaderboard": [{i}]}}')
+    return pth
+
+
+def test_snapshot(archive, lbdir):
+    """Tests only changed files are stored"""
+    assert archive.snapshot(lbdir.glob('*.json')) == 0
+    assert len(list(archive.root.glob('objects/*/*.gz'))) == 3
+
+    # nothing changed
+    assert archive.snapshot(lbdir.glob('*.json')) is None
+
+    # rewritten with same content is deduplicated
+    (lbdir / '0.json').write_text('{"Leaderboard": [0]}')
+    (lbdir / '1.json').write_text('{"Leaderboard": [1, 2]}')
+    assert archive.snapshot(lbdir.glob('*.json')) == 1
+    snaps = archive.snapshots()
+    assert snaps[1]['changes'] == {'1.json': archive.files()['1.json']}
+    assert len(list(archive.root.glob('objects/*/*.gz'))) == 4
+
+
+def test_read(archive, lbdir):
+    """Tests past snapshots are retrieved"""
+    archive.snapshot(lbdir.glob('*.json'))
+    (lbdir / '1.json').write_text('{"Leaderboard": []}')
+    (lbdir / '2.json').unlink()
+    archive.snapshot(lbdir.glob('*.json'))
+    assert archive.read('1.json', snapshot=0) == b'{"Leaderboard": [1]}'
+    assert archive.read('1.json') == b'{"Leaderboard": []}'
+    assert '2.json' in archive.files(snapshot=0)
+    with pytest.raises(KeyError):
+        archive.read('2.json')
+
+
+def test_restore(archive, lbdir, tmp_path):
+    """Tests snapshot is restored to directory"""
+    archive.snapshot(lbdir.glob('*.json'))
+    (lbdir / '0.json').write_text('{}')
+    archive.snapshot(lbdir.glob('*.json'))
+    paths = archive.restore(tmp_path / 'restored', snapshot=0)
+    assert len(paths) == 3
+    assert (tmp_path / 'restored' /
+            '0.json').read_text() == '{"Leaderboard": [0]}'
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_cache.py
+
+import time
+
+import pytest
+
+from dkbestball.cache import ResponseCache
+
+
+@pytest.fixture
+def c(tmp_path):
+    return ResponseCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def url():
+    return 'https://api.draftkings.com/scores/v1/leaderboards/89460375'
+
+
+def test_key(c, url):
+    """Tests key ignores param order"""
+    k1 = c.key(url, {'format': 'json', 'embed': 'leaderboard'})
+    k2 = c.key(url, {'embed': 'leaderboard', 'format': 'json'})
+    assert k1 == k2
+    assert k1 != c.key(url, {'format': 'json'})
+
+
+def test_put_get(c, url):
+    """Tests round trip of cached content"""
+    assert c.get(url) is None
+    c.put(url, None, {'a': 1}, ttl=60, etag='"abc"')
+    entry = c.get(url)
+    assert entry['content'] == {'a': 1}
+    assert c.is_fresh(entry)
+    assert c.validators(entry) == {'If-None-Match': '"abc"'}
+
+
+def test_is_fresh(c, url):
+    """Tests time-to-live expiry"""
+    c.put(url, None, {}, ttl=60)
+    entry = c.get(url)
+    assert not c.is_fresh(entry, now=time.time() + 120)
+    c.put(url, None, {}, ttl=None)
+    assert c.is_fresh(c.get(url), now=time.time() + 10**9)
+
+
+def test_evict(tmp_path, url):
+    """Tests least recently used entries are evicted"""
+    c = ResponseCache(tmp_path / 'cache', max_bytes=2000)
+    payload = {'x': 'y' * 400}
+    for i in range(3):
+        c.put(f'{url}/{i}', None, payload, ttl=None)
+        time.sleep(.01)
+    c.get(f'{url}/0')
+    c.put(f'{url}/3', None, payload, ttl=None)
+    assert c.get(f'{url}/0') is not None
+    assert c.get(f'{url}/1') is None
+    assert c._size <= c.max_bytes
+
+
+def test_size(tmp_path, url):
+    """Tests size is scanned on the first put, not on creation"""
+    c = ResponseCache(tmp_path / 'cache')
+    for i in range(3):
+        c.put(f'{url}/{i}', None, {'x': i}, ttl=None)
+    c = ResponseCache(tmp_path / 'cache')
+    assert c._size is None
+    c.put(f'{url}/0', None, {'x': 0}, ttl=None)
+    assert c._size == sum(p.stat().st_size for p in c._entries())
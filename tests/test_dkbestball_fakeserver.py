@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_fakeserver.py
+
+import pytest
+
+from dkbestball import Parser, Scraper
+from dkbestball.fakeserver import FakeDKServer, PayloadFactory
+from dkbestball.ratelimit import AdaptivePacer
+
+
+@pytest.fixture
+def factory():
+    return PayloadFactory(n_entries=12, n_megaentries=50)
+
+
+@pytest.fixture
+def srv(factory):
+    with FakeDKServer(factory=factory) as srv:
+        yield srv
+
+
+@pytest.fixture
+def s(srv):
+    return Scraper(browser_name=None, api_url=srv.url)
+
+
+def test_contest_leaderboard(s):
+    """Tests leaderboard route parses like DK"""
+    lb = Parser().contest_leaderboard(s.contest_leaderboard(89460375))
+    assert len(lb) == 12
+    assert lb[0]['MegaEntryKey'] == str(89460375 * 10000)
+
+
+def test_contest_roster(s, factory):
+    """Tests roster route parses like DK"""
+    p = Parser()
+    playerd = p.player_pool_dict(draftables=factory.draftables(37605))
+    roster = p.contest_roster(s.contest_roster(37605, 894603750003), playerd)
+    assert len(roster) == factory.roster_size
+    assert roster[0]['contestKey'] == '89460375'
+    assert roster[0]['position'] in factory.POSITIONS
+
+
+def test_megacontest(s):
+    """Tests megacontest routes"""
+    assert len(s.megacontest_leaderboard(1)['Leaderboard']) == 50
+    entered = Parser().megacontest_entered(s.megacontest_entered(1, 'a-b'))
+    assert entered[1]['DraftGroupState'] == 'Historical'
+    assert [d['Finalized'] for d in entered] == [False, True, True]
+
+
+def test_throttle(factory):
+    """Tests injected 429s are retried by paced scraper"""
+    with FakeDKServer(factory=factory, throttle_rate=.5, seed=1) as srv:
+        pacer = AdaptivePacer(rate=100, cooldown=0)
+        s = Scraper(browser_name=None,
+                    api_url=srv.url,
+                    pacer=pacer,
+                    max_retries=20)
+        for i in range(5):
+            assert 'Leaderboard' in s.contest_leaderboard(i)
+        assert srv.counts[429] > 0
+        assert pacer.stats()['throttle_events'] == srv.counts[429]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_fetcher.py
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dkbestball.fetcher import AsyncFetcher
+
+
+def test_fetch_concurrency():
+    """Tests fetcher bounds requests in flight"""
+    lock = threading.Lock()
+    state = {'inflight': 0, 'peak': 0}
+
+    def slow(x):
+        with lock:
+            state['inflight'] += 1
+            state['peak'] = max(state['peak'], state['inflight'])
+        time.sleep(.02)
+        with lock:
+            state['inflight'] -= 1
+        return x * 2
+
+    async def run():
+        async with AsyncFetcher(concurrency=3) as f:
+            return await asyncio.gather(*[f.fetch(slow, i) for i in range(10)])
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    assert state['peak'] == 3
+
+
+def test_fetch_requires_context():
+    """Tests fetcher must be entered"""
+    f = AsyncFetcher()
+    with pytest.raises(RuntimeError):
+        asyncio.run(f.fetch(print))
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_journal.py
+
+import pytest
+
+from dkbestball.journal import FetchJournal
+
+
+@pytest.fixture
+def scheduled():
+    return [({'ContestId': 1}, 'live'), ({'ContestId': 2}, 'finalized')]
+
+
+def test_resume(tmp_path, scheduled):
+    """Tests interrupted journal is read back"""
+    pth = tmp_path / 'journal.jsonl'
+    journal = FetchJournal(pth)
+    assert not journal.pending()
+    journal.start(scheduled, update_rosters=True)
+    journal.record('leaderboard', 1, state='live', fetched=1.0)
+    journal.record('roster', 10001)
+    journal.close()
+
+    # torn line of a killed run is ignored
+    with pth.open('a') as f:
+        f.write('{"unit": "roster", "ke')
+    journal = FetchJournal(pth)
+    assert journal.pending()
+    assert journal.header['scheduled'] == [[1, 'live'], [2, 'finalized']]
+    assert journal.is_done('leaderboard', 1)
+    assert not journal.is_done('leaderboard', 2)
+    assert journal.is_done('roster', '10001')
+    assert journal.completed('leaderboard')['1']['state'] == 'live'
+
+    # records of the resumed run survive the next load
+    journal.record('leaderboard', 2, state='finalized', fetched=2.0)
+    journal.record('roster', 10002)
+    journal.close()
+    journal = FetchJournal(pth)
+    assert journal.is_done('leaderboard', 1)
+    assert journal.is_done('leaderboard', 2)
+    assert journal.is_done('roster', 10001)
+    assert journal.is_done('roster', 10002)
+
+
+def test_finish(tmp_path, scheduled):
+    """Tests finished run is not pending and start clears it"""
+    pth = tmp_path / 'journal.jsonl'
+    journal = FetchJournal(pth)
+    journal.start(scheduled, update_rosters=False)
+    journal.record('leaderboard', 1, state='live', fetched=1.0)
+    journal.finish()
+    assert not FetchJournal(pth).pending()
+
+    journal = FetchJournal(pth)
+    journal.start(scheduled[:1], update_rosters=False)
+    journal.close()
+    journal = FetchJournal(pth)
+    assert journal.pending()
+    assert not journal.is_done('leaderboard', 1)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_jsobject.py
+
+import pytest
+
+from dkbestball import Parser
+from dkbestball.jsobject import find_var, object_spans, skip_value
+
+
+@pytest.fixture
+def js():
+    return '''<script>
+        var other = 1;
+        var contests = {
+            maxentrantsperpage : 99,
+            live: [{"ContestName": "a ] } [ \\" {", "x": [1, {"y": 2}]}],
+            "upcoming": [], /* block */
+            history: [] // no pre-load
+        };
+    </script>'''
+
+
+def test_find_var(js):
+    """Tests find_var"""
+    pos = find_var(js, 'contests')
+    assert js[pos] == '{'
+    assert find_var(js, 'missing') is None
+
+
+def test_skip_value(js):
+    """Tests brackets inside strings are ignored"""
+    pos = js.index('[{')
+    end = skip_value(js, pos)
+    assert js[end - 2:end + 1] == '}],'
+
+
+def test_object_spans(js):
+    """Tests members are located"""
+    spans = object_spans(js, find_var(js, 'contests'))
+    assert list(spans) == ['maxentrantsperpage', 'live', 'upcoming', 'history']
+    start, end = spans['maxentrantsperpage']
+    assert js[start:end] == '99'
+
+
+def test_mycontests_section(js, test_directory):
+    """Tests lazy section parsing"""
+    p = Parser()
+    assert p.mycontests(html=js, section='history') == []
+    live = p.mycontests(html=js, section='live')
+    assert live[0]['ContestName'] == 'a ] } [ " {'
+    assert p.mycontests(html=js)['maxentrantsperpage'] == 99
+    with pytest.raises(ValueError):
+        p.mycontests(html=js, section='bogus')
+
+    # page from DK
+    fn = test_directory / 'mycontests.html'
+    contests = p.mycontests(fn)
+    assert set(contests) == {
+        'maxentrantsperpage', 'live', 'upcoming', 'history'
+    }
+    assert p.mycontests(fn, section='live') == contests['live']
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_jsonio.py
+
+import json
+
+import pytest
+
+from dkbestball.jsonio import JSONCodec
+
+
+@pytest.fixture(params=JSONCodec.available_backends())
+def codec(request):
+    return JSONCodec(backend=request.param)
+
+
+def test_backend_missing():
+    """Tests unknown backend is rejected"""
+    with pytest.raises(ValueError):
+        JSONCodec(backend='yaml')
+
+
+def test_load(codec, test_directory):
+    """Tests load matches stdlib"""
+    pth = test_directory / 'contest_roster.json'
+    assert codec.load(pth) == json.loads(pth.read_text())
+    assert codec.load(str(pth)) == json.loads(pth.read_text())
+
+
+def test_load_mmap(test_directory):
+    """Tests memory-mapped load"""
+    pth = test_directory / 'contest_leaderboard.json'
+    codec = JSONCodec(mmap_threshold=1)
+    assert codec.load(pth) == json.loads(pth.read_text())
+
+
+def test_dump(codec, tmp_path):
+    """Tests dump round trip"""
+    obj = {'a': [1, 2.5, None, 'x'], 'b': {'c': True}}
+    pth = tmp_path / 'x.json'
+    codec.dump(obj, pth)
+    assert codec.load(pth) == obj
+    assert codec.loads(pth.read_text()) == obj
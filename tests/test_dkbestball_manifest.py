@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_manifest.py
+
+import os
+
+import pytest
+
+from dkbestball.manifest import ParseManifest
+
+
+@pytest.fixture
+def contest():
+    return {'MegaContestId': 1, 'ResultsRank': 10, 'DraftGroupId': 37605}
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return ParseManifest(tmp_path / 'parse_manifest.json')
+
+
+def test_is_current(manifest, contest, tmp_path):
+    """Tests parse manifest detects changed inputs"""
+    pth = tmp_path / '1.json'
+    pth.write_text('[1, 2]')
+    assert not manifest.is_current('1', contest)
+    manifest.mark('1', contest, [pth])
+    assert manifest.is_current('1', contest)
+
+    # same content with new mtime is still current
+    st = os.stat(pth)
+    os.utime(pth, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert manifest.is_current('1', contest)
+
+    # contest record changes
+    assert not manifest.is_current('1', {**contest, 'ResultsRank': 9})
+
+    # same size, different content
+    pth.write_text('[1, 3]')
+    assert not manifest.is_current('1', contest)
+
+
+def test_save(manifest, contest, tmp_path):
+    """Tests parse manifest round trips"""
+    pth = tmp_path / '1.json'
+    pth.write_text('[]')
+    manifest.mark('1', contest, [pth])
+    manifest.save()
+    loaded = ParseManifest(manifest.path)
+    assert '1' in loaded
+    assert loaded.is_current('1', contest)
+    pth.unlink()
+    assert not loaded.is_current('1', contest)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_memo.py
+
+import pandas as pd
+import pytest
+
+from dkbestball.memo import Memo, memoized
+
+
+class Source:
+
+    def __init__(self):
+        self.data_version = 0
+        self.calls = 0
+        self._memo = Memo(maxsize=2)
+
+    @memoized
+    def frame(self, n=2):
+        self.calls += 1
+        return pd.DataFrame({'a': range(n), 'b': ['x'] * n})
+
+    @memoized
+    def total(self, df=None):
+        self.calls += 1
+        return 0 if df is None else len(df)
+
+
+def test_get():
+    """Tests results are memoized per version"""
+    src = Source()
+    df = src.frame()
+    assert src.frame().equals(df)
+    assert src.calls == 1
+    src.data_version += 1
+    src.frame()
+    assert src.calls == 2
+
+
+def test_read_only():
+    """Tests cached frames cannot be changed through results"""
+    src = Source()
+    df = src.frame()
+    with pytest.raises(ValueError):
+        df.iloc[0, 0] = 5
+    with pytest.raises(ValueError):
+        df['a'].values[0] = 5
+    df['c'] = 1
+    assert 'c' not in src.frame().columns
+    assert (src.frame()['b'] == 'x').all()
+
+    # object columns are copies, so edits do not reach the memo
+    df.loc[0, 'b'] = 'y'
+    df['b'].values[1] = 'y'
+    src.frame()['b'].values[0] = 'y'
+    assert src.frame()['b'].tolist() == ['x', 'x']
+
+
+def test_eviction():
+    """Tests least recently used result is evicted"""
+    src = Source()
+    src.frame(1)
+    src.frame(2)
+    src.frame(1)
+    src.frame(3)
+    assert len(src._memo) == 2
+    assert ('frame', (2, ), ()) not in src._memo
+    src._memo.invalidate('frame')
+    assert len(src._memo) == 0
+
+
+def test_unhashable():
+    """Tests calls with unhashable args are not memoized"""
+    src = Source()
+    df = pd.DataFrame({'a': [1, 2]})
+    assert src.total(df) == 2
+    assert src.total(df) == 2
+    assert src.calls == 2
+    assert len(src._memo) == 0
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_ownership.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dkbestball import Analyzer, Parser, PlayerPoolRegistry
+from dkbestball.fakeserver import PayloadFactory
+import dkbestball.ownership as ownership
+from dkbestball.rawstore import RawFiles
+
+
+@pytest.fixture(params=['scipy', 'numpy'])
+def engine(request, monkeypatch):
+    if request.param == 'scipy':
+        pytest.importorskip('scipy')
+    else:
+        monkeypatch.setattr(ownership, 'sparse', None)
+    return request.param
+
+
+def _field(tmp_path, edit=None):
+    """Gets FieldOwnership over rosters of every entrant in 3 contests
+
+    Args:
+        edit (callable): changes roster payload in place, by entry key
+
+    """
+    factory = PayloadFactory(n_entries=12, n_megaentries=50)
+    p = Parser()
+    rosters = RawFiles(tmp_path / 'rosters')
+    rosters.root.mkdir()
+    contests = []
+    for c in factory.mycontests(3):
+        dg = c['DraftGroupId']
+        p.codec.dump(factory.draftables(dg),
+                     tmp_path / f'draftables_{dg}.json')
+        lb = p.contest_leaderboard(factory.contest_leaderboard(c['ContestId']))
+        keys = [str(item['MegaEntryKey']) for item in lb]
+        for k in keys:
+            roster = factory.contest_roster(dg, int(k))
+            if edit:
+                edit(k, roster)
+            rosters.put(k, p.codec.dumps(roster))
+        contests.append({
+            'contest_key': str(c['MegaContestId']),
+            'contest_type': Analyzer.contest_type(c['ContestName']),
+            'draftgroup_id': dg,
+            'entry_fee': c['BuyInAmount'],
+            'my_entry_key': keys[0],
+            'entry_keys': keys
+        })
+    contests = pd.DataFrame(contests)
+    entries = contests[['contest_key', 'entry_keys']].explode('entry_keys')
+    entries = entries.rename(columns={'entry_keys': 'entry_key'})
+    return ownership.FieldOwnership(contests,
+                                    entries,
+                                    rosters,
+                                    registry=PlayerPoolRegistry(tmp_path))
+
+
+@pytest.fixture
+def field(tmp_path):
+    return _field(tmp_path)
+
+
+def test_build(field):
+    """Tests every entrant's roster is loaded"""
+    assert len(field) == 36
+    assert len(field.indices) == 36 * PayloadFactory().roster_size
+    assert field.mine.sum() == 3
+    assert field.players['position'].notna().all()
+
+
+def test_build_empty_roster(tmp_path):
+    """Tests an empty roster does not shift the rows of later entries"""
+    empty = '894603750005'
+
+    def edit(key, roster):
+        if key == empty:
+            roster['entries'][0]['roster']['scorecards'] = []
+
+    field = _field(tmp_path, edit)
+    sizes = dict(zip(field.entry_keys, np.diff(field.indptr)))
+    assert sizes[empty] == 0
+    assert set(sizes.values()) == {0, PayloadFactory().roster_size}
+    assert len(field.indices) == 35 * PayloadFactory().roster_size
+
+
+def test_build_same_name(tmp_path, engine):
+    """Tests players with the same name are not merged"""
+
+    def edit(key, roster):
+        for card in roster['entries'][0]['roster']['scorecards']:
+            if card['displayName'] in ('Player 1', 'Player 2'):
+                card['displayName'] = 'Same Name'
+
+    field = _field(tmp_path, edit)
+    same = field.players.index[field.players['displayName'] == 'Same Name']
+    assert len(same) == 2
+    df = field.exposure('draftgroup_id')
+    n = df.loc[df['displayName'] == 'Same Name', 'n']
+    counts = np.bincount(field.indices, minlength=len(field.players))
+    assert sorted(n) == sorted(counts[same])
+
+
+def test_exposure(field, engine):
+    """Tests counts match rosters grouped by contest type"""
+    df = field.exposure('contest_type')
+    assert set(df.columns) == {
+        'contest_type', 'displayName', 'position', 'teamAbbreviation', 'n',
+        'tot', 'pct'
+    }
+    assert df['n'].sum() == len(field.indices)
+    assert (df.groupby('contest_type')['tot'].first().sum() == len(field))
+    mine = field.exposure('draftgroup_id', mine=True)
+    assert mine['tot'].unique().tolist() == [3]
+
+
+def test_versus(field, engine):
+    """Tests my exposure minus the field's"""
+    df = field.versus('entry_fee')
+    assert (df['diff'] == (df['my_pct'] - df['field_pct']).round(1)).all()
+    mine = field.exposure('entry_fee', mine=True)
+    assert set(df['displayName']) >= set(mine['displayName'])
+
+
+def test_engines_agree(field, monkeypatch):
+    """Tests scipy and NumPy give the same exposure"""
+    pytest.importorskip('scipy')
+    expected = field.exposure(), field.versus(), field.pairs()
+    monkeypatch.setattr(ownership, 'sparse', None)
+    assert field.exposure().equals(expected[0])
+    assert field.versus().equals(expected[1])
+    assert field.pairs().equals(expected[2])
+
+
+def test_pairs(field, engine):
+    """Tests pair counts match a loop over rosters"""
+    df = field.pairs()
+    rows = [
+        field.players['displayName'][field.indices[i:j]].tolist()
+        for i, j in zip(field.indptr[:-1], field.indptr[1:])
+    ]
+    top = df.iloc[0]
+    n = sum(top['displayName_a'] in r and top['displayName_b'] in r
+            for r in rows)
+    assert top['n'] == n
+    assert df['n'].sum() == sum(len(r) * (len(r) - 1) // 2 for r in rows)
+    stacks = field.pairs(mine=False, positions=('QB', 'WR'), same_team=True)
+    assert (stacks['position_a'] == 'QB').all()
+    assert (stacks['position_b'] == 'WR').all()
+    assert (stacks['teamAbbreviation_a'] == stacks['teamAbbreviation_b']).all()
+    assert (stacks['tot'] == 33).all()
+
+
+def test_from_rosters(test_directory, engine):
+    """Tests engine over the flat roster table"""
+    a = Analyzer('sansbacon', test_directory)
+    df = a.myrosters()
+    field = ownership.FieldOwnership.from_rosters(a.data, df)
+    assert len(field) == df['entryKey'].nunique()
+    assert len(field.indices) == len(df)
+    own = field.exposure('contest_type', mine=True)
+    assert own['n'].sum() == len(df)
+    pairs = a.stacks()
+    assert (pairs['lift'] > 0).all()
@@ -111,6 +111,33 @@ def test_contest_roster(p, rosterfile):
     assert isinstance(random.choice(roster), dict)
 
 
+def test_contest_rosters(p, rosterfile, test_directory):
+    """Tests contest_rosters matches contest_roster"""
+    content = json.loads(rosterfile.read_text())
+    playerd = p.player_pool_dict(draftables_fn=test_directory /
+                                 'draftables.json')
+    expected = pd.DataFrame(p.contest_roster(content, playerd))
+    df = p.contest_rosters([content, content], playerd)
+    assert len(df) == 2 * len(expected)
+    assert set(df.columns) == set(expected.columns)
+    assert df['entryKey'].dtype == 'Int64'
+    assert df['position'].dtype == 'category'
+    for col in expected.columns:
+        vals = df[col].head(len(expected)).astype(object).tolist()
+        assert [str(v) for v in vals] == [str(v) for v in expected[col]]
+
+
+def test_contest_rosters_arrays(p, rosterfile):
+    """Tests contest_rosters without player pool or frame"""
+    content = json.loads(rosterfile.read_text())
+    cols = p.contest_rosters([content], as_frame=False)
+    n = len(content['entries'][0]['roster']['scorecards'])
+    assert set(cols) == set(p.ROSTER_METADATA_FIELDS) | {
+        'displayName', 'draftableId'
+    }
+    assert all(len(v) == n for v in cols.values())
+
+
 def test_is_bestball_contest(p, contestfile, dfscontest):
     """Tests is_bestball_contest"""
     contest = json.loads(contestfile.read_text())
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_planner.py
+
+import datetime
+
+import pytest
+
+from dkbestball.manifest import FetchManifest
+from dkbestball.parser import Parser
+from dkbestball.planner import RefreshPlanner
+
+
+@pytest.fixture
+def now():
+    return datetime.datetime(2020, 10, 15, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def contests():
+    # ContestEndDate is the end of week 1, even for live contests
+    return [{
+        'ContestId': 1,
+        'DraftGroupId': 37605,
+        'ContestStartDate': '2019-09-06T00:20:00Z',
+        'ContestEndDate': '2019-09-10T02:20:00Z',
+        'section': 'history'
+    }, {
+        'ContestId': 2,
+        'DraftGroupId': 37605,
+        'ContestStatus': 7,
+        'ContestStartDate': '2020-09-11T00:20:00Z',
+        'ContestEndDate': '2020-09-15T02:20:00Z'
+    }, {
+        'ContestId': 3,
+        'DraftGroupId': 37605,
+        'ContestStatus': 1,
+        'ContestStartDate': '2020-11-11T00:20:00Z',
+        'ContestEndDate': '2020-11-15T02:20:00Z'
+    }]
+
+
+@pytest.fixture
+def planner(tmp_path):
+    return RefreshPlanner(FetchManifest(tmp_path / 'manifest.json'))
+
+
+def test_classify(planner, contests, now):
+    """Tests classify"""
+    states = [planner.classify(c, now=now) for c in contests]
+    assert states == ['finalized', 'live', 'upcoming']
+    assert planner.classify({'Finalized': True}) == 'finalized'
+
+    # a drafted contest is Historical while it is still live
+    contest = {'DraftGroupState': 'Historical', 'ContestStatus': 7}
+    assert planner.classify(contest, now=now) == 'live'
+
+    # without section or status, a started contest is live
+    contest = {'ContestEndDate': '2020-09-15T02:20:00Z'}
+    assert planner.classify(contest, now=now) == 'live'
+
+
+def test_classify_mycontests(planner, test_directory, now):
+    """Tests live contests of mycontests are not finalized"""
+    contests = Parser().mycontests(test_directory / 'mycontests.html')
+    states = {planner.classify(c, now=now) for c in contests['live']}
+    assert states == {'live'}
+    states = {planner.classify(c, now=now) for c in contests['upcoming']}
+    assert states == {'upcoming'}
+
+
+def test_plan_new(planner, contests, now):
+    """Tests everything is scheduled with empty manifest"""
+    scheduled = planner.plan(contests, now=now)
+    assert [c['ContestId'] for c, _ in scheduled] == [1, 2, 3]
+
+
+def test_plan_manifest(planner, contests, now):
+    """Tests only stale contests are scheduled"""
+    ts = now.timestamp()
+    planner.manifest.mark(1, 'finalized', fetched=ts - 10**6)
+    planner.manifest.mark(2, 'live', fetched=ts - 60)
+    planner.manifest.mark(3, 'upcoming', fetched=ts - 10**6)
+    assert planner.plan(contests, now=now) == []
+
+    # live contest goes stale, finalized was fetched while live
+    planner.manifest.mark(1, 'live', fetched=ts - 10**6)
+    planner.manifest.mark(2, 'live', fetched=ts - 10**6)
+    scheduled = planner.plan(contests, now=now)
+    assert [(c['ContestId'], s) for c, s in scheduled] == [(1, 'finalized'),
+                                                           (2, 'live')]
+
+
+def test_plan_entered(planner, contests, now):
+    """Tests megacontest_entered finalized entries are used"""
+    entered = [{'ContestId': 2, 'Finalized': True}]
+    scheduled = planner.plan(contests, entered=entered, now=now)
+    assert dict((c['ContestId'], s) for c, s in scheduled)[2] == 'finalized'
+
+
+def test_manifest_save(tmp_path):
+    """Tests manifest round trip"""
+    m = FetchManifest(tmp_path / 'manifest.json')
+    m.mark(5, 'live', fetched=1.0)
+    m.save()
+    m2 = FetchManifest(tmp_path / 'manifest.json')
+    assert 5 in m2
+    assert m2.get(5) == {'fetched': 1.0, 'state': 'live'}
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_ratelimit.py
+
+import time
+
+import pytest
+
+from dkbestball.ratelimit import AdaptivePacer, TokenBucket
+
+
+@pytest.fixture
+def pacer():
+    return AdaptivePacer(rate=10, cooldown=0)
+
+
+def test_token_bucket_wait():
+    """Tests token bucket spaces out calls"""
+    b = TokenBucket(rate=100)
+    start = time.monotonic()
+    for _ in range(6):
+        b.wait()
+    assert time.monotonic() - start >= .04
+
+
+def test_token_bucket_rate():
+    """Tests token bucket rejects bad rate"""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_pacer_increase(pacer):
+    """Tests rate rises while responses are fast"""
+    for _ in range(10):
+        assert not pacer.record(200, .1)
+    assert pacer.rate == pytest.approx(11)
+
+
+def test_pacer_decrease(pacer):
+    """Tests rate is cut on 429 and 5xx"""
+    assert pacer.record(429, .1)
+    assert pacer.rate == pytest.approx(5)
+    assert pacer.record(503, .1)
+    assert pacer.rate == pytest.approx(2.5)
+    stats = pacer.stats()
+    assert stats['throttle_events'] == 2
+    assert stats['errors'] == 2
+
+
+def test_pacer_latency(pacer):
+    """Tests rate is cut when latency climbs"""
+    pacer.record(200, 10)
+    assert pacer.rate == pytest.approx(5)
+    assert pacer.stats()['errors'] == 0
+
+
+def test_pacer_cooldown():
+    """Tests burst of failures cuts rate once"""
+    pacer = AdaptivePacer(rate=10, cooldown=60)
+    for _ in range(5):
+        pacer.record(429, .1)
+    assert pacer.rate == pytest.approx(5)
+    assert pacer.stats()['requests'] == 5
+
+
+def test_pacer_floor(pacer):
+    """Tests rate does not drop below min_rate"""
+    for _ in range(20):
+        pacer.record(500, .1)
+    assert pacer.rate == pacer.min_rate
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_rawstore.py
+
+import gzip
+import pickle
+
+import pytest
+
+from dkbestball.rawstore import RawFiles, RawStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RawStore(tmp_path / 'rosters', shard_size=256)
+
+
+def test_put_read(store):
+    """Tests payloads are read back by key"""
+    for i in range(20):
+        store.put(i, b'{"entry": %d}' % i)
+    store.put(5, b'{"entry": 55}')
+    assert len(store) == 20
+    assert 5 in store and 20 not in store
+    assert store.read(5) == b'{"entry": 55}\n'
+    assert store.versions(5) == [b'{"entry": 5}\n', b'{"entry": 55}\n']
+    assert store.versions(20) == []
+    assert store.open(19).read() == b'{"entry": 19}\n'
+    with pytest.raises(KeyError):
+        store.read(20)
+
+
+def test_shards(store):
+    """Tests shards roll over and decompress to ndjson"""
+    for i in range(20):
+        store.put(i, b'{"entry": %d}' % i)
+    store.close()
+    shards = sorted(store.root.glob('shard-*.ndjson.gz'))
+    assert len(shards) > 1
+    lines = b''.join(gzip.decompress(p.read_bytes()) for p in shards)
+    assert lines.splitlines()[0] == b'{"entry": 0}'
+    assert len(lines.splitlines()) == 20
+
+
+def test_reopen(store):
+    """Tests index survives reopen, pickling and a torn record"""
+    store.put(1, b'{}')
+    store.put(2, b'[]')
+    store.close()
+    with store.index_path.open('ab') as f:
+        f.write(b'\x00' * 5)
+    other = pickle.loads(pickle.dumps(store))
+    assert other.read(2) == b'[]\n'
+    assert other.locate(1) == store.locate(1)
+    assert other.locate(3) is None
+
+
+def test_put_after_torn_record(store):
+    """Tests records appended after a torn record are read back"""
+    store.put(1, b'{}')
+    store.put(2, b'[]')
+    store.close()
+    with store.index_path.open('ab') as f:
+        f.write(b'\x00' * 3)
+    other = RawStore(store.root, shard_size=256)
+    other.put(4, b'{"a": 4}')
+    other.close()
+    other = RawStore(store.root, shard_size=256)
+    assert sorted(other.keys()) == [1, 2, 4]
+    assert other.read(1) == b'{}\n'
+    assert other.read(2) == b'[]\n'
+    assert other.read(4) == b'{"a": 4}\n'
+
+
+def test_zstd(tmp_path):
+    """Tests zstd compression"""
+    pytest.importorskip('zstandard')
+    store = RawStore(tmp_path / 'rosters', compression='zstd')
+    store.put(1, b'{"a": 1}')
+    assert store.read(1) == b'{"a": 1}\n'
+
+
+def test_raw_files(tmp_path):
+    """Tests file per key layout"""
+    files = RawFiles(tmp_path)
+    files.put(7, b'{}')
+    assert 7 in files
+    assert files.read(7) == b'{}'
+    assert files.keys() == [7]
+    assert files.locate(7) == [2, files.path(7).stat().st_mtime_ns]
+    assert files.locate(8) is None
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_registry.py
+
+import json
+import shutil
+
+import pytest
+
+from dkbestball import Parser, PlayerPoolRegistry
+
+
+@pytest.fixture
+def datadir(tmp_path, test_directory):
+    shutil.copy(test_directory / 'draftables.json',
+                tmp_path / 'draftables_37605.json')
+    (tmp_path / 'draftables').mkdir()
+    shutil.copy(test_directory / 'draftables.json',
+                tmp_path / 'draftables' / '42308.json')
+    return tmp_path
+
+
+def test_get(datadir, test_directory):
+    """Tests pool matches player_pool_dict and is loaded once"""
+    r = PlayerPoolRegistry(datadir)
+    pool = r.get(37605)
+    expected = Parser().player_pool_dict(draftables_fn=test_directory /
+                                         'draftables.json')
+    assert pool == expected
+    assert r.get('37605') is pool
+    assert (r.hits, r.misses) == (1, 1)
+    assert len(r.get(42308)) == len(pool)
+
+
+def test_lru(datadir):
+    """Tests least recently used pool is dropped"""
+    r = PlayerPoolRegistry(datadir, maxsize=1)
+    r.get(37605)
+    r.get(42308)
+    assert 37605 not in r
+    assert 42308 in r
+    assert len(r) == 1
+
+
+def test_missing(datadir):
+    """Tests missing draft group"""
+    with pytest.raises(FileNotFoundError):
+        PlayerPoolRegistry(datadir).get(1)
+
+
+def test_persist(datadir):
+    """Tests pickled pool is written and reused"""
+    r = PlayerPoolRegistry(datadir, persist=True)
+    pool = r.get(37605)
+    idx = datadir / 'draftables_37605.idx.pkl'
+    assert idx.is_file()
+    assert PlayerPoolRegistry(datadir, persist=True).load(37605) == pool
+
+
+def test_contest_roster(datadir, test_directory):
+    """Tests contest_roster looks up pool from registry"""
+    p = Parser()
+    content = json.loads((test_directory / 'contest_roster.json').read_text())
+    roster = p.contest_roster(content, registry=PlayerPoolRegistry(datadir))
+    assert {'position', 'teamAbbreviation'} <= set(roster[0])
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_scoring.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dkbestball import Analyzer, LineupScorer
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(7)
+    idx = pd.Index(range(100, 140), name='draftableId')
+    df = pd.DataFrame(rng.normal(8, 6, (len(idx), 4)).round(1),
+                      index=idx,
+                      columns=['week1', 'week2', 'week3', 'week4'])
+    df.iloc[0, 0] = np.nan
+    return df
+
+
+def _roster(entry_key, players):
+    return [{
+        'entryKey': entry_key,
+        'draftableId': pid,
+        'position': pos
+    } for pid, pos in players]
+
+
+def test_score(points):
+    """Tests optimal lineup of one roster by hand"""
+    players = [(100, 'QB'), (101, 'QB'), (102, 'RB'), (103, 'RB'), (104, 'RB'),
+               (105, 'WR'), (106, 'WR'), (107, 'WR'), (108, 'WR'), (109, 'TE'),
+               (110, 'TE')]
+    scores = LineupScorer(points).score(_roster('1', players))
+    for week in points.columns:
+        pts = {pid: points.at[pid, week] for pid, _ in players}
+        pts = {k: 0 if pd.isna(v) else v for k, v in pts.items()}
+        by_pos = {}
+        for pid, pos in players:
+            by_pos.setdefault(pos, []).append(pts[pid])
+        best, bench = 0, []
+        for pos, n in LineupScorer.LINEUP.items():
+            vals = sorted(by_pos[pos], reverse=True)
+            best += sum(vals[:n])
+            if pos != 'QB':
+                bench += vals[n:]
+        best += max(bench)
+        assert scores.at['1', week] == pytest.approx(best)
+    assert scores.at['1', 'total'] == pytest.approx(
+        scores.loc['1', points.columns].sum())
+
+
+def test_score_many(points):
+    """Tests rosters are scored independently and empty slots score 0"""
+    rng = np.random.default_rng(1)
+    pos = rng.choice(['QB', 'RB', 'WR', 'TE'], len(points))
+    rosters = []
+    for i in range(50):
+        ids = rng.choice(len(points), 12, replace=False)
+        rosters += _roster(str(i), [(points.index[j], pos[j]) for j in ids])
+    rosters += _roster('short', [(101, 'QB'), (99999, 'RB')])
+    scorer = LineupScorer(points)
+    scores = scorer.score(pd.DataFrame(rosters))
+    assert len(scores) == 51
+    one = scorer.score([r for r in rosters if r['entryKey'] == '7'])
+    assert np.allclose(one.loc['7'], scores.loc['7'])
+    expected = np.nan_to_num(points.loc[101].to_numpy())
+    assert np.allclose(scores.loc['short', points.columns], expected)
+
+
+def test_analyzer(test_directory):
+    """Tests my rosters are scored"""
+    a = Analyzer('sansbacon', test_directory)
+    ids = a.myrosters()['draftableId'].unique()
+    points = pd.DataFrame({'week1': 1.0, 'week2': 2.0}, index=ids)
+    scores = a.lineup_scores(points)
+    assert len(scores) == a.myrosters()['entryKey'].nunique()
+    assert (scores['total'] <= 8 * 3).all()
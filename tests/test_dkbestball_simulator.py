@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_simulator.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dkbestball import AdvancementSimulator, LineupScorer
+
+
+@pytest.fixture
+def rosters():
+    """Gets 3 pods of 6 rosters of 18 players"""
+    rng = np.random.default_rng(11)
+    ids = np.arange(1000, 1200)
+    pos = rng.choice(['QB', 'RB', 'WR', 'TE'], len(ids), p=[.15, .3, .4, .15])
+    rows = []
+    for pod in range(3):
+        for i in range(6):
+            for j in rng.choice(len(ids), 18, replace=False):
+                rows.append({
+                    'contestKey': str(pod),
+                    'entryKey': f'{pod}{i:02d}',
+                    'userName': 'sansbacon' if i == 0 else f'user{i}',
+                    'draftableId': ids[j],
+                    'position': pos[j]
+                })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def mean(rosters):
+    ids = rosters['draftableId'].unique()
+    return pd.Series(np.linspace(2, 20, len(ids)), index=ids)
+
+
+def test_fixed_points(rosters, mean):
+    """Tests results without variance match lineup scores"""
+    sim = AdvancementSimulator(rosters,
+                               mean=mean,
+                               std=mean * 0,
+                               n_weeks=2,
+                               advance=2,
+                               payouts=[100, 20])
+    df = sim.run(n_sims=10, batch_size=4).set_index('entryKey')
+    points = pd.DataFrame({'week1': mean, 'week2': mean})
+    scores = LineupScorer(points).score(rosters)['total']
+    assert np.allclose(df['mean_points'], scores[df.index], atol=.01)
+    for _, pod in df.groupby('contestKey'):
+        best = pod['mean_points'].sort_values(ascending=False)
+        assert pod.loc[best.index[:2], 'p_advance'].tolist() == [1, 1]
+        assert pod['p_advance'].sum() == 2
+        assert pod.loc[best.index[0], 'exp_payout'] == 100
+
+
+def test_normal(rosters, mean):
+    """Tests probabilities of each pod sum to places advancing"""
+    sim = AdvancementSimulator(rosters, mean=mean, std=mean / 2, advance=2)
+    df = sim.run(n_sims=2000, batch_size=300, seed=5)
+    assert len(df) == 18
+    assert np.allclose(df.groupby('contestKey')['p_advance'].sum(), 2)
+    assert df['p_advance'].between(0, 1).all()
+    assert df.equals(sim.run(n_sims=2000, batch_size=300, seed=5))
+
+
+def test_history(rosters):
+    """Tests resampling weeks and process pool give the same results"""
+    rng = np.random.default_rng(3)
+    ids = rosters['draftableId'].unique()
+    history = pd.DataFrame(rng.gamma(2, 5, (len(ids), 10)), index=ids)
+    history.iloc[::7, 4] = np.nan
+    history.iloc[0] = np.nan
+    sim = AdvancementSimulator(rosters,
+                               history=history,
+                               n_weeks=3,
+                               payouts=[10])
+    df = sim.run(n_sims=400, batch_size=100, seed=1)
+    assert np.allclose(df.groupby('contestKey')['exp_payout'].sum(),
+                       10,
+                       atol=.05)
+    pooled = sim.run(n_sims=400, batch_size=100, seed=1, workers=2)
+    assert df.equals(pooled)
+
+
+def test_ties(rosters):
+    """Tests tied entries advance equally often"""
+    ids = rosters['draftableId'].unique()
+    mean = pd.Series(10.0, index=ids)
+    # every roster scores the same lineup
+    rosters = rosters.assign(position='QB')
+    sim = AdvancementSimulator(rosters, mean=mean, std=mean * 0, advance=1)
+    df = sim.run(n_sims=3000, batch_size=500, seed=2)
+    assert df['mean_points'].nunique() == 1
+    assert df['p_advance'].between(1 / 6 - .04, 1 / 6 + .04).all()
+
+
+def test_arguments(rosters, mean):
+    """Tests points arguments are checked"""
+    with pytest.raises(ValueError):
+        AdvancementSimulator(rosters)
+    with pytest.raises(ValueError):
+        AdvancementSimulator(rosters, mean=mean)
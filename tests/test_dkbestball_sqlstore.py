@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_sqlstore.py
+
+import pickle
+import shutil
+
+import pandas as pd
+import pytest
+
+from dkbestball import Analyzer
+from dkbestball.sqlstore import SQLiteStore
+
+
+@pytest.fixture
+def records(test_directory):
+    with (test_directory / 'mydata.pkl').open('rb') as f:
+        data = pickle.load(f)
+    for d in data:
+        d['season'] = 2020
+        d['contest_type'] = Analyzer.contest_type(d['contest_name'])
+    return data
+
+
+@pytest.fixture
+def datadir(tmp_path, records, test_directory):
+    shutil.copy(test_directory / 'mydata.pkl', tmp_path / 'mydata.pkl')
+    store = SQLiteStore(tmp_path / 'mydata.sqlite')
+    store.write(records)
+    store.close()
+    return tmp_path
+
+
+def _sorted(df, cols):
+    return df.sort_values(cols).reset_index(drop=True)
+
+
+def test_write(tmp_path, records):
+    """Tests records are replaced and dropped"""
+    store = SQLiteStore(tmp_path / 'mydata.sqlite')
+    store.write(records)
+    keep = [d['contest_key'] for d in records[:10]]
+    store.write([dict(records[0], my_place=99)], keep=keep)
+    assert store.contest_keys() == set(keep)
+    std = store.standings(['season', 'contest_key', 'my_place'])
+    assert std.equals(_sorted(std, ['season', 'contest_key']))
+    assert std.loc[std.contest_key == records[0]['contest_key'],
+                   'my_place'].tolist() == [99]
+    assert set(store.rosters()['contestKey']) == set(keep)
+    n = store.con.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+    assert n == sum(len(set(d['entry_keys'])) for d in records[:10])
+
+
+def test_analyzer(datadir, test_directory):
+    """Tests SQL reports match pandas reports"""
+    a = Analyzer('sansbacon', datadir, use_sqlite=True)
+    b = Analyzer('sansbacon', test_directory)
+    assert a.sqlite is not None and b.sqlite is None
+
+    cols = a.STANDINGS_COLUMNS
+    std_a = _sorted(a.standings()[cols], ['contest_key'])
+    std_b = _sorted(b.standings()[cols], ['contest_key'])
+    pd.testing.assert_frame_equal(std_a, std_b, check_dtype=False)
+
+    fin_a = _sorted(a.financial_summary(), ['contest_type', 'entry_fee'])
+    fin_b = _sorted(b.financial_summary(), ['contest_type', 'entry_fee'])
+    pd.testing.assert_frame_equal(fin_a, fin_b, check_dtype=False)
+
+    cols = ['displayName', 'position', 'teamAbbreviation']
+    own_a = _sorted(a.ownership(), cols)
+    own_b = _sorted(b.ownership(), cols)
+    pd.testing.assert_frame_equal(own_a[cols + ['n', 'tot']],
+                                  own_b[cols + ['n', 'tot']],
+                                  check_dtype=False)
+
+    ros_a = _sorted(a.tournament_rosters(), ['entryKey', 'draftableId'])
+    ros_b = _sorted(b.tournament_rosters(), ['entryKey', 'draftableId'])
+    assert set(ros_a.columns) == set(a.ROSTER_COLUMNS)
+    assert ros_a['entryKey'].tolist() == ros_b['entryKey'].tolist()
+    assert len(a.tournament_ownership()) == len(b.tournament_ownership())
+
+
+def test_analyzer_backend(datadir, records):
+    """Tests SQLite is only read when asked for"""
+    # stale database from an earlier run
+    store = SQLiteStore(datadir / 'mydata.sqlite')
+    store.write(records[:2], keep=[d['contest_key'] for d in records[:2]])
+    store.close()
+    assert Analyzer('sansbacon', datadir).sqlite is None
+    a = Analyzer('sansbacon', datadir, use_sqlite=True)
+    assert len(a.standings()) == 2
+    with pytest.raises(FileNotFoundError):
+        Analyzer('sansbacon', datadir.parent, use_sqlite=True)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_store.py
+
+import pickle
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from dkbestball import Analyzer
+from dkbestball.store import ColumnarStore
+
+
+@pytest.fixture
+def records(test_directory):
+    with (test_directory / 'mydata.pkl').open('rb') as f:
+        data = pickle.load(f)
+    for d in data:
+        d['season'] = 2020
+        d['contest_type'] = Analyzer.contest_type(d['contest_name'])
+    return data
+
+
+@pytest.fixture
+def store(tmp_path, records):
+    store = ColumnarStore(tmp_path / 'store')
+    store.write(records)
+    return store
+
+
+def test_read(store, records):
+    """Tests tables, columns and partition filters"""
+    contests = store.read('contests')
+    assert len(contests) == len(records)
+    assert set(contests['contest_type']) == {
+        d['contest_type'] for d in records
+    }
+    rosters = store.read('rosters',
+                         columns=['contestKey', 'position'],
+                         filters={'contest_type': 'Tournament'})
+    assert list(rosters.columns) == ['contestKey', 'position']
+    n = sum(
+        len(d['myroster']) for d in records
+        if d['contest_type'] == 'Tournament')
+    assert len(rosters) == n
+    entries = store.read('entries')
+    assert len(entries) == sum(len(d['entry_keys']) for d in records)
+
+
+def test_write(store, records):
+    """Tests records are replaced and dropped"""
+    keep = [d['contest_key'] for d in records[:10]]
+    changed = dict(records[0], my_place=99)
+    store.write([changed], keep=keep)
+    contests = store.read('contests')
+    assert sorted(contests['contest_key']) == sorted(keep)
+    row = contests.loc[contests['contest_key'] == changed['contest_key']]
+    assert row['my_place'].tolist() == [99]
+    rosters = store.read('rosters', columns=['contestKey'])
+    assert set(rosters['contestKey']) <= set(keep)
+    assert (rosters['contestKey'] == changed['contest_key']).sum() == len(
+        changed['myroster'])
+
+
+def test_analyzer(store, records, test_directory):
+    """Tests analyzer gives the same reports from store"""
+    a = Analyzer('sansbacon', store.root.parent)
+    b = Analyzer('sansbacon', test_directory)
+    assert a.store is not None
+    assert len(a.myrosters()) == len(b.myrosters())
+    assert len(a.tournament_rosters()) == len(b.tournament_rosters())
+    cols = ['displayName', 'n', 'tot']
+    own_a = a.ownership().sort_values(cols).reset_index(drop=True)
+    own_b = b.ownership().sort_values(cols).reset_index(drop=True)
+    assert own_a[cols].equals(own_b[cols])
+    fin_a = a.financial_summary().reset_index(drop=True)
+    fin_b = b.financial_summary().reset_index(drop=True)
+    assert fin_a.equals(fin_b)
+
+
+def test_analyzer_pruning(store, monkeypatch):
+    """Tests reports read only the columns and partitions they need"""
+    a = Analyzer('sansbacon', store.root.parent)
+    reads = []
+    read = a.store.read
+
+    def spy(table, columns=None, filters=None):
+        reads.append((table, columns, filters))
+        return read(table, columns=columns, filters=filters)
+
+    monkeypatch.setattr(a.store, 'read', spy)
+    own = a.ownership()
+    df = a.tournament_rosters()
+    assert reads[0] == ('rosters', [
+        'displayName', 'position', 'teamAbbreviation', 'userName', 'entryKey'
+    ], None)
+    assert reads[1][2] == {'contest_type': 'Tournament'}
+    assert own['tot'].iloc[0] == a.myrosters()['entryKey'].nunique()
+    assert set(df['contestKey']) == set(a.tournament_contests())
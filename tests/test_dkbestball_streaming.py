@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_streaming.py
+
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from dkbestball import Parser
+from dkbestball.fakeserver import PayloadFactory
+from dkbestball.streaming import iter_array
+
+
+@pytest.fixture
+def leaderboardfile(test_directory):
+    return test_directory / 'contest_leaderboard.json'
+
+
+@pytest.fixture
+def p():
+    return Parser()
+
+
+def test_iter_array_chunks():
+    """Tests items split across tiny chunks"""
+    text = '{"Leader": {"a": 1}, "leaderBoard": [{"a": "]"}, {"a": 2}] }'
+    items = list(iter_array(io.BytesIO(text.encode()), ['leaderBoard'], 3))
+    assert items == [{'a': ']'}, {'a': 2}]
+
+
+def test_iter_array_empty():
+    """Tests empty array"""
+    assert list(iter_array(['{"Leaderboard": []}'], ['Leaderboard'])) == []
+
+
+def test_iter_array_errors():
+    """Tests missing and truncated arrays"""
+    with pytest.raises(ValueError):
+        list(iter_array(['{"x": []}'], ['Leaderboard']))
+    with pytest.raises(ValueError):
+        list(iter_array(['{"Leaderboard": [{"a": 1}, {"a"'], ['Leaderboard']))
+
+
+def test_iter_contest_leaderboard(p, leaderboardfile):
+    """Tests streaming matches contest_leaderboard"""
+    expected = p.contest_leaderboard(json.loads(leaderboardfile.read_text()))
+    assert list(p.iter_contest_leaderboard(leaderboardfile, 256)) == expected
+
+
+def test_iter_contest_leaderboard_variant(p):
+    """Tests leaderBoard / entryKey variant"""
+    content = {
+        'leaderBoard': [{
+            'userName': 'x',
+            'contestKey': '1',
+            'entryKey': '2',
+            'Rank': 1
+        }]
+    }
+    stream = io.StringIO(json.dumps(content))
+    lb = list(p.iter_contest_leaderboard(stream))
+    assert lb == p.contest_leaderboard(content)
+    assert lb[0]['entryKey'] == '2'
+
+
+def test_iter_contest_leaderboard_memory(p, tmp_path):
+    """Tests memory does not grow with leaderboard size"""
+    pth = tmp_path / 'mega.json'
+    factory = PayloadFactory(n_megaentries=20000)
+    pth.write_text(json.dumps(factory.megacontest_leaderboard(1)))
+    tracemalloc.start()
+    n = sum(1 for _ in p.iter_contest_leaderboard(pth))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert n == 20000
+    assert peak < pth.stat().st_size / 4
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# test_dkbestball_timestamps.py
+
+import datetime
+
+from dateutil import tz
+import pytest
+
+from dkbestball import Parser
+from dkbestball.timestamps import parse_timestamp_fields, parse_timestamps
+
+UTC = datetime.timezone.utc
+
+
+def test_parse_timestamps():
+    """Tests ISO fast path and fallback"""
+    vals = parse_timestamps([
+        '2020-09-11T00:20:00.0000000Z', None, '2020-09-15T02:20:00Z',
+        'Sep 16 2020 10:00 AM', '2020-09-11T00:20:00.1234567'
+    ])
+    assert vals[0] == datetime.datetime(2020, 9, 11, 0, 20, tzinfo=UTC)
+    assert vals[1] is None
+    assert vals[2] == datetime.datetime(2020, 9, 15, 2, 20, tzinfo=UTC)
+    assert vals[3] == datetime.datetime(2020, 9, 16, 10, 0, tzinfo=UTC)
+    assert vals[4].microsecond == 123456
+
+
+def test_parse_timestamps_zone():
+    """Tests conversion to target zone"""
+    eastern = tz.gettz('America/New_York')
+    vals = parse_timestamps(
+        ['2020-09-11T00:20:00Z',
+         datetime.datetime(2020, 9, 11, 0, 20)],
+        to_zone=eastern)
+    assert vals[0].hour == 20
+    assert vals[0] == vals[1]
+
+
+def test_parse_timestamps_bad():
+    """Tests unparseable value"""
+    with pytest.raises(ValueError):
+        parse_timestamps(['not a date'])
+
+
+def test_parse_timestamp_fields():
+    """Tests fields are parsed in place"""
+    items = [{'StartDate': '2020-09-11T00:20:00Z'}, {'EndDate': None}]
+    parse_timestamp_fields(items, ('StartDate', 'EndDate'))
+    assert items[0]['StartDate'].year == 2020
+    assert items[1] == {'EndDate': None}
+
+
+def test_megacontest_entered():
+    """Tests megacontest_entered dates are local"""
+    content = {
+        'Contests': [{
+            'DraftGroupId': 37605,
+            'DraftGroupState': 'Historical',
+            'ContestId': 89460375,
+            'StartDate': '2020-09-11T00:20:00.0000000Z',
+            'EndDate': '2020-09-15T02:20:00.0000000Z'
+        }]
+    }
+    d = Parser().megacontest_entered(content)[0]
+    assert isinstance(d['StartDate'], datetime.datetime)
+    assert d['StartDate'] == datetime.datetime(2020, 9, 11, 0, 20, tzinfo=UTC)
+    assert d['EndDate'] > d['StartDate']
+    assert not d['Finalized']
@@ -4,9 +4,242 @@
 
 import json
 import os
+import pickle
 import random
+import shutil
 
 import pandas as pd
 import pytest
+import requests
 
-from dkbestball import Parser
+from dkbestball import Analyzer, Parser, Scraper, Updater
+from dkbestball.fakeserver import FakeDKServer, PayloadFactory
+from dkbestball.journal import FetchJournal
+from dkbestball.manifest import ParseManifest
+from dkbestball.ratelimit import AdaptivePacer
+from dkbestball.store import ColumnarStore
+
+
+@pytest.fixture
+def factory():
+    return PayloadFactory(n_entries=12, n_megaentries=50)
+
+
+@pytest.fixture
+def contests(factory):
+    return factory.mycontests(3)
+
+
+@pytest.fixture
+def srv(factory):
+    with FakeDKServer(factory=factory) as srv:
+        yield srv
+
+
+@pytest.fixture
+def datadir(tmp_path, factory, contests):
+    """Gets data directory with mycontests and player pools"""
+    (tmp_path / 'leaderboards').mkdir()
+    (tmp_path / 'rosters').mkdir()
+    with (tmp_path / 'mycontests.pkl').open('wb') as f:
+        pickle.dump(contests, f)
+    for dg in {c['DraftGroupId'] for c in contests}:
+        Parser().codec.dump(factory.draftables(dg),
+                            tmp_path / f'draftables_{dg}.json')
+    return tmp_path
+
+
+@pytest.fixture
+def updater(srv, datadir):
+    """Gets function creating Updater against the fake server
+
+    Args:
+        backend (str): parsed records go to 'pickle' (mydata.pkl) or
+                       'store' (columnar store, requires pyarrow)
+        pacer (AdaptivePacer): pacer of the scraper
+        max_retries (int): retries of the scraper
+        kwargs: passed to Updater, e.g. raw_compression
+
+    """
+
+    def make(backend='pickle', pacer=None, max_retries=3, **kwargs):
+        if backend == 'store' and not ColumnarStore.available():
+            pytest.skip('store requires pyarrow')
+        s = Scraper(browser_name=None,
+                    api_url=srv.url,
+                    pacer=pacer,
+                    max_retries=max_retries)
+        u = Updater('user0', datadir, scraper=s, **kwargs)
+        if backend == 'pickle':
+            u.store = None
+        return u
+
+    return make
+
+
+def test_mycontests_sections(tmp_path, test_directory):
+    """Tests contests parsed from html are tagged with their section"""
+    shutil.copy(test_directory / 'mycontests.html', tmp_path)
+    u = Updater('sansbacon', tmp_path, scraper=Scraper(browser_name=None))
+    contests = u.mycontests()
+    assert len(contests) == 134
+    assert {c['section'] for c in contests} == {'live', 'upcoming'}
+    states = {state for _, state in u.plan_raw_files()}
+    assert states == {'live', 'upcoming'}
+
+
+def test_update_entered(tmp_path, test_directory):
+    """Tests saved megacontest_entered finalizes contests of mycontests"""
+    shutil.copy(test_directory / 'mycontests.html', tmp_path)
+    factory = PayloadFactory(finalized={89460375})
+    with FakeDKServer(factory=factory) as srv:
+        s = Scraper(browser_name=None, api_url=srv.url)
+        u = Updater('sansbacon', tmp_path, scraper=s, userkey='a-b')
+        assert len(u.update_entered()) == 133
+        states = {c['ContestId']: state for c, state in u.plan_raw_files()}
+        assert states.pop(89460375) == 'finalized'
+        assert set(states.values()) == {'live', 'upcoming'}
+
+        # finalized megacontest is not fetched again
+        assert 89460375 not in u.update_entered()
+        assert srv.counts['contest_entered'] == 265
+
+
+def test_update_raw(updater, srv, datadir):
+    """Tests raw update end to end against fake server"""
+    u = updater(pacer=AdaptivePacer(rate=1000))
+    u.update_raw_files(update_rosters=True, concurrency=4)
+    assert len(list((datadir / 'leaderboards').glob('*.json'))) == 3
+    assert len(list((datadir / 'rosters').glob('*.json'))) == 36
+    assert srv.counts['contest_roster'] == 36
+
+    # nothing is stale on the second run
+    assert u.update_raw_files(update_rosters=True) == []
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_update_raw_errors(factory, datadir, concurrency):
+    """Tests error responses are not saved as leaderboards"""
+    with FakeDKServer(factory=factory, error_rate=1.0) as srv:
+        s = Scraper(browser_name=None,
+                    api_url=srv.url,
+                    pacer=AdaptivePacer(rate=1000, cooldown=0),
+                    max_retries=1)
+        u = Updater('user0', datadir, scraper=s)
+        with pytest.raises(requests.HTTPError):
+            u.update_raw_files(concurrency=concurrency)
+    assert not list((datadir / 'leaderboards').glob('*.json'))
+    assert not FetchJournal(u.journal_path).completed('leaderboard')
+    assert len(u.plan_raw_files()) == 3
+
+
+@pytest.mark.parametrize('backend', ['pickle', 'store'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_update_parsed(updater, factory, contests, datadir, backend,
+                       workers):
+    """Tests parsed update matches across worker counts and backends"""
+    u = updater(backend, pacer=AdaptivePacer(rate=1000))
+    u.update_raw_files(update_rosters=True, concurrency=4)
+    u.update_parsed_files(workers=workers)
+    assert u.mydata_path.is_file() == (backend == 'pickle')
+    a = Analyzer('user0', datadir)
+    assert (a.store is not None) == (backend == 'store')
+    assert sorted(a.data['contest_key']) == sorted(
+        str(c['MegaContestId']) for c in contests)
+    sizes = a.myrosters().groupby('contestKey').size()
+    assert (sizes == factory.roster_size).all() and len(sizes) == 3
+
+
+def test_update_parsed_incremental(updater, datadir):
+    """Tests parsed update only reparses changed contests"""
+    u = updater()
+    u.update_raw_files(update_rosters=True)
+    u.update_parsed_files()
+
+    # change one leaderboard and mark the stored records
+    with u.mydata_path.open('rb') as f:
+        data = pickle.load(f)
+    for d in data:
+        d['stale'] = True
+    with u.mydata_path.open('wb') as f:
+        pickle.dump(data, f)
+    lbfile = datadir / 'leaderboards' / f"{data[1]['contest_key']}.json"
+    lb = u._p._to_obj(lbfile)
+    lb['Leaderboard'] = lb['Leaderboard'][:-1]
+    u._p.codec.dump(lb, lbfile)
+
+    u.update_parsed_files()
+    with u.mydata_path.open('rb') as f:
+        data = pickle.load(f)
+    assert [d.get('stale', False) for d in data] == [True, False, True]
+    assert len(data[1]['entry_keys']) == len(data[0]['entry_keys']) - 1
+
+
+def test_update_raw_store(updater, factory, datadir):
+    """Tests raw and parsed updates through compressed shards"""
+    u = updater(raw_compression='gzip', use_sqlite=True)
+    u.update_raw_files(update_rosters=True, concurrency=4)
+    assert not list((datadir / 'rosters').glob('*.json'))
+    assert len(u.leaderboards) == 3
+    assert len(u.rosters) == 36
+    assert u.request_count(u.plan_raw_files(force=True),
+                           update_rosters=True) == 3
+
+    u.update_parsed_files(workers=2)
+    with u.mydata_path.open('rb') as f:
+        data = pickle.load(f)
+    assert all(len(d['myroster']) == factory.roster_size for d in data)
+    manifest = u.parse_manifest_path.read_text()
+    assert 'rosters/' in manifest
+    assert u.sqlite.contest_keys() == {d['contest_key'] for d in data}
+
+    # ownership of every entrant from the sharded rosters
+    a = Analyzer('user0', datadir, raw_compression='gzip', use_sqlite=True)
+    own = a.field_ownership()
+    assert own['n'].sum() == 36 * factory.roster_size
+    assert set(a.exposure_vs_field().columns) >= {'my_pct', 'field_pct'}
+
+
+def test_update_raw_layout_switch(updater, contests):
+    """Tests switching from shards to files reparses contests"""
+    u = updater(raw_compression='gzip')
+    u.update_raw_files(update_rosters=True)
+    u.update_parsed_files()
+
+    v = updater()
+    for kind in ('leaderboards', 'rosters'):
+        for key in getattr(u, kind).keys():
+            getattr(v, kind).put(key, getattr(u, kind).read(key))
+    v.update_parsed_files()
+    manifest = ParseManifest(v.parse_manifest_path)
+    keys = [str(c['MegaContestId']) for c in contests]
+    assert all(not manifest.get(k)['raw'] for k in keys)
+    with v.mydata_path.open('rb') as f:
+        assert len(pickle.load(f)) == 3
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_update_raw_resume(updater, srv, datadir, concurrency):
+    """Tests interrupted raw update resumes without repeat requests"""
+    u = updater()
+    contest_roster = u._s.contest_roster
+
+    def interrupted(*args, **kwargs):
+        if srv.counts.get('contest_roster', 0) >= 20:
+            raise KeyboardInterrupt
+        return contest_roster(*args, **kwargs)
+
+    u._s.contest_roster = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        u.update_raw_files(update_rosters=True, concurrency=concurrency)
+    assert u.journal_path.is_file()
+
+    u._s.contest_roster = contest_roster
+    u.update_raw_files(concurrency=concurrency, resume=True)
+    assert srv.counts['contest_leaderboard'] == 3
+    assert srv.counts['contest_roster'] == 36
+    assert len(list((datadir / 'rosters').glob('*.json'))) == 36
+    assert not list(datadir.glob('**/*.tmp'))
+
+    # finished run is not resumed again
+    assert not FetchJournal(u.journal_path).pending()